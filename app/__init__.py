@@ -2,11 +2,51 @@
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
-from .config import Config
+from jinja2 import FileSystemBytecodeCache
+from sqlalchemy import event
+from .config import Config, build_engine_options
 from .models import db
+from .db_routing import REPLICA_BIND, init_replica_routing
+from .compression import init_compression
+from .assets import init_assets
+from .streaming import init_streaming
+from .services.storage import reset_client
+from .services.counters import init_counters, reset_counters_after_fork
+from .services.scheduler import init_scheduler, reset_scheduler_after_fork
+from .services.health import reset_health_after_fork
 import os
+import weakref
 
 migrate = Migrate()
+# Apps waarvan de engines na een fork weg moeten; zwak, zodat oude apps
+# (tests, benchmarks) opgeruimd kunnen worden
+_fork_apps = weakref.WeakSet()
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, _record):
+    # SQLite dwingt foreign keys (en dus ON DELETE CASCADE) pas af met deze pragma
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def _dispose_after_fork():
+    # Na een fork (gunicorn preload_app, process pools) mag het child de
+    # DB-verbindingen en HTTP-client van de parent niet hergebruiken.
+    for app in list(_fork_apps):
+        with app.app_context():
+            for engine in db.engines.values():
+                engine.dispose(close=False)
+    reset_client()
+    reset_counters_after_fork()
+    reset_scheduler_after_fork()
+    reset_health_after_fork()
+
+
+# Eén keer per process registreren (niet per create_app: handlers zijn niet af te melden)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_dispose_after_fork)
+
 
 def create_app():
     app = Flask(__name__)
@@ -17,17 +57,59 @@ def create_app():
     if not app.config.get("SQLALCHEMY_DATABASE_URI"):
         raise RuntimeError("DATABASE_URL is not configured. Set it in Config or environment.")
 
+    # Pool / pre-ping / statement cache instellingen (zie Config.DB_*)
+    app.config.setdefault(
+        "SQLALCHEMY_ENGINE_OPTIONS",
+        build_engine_options(app.config, app.config["SQLALCHEMY_DATABASE_URI"]),
+    )
+
+    # Optionele read-replica als extra bind
+    replica_url = app.config.get("DATABASE_REPLICA_URL")
+    if replica_url:
+        binds = dict(app.config.get("SQLALCHEMY_BINDS") or {})
+        binds.setdefault(
+            REPLICA_BIND,
+            {"url": replica_url, **build_engine_options(app.config, replica_url)},
+        )
+        app.config["SQLALCHEMY_BINDS"] = binds
+
+    # Jinja bytecode cache (vóór de eerste template geladen wordt)
+    cache_dir = app.config.get("JINJA_BYTECODE_CACHE_DIR")
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
+
     # Upload map aanmaken als die nog niet bestaat
     os.makedirs(app.config.get("UPLOAD_FOLDER", "static/papers"), exist_ok=True)
 
     db.init_app(app)
     migrate.init_app(app, db)
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == "sqlite":
+                event.listen(engine, "connect", _enable_sqlite_foreign_keys)
+    init_replica_routing(app)
+    init_counters(app)
+    init_scheduler(app)
+    init_streaming(app)
+    init_assets(app)
+    init_compression(app)
+
+    _fork_apps.add(app)
 
     with app.app_context():
         # Blueprint registreren
         from .routes import main
         app.register_blueprint(main)
 
+        # JSON API voor integraties
+        from .api import api
+        app.register_blueprint(api)
+
+        # CLI commando's (flask export ...)
+        from .cli import register_cli
+        register_cli(app)
+
         # CLI helper, alleen indien je demo wilt seeden
         # (kan ook verwijderd worden als je geen demo wilt)
         # @app.cli.command("seed_demo")
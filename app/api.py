@@ -0,0 +1,499 @@
+# app/api.py
+"""Versioned JSON API (/api/v1) voor integraties die nu dashboard.html scrapen."""
+import base64
+import json
+from datetime import datetime
+
+from flask import Blueprint, request, current_app
+from sqlalchemy import tuple_, func
+from sqlalchemy.orm import load_only, selectinload
+
+from .models import db, User, Company, Paper, Review, PaperCompany, sortable_datetime
+from .routes import (
+    build_avg_score_subquery,
+    apply_paper_filters,
+    paper_sort_key,
+    get_stats_data,
+)
+
+try:
+    import orjson  # optioneel: veel snellere serialisatie
+except ImportError:  # pragma: no cover
+    orjson = None
+
+api = Blueprint("api", __name__, url_prefix="/api/v1")
+
+# ---------------------------------------------------
+# CONSTANTS
+# ---------------------------------------------------
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+PAPER_FIELDS = {
+    "paper_id",
+    "user_id",
+    "title",
+    "abstract",
+    "research_domain",
+    "upload_date",
+    "ai_business_score",
+    "ai_academic_score",
+    "ai_summary",
+    "ai_strengths",
+    "ai_weaknesses",
+    "ai_status",
+    "ai_total_score",
+}
+# Lijstweergave: geen grote Text-kolommen tenzij expliciet gevraagd
+DEFAULT_PAPER_LIST_FIELDS = [
+    "paper_id",
+    "title",
+    "research_domain",
+    "upload_date",
+    "ai_status",
+    "ai_business_score",
+    "ai_academic_score",
+    "ai_total_score",
+]
+PAPER_INCLUDES = {"author", "companies", "reviews", "stats"}
+
+REVIEW_FIELDS = {
+    "review_id",
+    "paper_id",
+    "reviewer_id",
+    "company_id",
+    "score",
+    "comments",
+    "date_submitted",
+}
+# Review bodies (comments) worden alleen geladen als ze gevraagd worden
+DEFAULT_REVIEW_FIELDS = ["review_id", "reviewer_id", "company_id", "score", "date_submitted"]
+
+COMPANY_FIELDS = {"company_id", "name", "industry", "interests"}
+DEFAULT_COMPANY_FIELDS = ["company_id", "name", "industry"]
+
+DATE_SORTS = {"newest", "oldest"}
+
+
+class ApiError(Exception):
+    """Fout die als JSON {"error": ...} teruggestuurd wordt."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+# ---------------------------------------------------
+# SERIALIZATION
+# ---------------------------------------------------
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def dumps(payload) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, default=_default).encode("utf-8")
+
+
+def json_response(payload, status=200):
+    return current_app.response_class(
+        dumps(payload), status=status, mimetype="application/json"
+    )
+
+
+@api.errorhandler(ApiError)
+def handle_api_error(err):
+    return json_response({"error": err.message}, err.status)
+
+
+# ---------------------------------------------------
+# REQUEST PARSING HELPERS
+# ---------------------------------------------------
+def parse_limit(args) -> int:
+    raw = args.get("limit", "")
+    if not raw:
+        return DEFAULT_LIMIT
+    try:
+        limit = int(raw)
+    except ValueError:
+        raise ApiError("limit must be an integer.")
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def parse_fields(raw, allowed, default, pk):
+    """Comma-separated veldenlijst -> gevalideerde lijst (PK altijd erbij)."""
+    if not raw:
+        fields = list(default)
+    else:
+        fields = [f.strip() for f in raw.split(",") if f.strip()]
+        unknown = [f for f in fields if f not in allowed]
+        if unknown:
+            raise ApiError(f"Unknown field(s): {', '.join(unknown)}")
+    if pk not in fields:
+        fields.insert(0, pk)
+    return fields
+
+
+def parse_include(raw, allowed):
+    includes = {i.strip() for i in (raw or "").split(",") if i.strip()}
+    unknown = includes - allowed
+    if unknown:
+        raise ApiError(f"Unknown include(s): {', '.join(sorted(unknown))}")
+    return includes
+
+
+def encode_cursor(key, row_id) -> str:
+    if isinstance(key, datetime):
+        key = key.isoformat()
+    raw = json.dumps([key, row_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor, is_date=False):
+    try:
+        key, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if is_date and key is not None:
+            key = datetime.fromisoformat(key)
+        return key, int(row_id)
+    except Exception:
+        raise ApiError("Invalid cursor.")
+
+
+def keyset_filter(query, key_expr, id_col, cursor_key, cursor_id, descending):
+    """Rijen strikt na (cursor_key, cursor_id) in de gekozen sorteervolgorde."""
+    row = tuple_(key_expr, id_col)
+    after = tuple_(cursor_key, cursor_id)
+    return query.filter(row < after if descending else row > after)
+
+
+# ---------------------------------------------------
+# SERIALIZERS
+# ---------------------------------------------------
+def serialize_fields(obj, fields):
+    return {f: getattr(obj, f) for f in fields}
+
+
+def review_load_options(review_fields):
+    return load_only(*[getattr(Review, f) for f in review_fields])
+
+
+def serialize_paper(paper, fields, includes, review_fields, stats=None):
+    data = serialize_fields(paper, fields)
+    if "author" in includes:
+        data["author"] = (
+            {"user_id": paper.author.user_id, "name": paper.author.name}
+            if paper.author
+            else None
+        )
+    if "companies" in includes:
+        data["companies"] = [
+            {
+                "company_id": link.company_id,
+                "name": link.company.name if link.company else None,
+                "relation_type": link.relation_type,
+            }
+            for link in paper.companies
+        ]
+    if "reviews" in includes:
+        data["reviews"] = [serialize_fields(r, review_fields) for r in paper.reviews]
+    if "stats" in includes:
+        avg_score, review_count = stats if stats else (None, 0)
+        data["stats"] = {
+            "avg_score": round(float(avg_score), 1) if avg_score is not None else None,
+            "review_count": review_count or 0,
+        }
+    return data
+
+
+def paper_relation_options(includes, review_fields):
+    options = []
+    if "author" in includes:
+        options.append(
+            selectinload(Paper.author).load_only(User.user_id, User.name)
+        )
+    if "companies" in includes:
+        options.append(
+            selectinload(Paper.companies).selectinload(PaperCompany.company)
+        )
+    if "reviews" in includes:
+        options.append(
+            selectinload(Paper.reviews).options(review_load_options(review_fields))
+        )
+    return options
+
+
+# ---------------------------------------------------
+# PAPERS
+# ---------------------------------------------------
+@api.route("/papers")
+def list_papers():
+    args = request.args
+    search = args.get("q", "").strip()
+    selected_domain = args.get("domain", "all")
+    selected_company = args.get("company", "").strip()
+    min_score = args.get("min_score", "").strip()
+    sort = args.get("sort", "newest")
+
+    limit = parse_limit(args)
+    fields = parse_fields(
+        args.get("fields"), PAPER_FIELDS, DEFAULT_PAPER_LIST_FIELDS, "paper_id"
+    )
+    includes = parse_include(args.get("include"), PAPER_INCLUDES)
+    review_fields = parse_fields(
+        args.get("fields[reviews]"), REVIEW_FIELDS, DEFAULT_REVIEW_FIELDS, "review_id"
+    )
+
+    avg_subq = build_avg_score_subquery()
+    sort_expr, descending = paper_sort_key(sort, avg_subq)
+    if sort == "ai_score":
+        # NULL-scores breken tuple-vergelijking in de cursor
+        sort_expr = func.coalesce(sort_expr, 0)
+    elif sort in DATE_SORTS:
+        # SQLite: server_default- en Python-datetimes in hetzelfde formaat vergelijken
+        sort_expr = sortable_datetime(sort_expr)
+
+    query = (
+        db.session.query(
+            Paper,
+            sort_expr.label("cursor_key"),
+            avg_subq.c.avg_score,
+            avg_subq.c.review_count,
+        )
+        .outerjoin(avg_subq, Paper.paper_id == avg_subq.c.paper_id)
+    )
+    query = apply_paper_filters(
+        query, avg_subq, search, selected_domain, selected_company, min_score
+    )
+
+    cursor = args.get("cursor")
+    if cursor:
+        cursor_key, cursor_id = decode_cursor(cursor, is_date=sort in DATE_SORTS)
+        query = keyset_filter(
+            query,
+            sort_expr,
+            Paper.paper_id,
+            sortable_datetime(cursor_key) if sort in DATE_SORTS else cursor_key,
+            cursor_id,
+            descending,
+        )
+
+    if descending:
+        query = query.order_by(sort_expr.desc(), Paper.paper_id.desc())
+    else:
+        query = query.order_by(sort_expr.asc(), Paper.paper_id.asc())
+
+    rows = (
+        query.options(
+            load_only(*[getattr(Paper, f) for f in fields]),
+            *paper_relation_options(includes, review_fields),
+        )
+        .limit(limit + 1)
+        .all()
+    )
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(last.cursor_key, last.Paper.paper_id)
+        if next_cursor == cursor:
+            # Zou een client die next_cursor volgt eindeloos laten lussen
+            current_app.logger.error("papers cursor did not advance (sort=%s)", sort)
+            raise ApiError("Pagination cursor did not advance.", 500)
+
+    return json_response(
+        {
+            "data": [
+                serialize_paper(
+                    row.Paper,
+                    fields,
+                    includes,
+                    review_fields,
+                    stats=(row.avg_score, row.review_count),
+                )
+                for row in rows
+            ],
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+@api.route("/papers/<int:paper_id>")
+def paper_detail(paper_id):
+    args = request.args
+    fields = parse_fields(
+        args.get("fields"), PAPER_FIELDS, sorted(PAPER_FIELDS), "paper_id"
+    )
+    includes = parse_include(args.get("include"), PAPER_INCLUDES)
+    review_fields = parse_fields(
+        args.get("fields[reviews]"), REVIEW_FIELDS, DEFAULT_REVIEW_FIELDS, "review_id"
+    )
+
+    paper = (
+        Paper.query.options(
+            load_only(*[getattr(Paper, f) for f in fields]),
+            *paper_relation_options(includes, review_fields),
+        )
+        .filter(Paper.paper_id == paper_id)
+        .first()
+    )
+    if not paper:
+        raise ApiError("Paper not found.", 404)
+
+    stats = None
+    if "stats" in includes:
+        stats = (
+            db.session.query(func.avg(Review.score), func.count(Review.review_id))
+            .filter(Review.paper_id == paper_id)
+            .one()
+        )
+
+    return json_response(
+        {"data": serialize_paper(paper, fields, includes, review_fields, stats=stats)}
+    )
+
+
+# ---------------------------------------------------
+# LEADERBOARD
+# ---------------------------------------------------
+@api.route("/leaderboard")
+def leaderboard():
+    from .services.leaderboard import get_leaderboard, DEFAULT_LEADERBOARD_SIZE
+
+    args = request.args
+    domain = args.get("domain", "").strip()
+    limit = parse_limit(args) if args.get("limit") else DEFAULT_LEADERBOARD_SIZE
+    fields = parse_fields(
+        args.get("fields"), PAPER_FIELDS, DEFAULT_PAPER_LIST_FIELDS, "paper_id"
+    )
+
+    papers = get_leaderboard(
+        domain or None,
+        limit,
+        options=[load_only(*[getattr(Paper, f) for f in fields])],
+    )
+    return json_response(
+        {
+            "domain": domain or None,
+            "data": [serialize_fields(p, fields) for p in papers],
+        }
+    )
+
+
+# ---------------------------------------------------
+# REVIEWS
+# ---------------------------------------------------
+@api.route("/papers/<int:paper_id>/reviews")
+def list_reviews(paper_id):
+    args = request.args
+    limit = parse_limit(args)
+    fields = parse_fields(
+        args.get("fields"), REVIEW_FIELDS, DEFAULT_REVIEW_FIELDS, "review_id"
+    )
+    includes = parse_include(args.get("include"), {"reviewer"})
+
+    exists = db.session.query(Paper.paper_id).filter_by(paper_id=paper_id).scalar()
+    if exists is None:
+        raise ApiError("Paper not found.", 404)
+
+    query = Review.query.filter(Review.paper_id == paper_id).options(
+        review_load_options(fields)
+    )
+    if "reviewer" in includes:
+        query = query.options(
+            selectinload(Review.reviewer).load_only(User.user_id, User.name)
+        )
+
+    cursor = args.get("cursor")
+    if cursor:
+        _, cursor_id = decode_cursor(cursor)
+        query = query.filter(Review.review_id < cursor_id)
+
+    reviews = query.order_by(Review.review_id.desc()).limit(limit + 1).all()
+    has_more = len(reviews) > limit
+    reviews = reviews[:limit]
+
+    data = []
+    for review in reviews:
+        item = serialize_fields(review, fields)
+        if "reviewer" in includes:
+            item["reviewer"] = (
+                {"user_id": review.reviewer.user_id, "name": review.reviewer.name}
+                if review.reviewer
+                else None
+            )
+        data.append(item)
+
+    return json_response(
+        {
+            "data": data,
+            "next_cursor": (
+                encode_cursor(None, reviews[-1].review_id) if has_more else None
+            ),
+        }
+    )
+
+
+# ---------------------------------------------------
+# COMPANIES
+# ---------------------------------------------------
+@api.route("/companies")
+def list_companies():
+    args = request.args
+    limit = parse_limit(args)
+    fields = parse_fields(
+        args.get("fields"), COMPANY_FIELDS, DEFAULT_COMPANY_FIELDS, "company_id"
+    )
+
+    query = Company.query.options(load_only(*[getattr(Company, f) for f in fields]))
+
+    cursor = args.get("cursor")
+    if cursor:
+        _, cursor_id = decode_cursor(cursor)
+        query = query.filter(Company.company_id > cursor_id)
+
+    companies = query.order_by(Company.company_id.asc()).limit(limit + 1).all()
+    has_more = len(companies) > limit
+    companies = companies[:limit]
+
+    return json_response(
+        {
+            "data": [serialize_fields(c, fields) for c in companies],
+            "next_cursor": (
+                encode_cursor(None, companies[-1].company_id) if has_more else None
+            ),
+        }
+    )
+
+
+# ---------------------------------------------------
+# FACETS
+# ---------------------------------------------------
+@api.route("/facets")
+def facets():
+    from .services.facets import get_facets
+
+    args = request.args
+    return json_response(
+        {
+            "data": get_facets(
+                args.get("q", "").strip(),
+                args.get("domain", "all"),
+                args.get("company", "").strip(),
+                args.get("min_score", "").strip(),
+            )
+        }
+    )
+
+
+# ---------------------------------------------------
+# STATS
+# ---------------------------------------------------
+@api.route("/stats")
+def stats():
+    return json_response({"data": get_stats_data()})
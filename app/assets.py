@@ -0,0 +1,251 @@
+# app/assets.py
+"""
+Statische assets: zelf gehost, geminificeerd en met een content-hash in de
+bestandsnaam.
+
+- `flask assets vendor` haalt de JS-bibliotheken (vaste versies, zie
+  VENDOR_ASSETS) op naar app/static/vendor/; die map hoort in git.
+- `flask assets build` haalt ontbrekende vendor-bestanden op, minificeert de
+  eigen CSS, kopieert alles naar app/static/dist/ als <naam>.<hash>.<ext> en
+  schrijft manifest.json (logische naam -> gehashte naam). Draai dit bij elke
+  deploy; zonder vendor-bestanden faalt de build (tenzij --allow-cdn).
+- url_for('static', filename='css/styles.css') geeft via het manifest de
+  gehashte naam; die bestanden krijgen Cache-Control: immutable (de naam
+  verandert als de inhoud verandert). Zonder manifest blijft alles werken
+  met de gewone namen en korte caching.
+- `flask assets check` controleert dat elk asset waar een template naar
+  verwijst bestaat (en in het manifest staat); een ontbrekend vendor-bestand
+  is een fout, behalve met --allow-cdn.
+
+Enkel in development (vendor-bestand niet opgehaald) verwijst vendor_url()
+naar dezelfde vaste versie op de CDN; init_assets logt dat bij het opstarten.
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+
+from flask import request, url_for
+
+MANIFEST_NAME = "manifest.json"
+DIST_DIR = "dist"
+HASH_LENGTH = 12
+
+# Vaste versies (de templates gebruikten "3.x.x" en "latest")
+VENDOR_ASSETS = {
+    "alpine.min.js": "https://unpkg.com/alpinejs@3.14.1/dist/cdn.min.js",
+    "three.min.js": "https://cdnjs.cloudflare.com/ajax/libs/three.js/r121/three.min.js",
+    "vanta.net.min.js": "https://cdn.jsdelivr.net/npm/vanta@0.5.24/dist/vanta.net.min.js",
+    "bootstrap.bundle.min.js": "https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/js/bootstrap.bundle.min.js",
+}
+
+# Eigen bestanden die in de build meegaan (paden relatief aan de static map)
+BUILD_EXTENSIONS = (".css", ".js", ".svg", ".png", ".jpg", ".ico", ".woff2")
+
+STATIC_URL_RE = re.compile(
+    r"""url_for\(\s*['"]static['"]\s*,\s*filename\s*=\s*['"]([^'"]+)['"]\s*\)"""
+)
+VENDOR_URL_RE = re.compile(r"""vendor_url\(\s*['"]([^'"]+)['"]\s*\)""")
+CSS_URL_RE = re.compile(r"""url\(\s*['"]?(?!data:|https?:|//|#)([^'")]+)['"]?\s*\)""")
+
+_CSS_STRING_OR_COMMENT = re.compile(
+    r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|/\*.*?\*/""", re.S
+)
+_CSS_STRING = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')""")
+
+
+# ---------------------------------------------------
+# BUILD
+# ---------------------------------------------------
+def minify_css(css):
+    """Conservatieve CSS-minifier: commentaar en overbodige witruimte weg, strings intact."""
+    css = _CSS_STRING_OR_COMMENT.sub(lambda m: m.group(1) or "", css)
+    parts = _CSS_STRING.split(css)
+    for i in range(0, len(parts), 2):  # even indices: buiten strings
+        part = re.sub(r"\s+", " ", parts[i])
+        part = re.sub(r"\s*([{};,>])\s*", r"\1", part)
+        # Enkel ná de dubbelepunt: "a :hover" is iets anders dan "a:hover"
+        part = re.sub(r":\s+", ":", part)
+        parts[i] = part.replace(";}", "}")
+    return "".join(parts).strip()
+
+
+def hashed_name(path, content):
+    digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+    stem, ext = os.path.splitext(path)
+    return f"{DIST_DIR}/{stem}.{digest}{ext}"
+
+
+def source_files(static_folder):
+    """Logische namen (met /) van alle bestanden die in de build gaan."""
+    names = []
+    for root, dirs, files in os.walk(static_folder):
+        rel_root = os.path.relpath(root, static_folder)
+        if rel_root.split(os.sep)[0] == DIST_DIR:
+            dirs[:] = []
+            continue
+        for filename in files:
+            if filename.endswith(BUILD_EXTENSIONS):
+                names.append(os.path.normpath(os.path.join(rel_root, filename)).replace(os.sep, "/"))
+    return sorted(names)
+
+
+def _rewrite_css_urls(css, name, manifest):
+    """url(...) in een CSS-bestand -> gehashte naam, relatief t.o.v. dist/<map van name>."""
+    base = os.path.dirname(name)
+
+    def replace(match):
+        resolved = os.path.normpath(os.path.join(base, match.group(1))).replace(os.sep, "/")
+        if resolved not in manifest:
+            return match.group(0)
+        target = os.path.relpath(manifest[resolved], f"{DIST_DIR}/{base}" if base else DIST_DIR)
+        return f'url("{target.replace(os.sep, "/")}")'
+
+    return CSS_URL_RE.sub(replace, css)
+
+
+def build_assets(static_folder):
+    """Minify + hash naar static/dist en schrijf het manifest. Geeft het manifest terug."""
+    dist = os.path.join(static_folder, DIST_DIR)
+    shutil.rmtree(dist, ignore_errors=True)
+
+    manifest = {}
+    # CSS als laatste: url(...) verwijzingen wijzen dan naar de gehashte namen
+    names = sorted(source_files(static_folder), key=lambda name: name.endswith(".css"))
+    for name in names:
+        with open(os.path.join(static_folder, name), "rb") as fh:
+            content = fh.read()
+        if name.endswith(".css"):
+            css = _rewrite_css_urls(content.decode("utf-8"), name, manifest)
+            if not name.endswith(".min.css"):
+                css = minify_css(css)
+            content = css.encode("utf-8")
+        target = hashed_name(name, content)
+        os.makedirs(os.path.dirname(os.path.join(static_folder, target)), exist_ok=True)
+        with open(os.path.join(static_folder, target), "wb") as fh:
+            fh.write(content)
+        manifest[name] = target
+
+    path = os.path.join(static_folder, MANIFEST_NAME)
+    with open(path + ".tmp", "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+    return manifest
+
+
+def download_vendor(static_folder, force=False):
+    """Haal VENDOR_ASSETS op naar static/vendor. Geeft de opgehaalde namen terug."""
+    import urllib.request
+
+    vendor_dir = os.path.join(static_folder, "vendor")
+    os.makedirs(vendor_dir, exist_ok=True)
+    fetched = []
+    for name, url in VENDOR_ASSETS.items():
+        target = os.path.join(vendor_dir, name)
+        if os.path.exists(target) and not force:
+            continue
+        with urllib.request.urlopen(url, timeout=30) as response:
+            content = response.read()
+        with open(target + ".tmp", "wb") as fh:
+            fh.write(content)
+        os.replace(target + ".tmp", target)
+        fetched.append(name)
+    return fetched
+
+
+# ---------------------------------------------------
+# CHECK
+# ---------------------------------------------------
+def referenced_assets(template_folder, static_folder):
+    """(bron, logische naam) voor elk letterlijk static/vendor asset in templates en CSS."""
+    references = []
+    for root, _, files in os.walk(template_folder):
+        for filename in files:
+            path = os.path.join(root, filename)
+            with open(path, encoding="utf-8") as fh:
+                text = fh.read()
+            source = os.path.relpath(path, template_folder)
+            references += [(source, name) for name in STATIC_URL_RE.findall(text)]
+            references += [(source, f"vendor/{name}") for name in VENDOR_URL_RE.findall(text)]
+    for name in source_files(static_folder):
+        if name.endswith(".css"):
+            with open(os.path.join(static_folder, name), encoding="utf-8") as fh:
+                for ref in CSS_URL_RE.findall(fh.read()):
+                    resolved = os.path.normpath(os.path.join(os.path.dirname(name), ref))
+                    references.append((name, resolved.replace(os.sep, "/")))
+    return references
+
+
+def check_assets(template_folder, static_folder, manifest, allow_cdn=False):
+    """
+    Lijst van problemen (leeg = alles in orde). allow_cdn: vendor-bestanden
+    die nog niet opgehaald zijn (en dus van de CDN komen) zijn geen fout.
+    """
+    problems = []
+    for source, name in referenced_assets(template_folder, static_folder):
+        if not os.path.isfile(os.path.join(static_folder, name)):
+            vendor_name = name[len("vendor/"):] if name.startswith("vendor/") else None
+            if allow_cdn and vendor_name in VENDOR_ASSETS:
+                continue
+            hint = " (run `flask assets vendor`)" if vendor_name in VENDOR_ASSETS else ""
+            problems.append(f"{source}: {name} does not exist{hint}")
+        elif manifest and name not in manifest:
+            problems.append(f"{source}: {name} is not in the manifest (run `flask assets build`)")
+        elif manifest and not os.path.isfile(os.path.join(static_folder, manifest[name])):
+            problems.append(f"{source}: {manifest[name]} is missing from {DIST_DIR}/")
+    return problems
+
+
+# ---------------------------------------------------
+# RUNTIME
+# ---------------------------------------------------
+def load_manifest(static_folder):
+    try:
+        with open(os.path.join(static_folder, MANIFEST_NAME), encoding="utf-8") as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return {}
+
+
+def init_assets(app):
+    manifest = load_manifest(app.static_folder)
+    hashed = set(manifest.values())
+    app.extensions["asset_manifest"] = manifest
+    missing_vendor = {
+        name for name in VENDOR_ASSETS
+        if f"vendor/{name}" not in manifest
+        and not os.path.exists(os.path.join(app.static_folder, "vendor", name))
+    }
+    if missing_vendor:
+        app.logger.warning(
+            "Vendor assets missing, served from the CDN: %s (run `flask assets build`)",
+            ", ".join(sorted(missing_vendor)),
+        )
+
+    @app.url_defaults
+    def _fingerprint_static(endpoint, values):
+        if endpoint == "static" and manifest:
+            filename = values.get("filename")
+            if filename in manifest:
+                values["filename"] = manifest[filename]
+
+    def vendor_url(name):
+        if name in missing_vendor:
+            return VENDOR_ASSETS[name]
+        return url_for("static", filename=f"vendor/{name}")
+
+    app.jinja_env.globals["vendor_url"] = vendor_url
+
+    @app.after_request
+    def _immutable_assets(response):
+        if (
+            request.endpoint == "static"
+            and response.status_code in (200, 304)
+            and (request.view_args or {}).get("filename") in hashed
+        ):
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = app.config["ASSETS_MAX_AGE"]
+            response.cache_control.immutable = True
+        return response
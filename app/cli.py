@@ -0,0 +1,340 @@
+# app/cli.py
+"""Flask CLI commando's (flask <command>)."""
+import sys
+
+import click
+
+
+def register_cli(app):
+    @app.cli.command("export")
+    @click.argument(
+        "dataset",
+        type=click.Choice(["papers", "reviews", "complaints", "paper_companies"]),
+    )
+    @click.option(
+        "--format", "fmt",
+        type=click.Choice(["csv", "ndjson", "parquet"]),
+        default="csv",
+        show_default=True,
+    )
+    @click.option("--since", help="Only rows on/after this date (YYYY-MM-DD).")
+    @click.option("--until", help="Only rows before this date (YYYY-MM-DD).")
+    @click.option("--gzip", "use_gzip", is_flag=True, help="Gzip-compress the output.")
+    @click.option("--batch-size", default=1000, show_default=True)
+    @click.option(
+        "-o", "--output",
+        type=click.Path(dir_okay=False, writable=True),
+        help="Output file (default: stdout).",
+    )
+    def export_command(dataset, fmt, since, until, use_gzip, batch_size, output):
+        """Stream a dataset to CSV / NDJSON / Parquet."""
+        from .services.export import ExportUnavailable, stream_export, parse_date
+
+        try:
+            chunks = stream_export(
+                dataset,
+                fmt=fmt,
+                since=parse_date(since),
+                until=parse_date(until),
+                gzip=use_gzip,
+                batch_size=batch_size,
+            )
+        except ValueError as e:
+            raise click.BadParameter(str(e))
+        except ExportUnavailable as e:
+            raise click.ClickException(str(e))
+
+        if output:
+            with open(output, "wb") as fh:
+                for chunk in chunks:
+                    fh.write(chunk)
+            click.echo(f"Export written to {output}", err=True)
+        else:
+            out = sys.stdout.buffer
+            for chunk in chunks:
+                out.write(chunk)
+            out.flush()
+
+    @app.cli.command("import")
+    @click.argument("manifest", type=click.Path(exists=True, dir_okay=False))
+    @click.option(
+        "--pdf-dir",
+        type=click.Path(exists=True, file_okay=False),
+        required=True,
+        help="Directory with the PDFs referenced in the manifest.",
+    )
+    @click.option(
+        "--reviews",
+        type=click.Path(exists=True, dir_okay=False),
+        help="Optional CSV/JSONL manifest with historical reviews.",
+    )
+    @click.option("--workers", default=4, show_default=True)
+    @click.option("--batch-size", default=500, show_default=True)
+    @click.option(
+        "--errors",
+        type=click.Path(dir_okay=False, writable=True),
+        help="Write per-row errors to this CSV file.",
+    )
+    def import_command(manifest, pdf_dir, reviews, workers, batch_size, errors):
+        """Bulk import papers (+ PDFs) and historical reviews from a manifest."""
+        from .services.bulk_import import ImportReport, import_papers, import_reviews
+
+        report = ImportReport()
+        file_to_paper_id = import_papers(
+            manifest, pdf_dir, report, workers=workers, batch_size=batch_size
+        )
+        click.echo(f"Papers: {report.summary()}")
+
+        if reviews:
+            review_report = ImportReport()
+            import_reviews(reviews, file_to_paper_id, review_report, batch_size=batch_size)
+            click.echo(f"Reviews: {review_report.summary()}")
+            report.errors.extend(review_report.errors)
+
+        for source, line, message in sorted(report.errors)[:20]:
+            click.echo(f"  {source}:{line}: {message}", err=True)
+        if errors and report.errors:
+            report.write_errors(errors)
+            click.echo(f"All errors written to {errors}", err=True)
+        click.echo("AI analysis is queued; run `flask ai-queue` to process it.")
+
+    @app.cli.command("ai-queue")
+    @click.option("--limit", default=20, show_default=True)
+    def ai_queue_command(limit):
+        """Run AI analysis for papers that are still pending."""
+        from .services.ai_queue import process_pending_analyses, pending_count
+
+        done, failed = process_pending_analyses(limit=limit)
+        click.echo(f"AI queue: {done} done, {failed} failed, {pending_count()} still pending")
+
+    @app.cli.command("trends")
+    def trends_command():
+        """Recompute the trending ranking (PaperTrend)."""
+        from .services.trends import recompute_trends
+
+        count = recompute_trends()
+        click.echo(f"Trends: {count} papers ranked")
+
+    @app.cli.command("digest")
+    @click.option("--dry-run", is_flag=True, help="Render the digests without sending them.")
+    def digest_command(dry_run):
+        """Mail each company its new papers matching its interests."""
+        from .services.digest import run_digest
+
+        report = run_digest(dry_run=dry_run)
+        prefix = "Digest (dry run)" if dry_run else "Digest"
+        click.echo(
+            f"{prefix}: {report.messages} mails for {report.companies} companies, "
+            f"{report.papers} papers"
+        )
+
+    @app.cli.command("reviewer-profiles")
+    @click.option("--full", is_flag=True, help="Refresh every candidate, not only stale ones.")
+    def reviewer_profiles_command(full):
+        """Refresh the precomputed reviewer profiles used for suggestions."""
+        from .services.reviewer_suggestions import refresh_profiles
+
+        count = refresh_profiles(full=full)
+        click.echo(f"Reviewer profiles: {count} refreshed")
+
+    @app.cli.command("related")
+    @click.option("--rebuild", is_flag=True, help="Recompute neighbours for all papers.")
+    @click.option("-k", "k", default=10, show_default=True, help="Neighbours per paper.")
+    @click.option("--block-size", default=512, show_default=True)
+    def related_command(rebuild, k, block_size):
+        """Update the precomputed "similar papers" (TF-IDF neighbours)."""
+        from .services.related import rebuild_neighbors, update_neighbors
+
+        if rebuild:
+            total = rebuild_neighbors(k=k, block_size=block_size)
+            click.echo(f"Related papers: rebuilt neighbours for {total} papers")
+        else:
+            new, updated = update_neighbors(k=k, block_size=block_size)
+            click.echo(
+                f"Related papers: {new} new papers indexed, {updated} existing lists updated"
+            )
+
+    @app.cli.group("scheduler")
+    def scheduler_group():
+        """Periodic maintenance jobs (trends, related, digest, ...)."""
+
+    @scheduler_group.command("run")
+    def scheduler_run_command():
+        """Host the scheduler in this process until SIGINT/SIGTERM."""
+        import signal
+
+        from .services.scheduler import Scheduler, configured_jobs
+
+        scheduler = Scheduler(app, configured_jobs(app.config))
+        for job in scheduler.jobs.values():
+            click.echo(f"  {job.name:<20} {job.schedule}")
+        # Stoppen wacht tot lopende jobs klaar zijn
+        signal.signal(signal.SIGTERM, lambda *_: scheduler.stop())
+        signal.signal(signal.SIGINT, lambda *_: scheduler.stop())
+        click.echo(f"Scheduler running {len(scheduler.jobs)} jobs")
+        scheduler.run_forever()
+        click.echo("Scheduler stopped")
+
+    @scheduler_group.command("list")
+    def scheduler_list_command():
+        """Show the configured jobs with their last run."""
+        from .models import JobRun
+        from .services.scheduler import configured_jobs
+
+        for job in configured_jobs(app.config):
+            last = (
+                JobRun.query.filter_by(job_name=job.name)
+                .order_by(JobRun.started_at.desc())
+                .first()
+            )
+            if last is None:
+                click.echo(f"{job.name:<20} {str(job.schedule):<14} never run")
+                continue
+            duration = f"{last.duration_ms} ms" if last.duration_ms is not None else "-"
+            click.echo(
+                f"{job.name:<20} {str(job.schedule):<14} {last.status:<8} "
+                f"{last.started_at:%Y-%m-%d %H:%M:%S}  {duration:>10}  "
+                f"next {job.schedule.next_after(last.started_at):%Y-%m-%d %H:%M}"
+            )
+
+    @scheduler_group.command("run-job")
+    @click.argument("name")
+    def scheduler_run_job_command(name):
+        """Run one job now (still takes the job lock)."""
+        from .services.scheduler import JOB_FUNCTIONS, Interval, Job, run_job
+
+        if name not in JOB_FUNCTIONS:
+            raise click.BadParameter(f"choose from {', '.join(JOB_FUNCTIONS)}", param_hint="NAME")
+        status = run_job(app, Job(name, Interval(1), JOB_FUNCTIONS[name]), force=True)
+        click.echo(f"{name}: {status}")
+
+    @scheduler_group.command("history")
+    @click.option("--job", "job_name", help="Only runs of this job.")
+    @click.option("--limit", default=20, show_default=True)
+    def scheduler_history_command(job_name, limit):
+        """Show recent job runs with their durations."""
+        from .models import JobRun
+
+        query = JobRun.query
+        if job_name:
+            query = query.filter_by(job_name=job_name)
+        for run in query.order_by(JobRun.started_at.desc()).limit(limit):
+            duration = f"{run.duration_ms} ms" if run.duration_ms is not None else "-"
+            # Bij fouten: de laatste regel van de traceback (de exception)
+            detail = run.result or (run.error or "").strip().rpartition("\n")[2]
+            click.echo(
+                f"{run.started_at:%Y-%m-%d %H:%M:%S}  {run.job_name:<20} {run.status:<8} "
+                f"{duration:>10}  {detail}"
+            )
+
+    @app.cli.group("storage")
+    def storage_group():
+        """PDF storage maintenance."""
+
+    @storage_group.command("reconcile")
+    @click.option("--dry-run", is_flag=True, help="Report orphans without deleting them.")
+    @click.option("--page-size", type=int, help="Objects per bucket listing page.")
+    @click.option("--batch-size", type=int, help="Orphans per remove() call.")
+    @click.option(
+        "--min-age-hours",
+        type=float,
+        help="Never delete objects modified more recently than this.",
+    )
+    @click.option(
+        "--missing",
+        type=click.Path(dir_okay=False, writable=True),
+        help="Write every paper whose PDF is missing to this CSV file.",
+    )
+    def storage_reconcile_command(dry_run, page_size, batch_size, min_age_hours, missing):
+        """Delete bucket objects without a paper and report papers without a PDF."""
+        import csv
+        from contextlib import ExitStack
+
+        from .services.reconcile import reconcile_storage
+
+        with ExitStack() as stack:
+            on_missing = None
+            if missing:
+                fh = stack.enter_context(open(missing, "w", newline="", encoding="utf-8"))
+                writer = csv.writer(fh)
+                writer.writerow(["paper_id", "file_path"])
+                on_missing = lambda paper_id, file_path: writer.writerow([paper_id, file_path])
+            report = reconcile_storage(
+                dry_run=dry_run,
+                page_size=page_size,
+                delete_batch=batch_size,
+                min_age_hours=min_age_hours,
+                on_missing=on_missing,
+            )
+
+        prefix = "Storage (dry run)" if dry_run else "Storage"
+        click.echo(f"{prefix}: {report.summary()}")
+        for paper_id, file_path in report.missing_sample:
+            click.echo(f"  missing: paper {paper_id}: {file_path}", err=True)
+        if missing and report.missing:
+            click.echo(f"All missing files written to {missing}", err=True)
+
+    @app.cli.group("assets")
+    def assets_group():
+        """Self-hosted, fingerprinted static assets."""
+
+    @assets_group.command("vendor")
+    @click.option("--force", is_flag=True, help="Download again even if the file exists.")
+    def assets_vendor_command(force):
+        """Download the pinned JS libraries into app/static/vendor."""
+        from .assets import download_vendor
+
+        fetched = download_vendor(app.static_folder, force=force)
+        click.echo(f"Vendored {len(fetched)} files: {', '.join(fetched) or '-'}")
+
+    @assets_group.command("build")
+    @click.option(
+        "--allow-cdn", is_flag=True,
+        help="Do not download missing vendor files; pages fall back to the CDN.",
+    )
+    def assets_build_command(allow_cdn):
+        """Vendor JS libraries, then minify and content-hash static files into app/static/dist."""
+        from .assets import build_assets, check_assets, download_vendor
+
+        if not allow_cdn:
+            # Vendoren hoort bij de build: anders komt alles stil van de CDN
+            try:
+                fetched = download_vendor(app.static_folder)
+            except OSError as e:
+                raise click.ClickException(
+                    f"Could not download vendor files ({e}); commit app/static/vendor/ "
+                    "or rerun with --allow-cdn"
+                )
+            if fetched:
+                click.echo(f"Vendored {len(fetched)} files: {', '.join(fetched)}")
+
+        manifest = build_assets(app.static_folder)
+        click.echo(f"Built {len(manifest)} assets")
+        problems = check_assets(
+            app.jinja_loader.searchpath[0], app.static_folder, manifest, allow_cdn=allow_cdn
+        )
+        for problem in problems:
+            click.echo(f"  {problem}", err=True)
+        if problems:
+            sys.exit(1)
+
+    @assets_group.command("check")
+    @click.option(
+        "--allow-cdn", is_flag=True,
+        help="Accept vendor files that are not downloaded yet (development only).",
+    )
+    def assets_check_command(allow_cdn):
+        """Check that every asset referenced by a template or stylesheet resolves."""
+        from .assets import check_assets, load_manifest
+
+        problems = check_assets(
+            app.jinja_loader.searchpath[0],
+            app.static_folder,
+            load_manifest(app.static_folder),
+            allow_cdn=allow_cdn,
+        )
+        for problem in problems:
+            click.echo(problem, err=True)
+        if problems:
+            sys.exit(1)
+        click.echo("All referenced assets resolve")
@@ -0,0 +1,146 @@
+# app/compression.py
+"""
+Response-compressie (gzip, of brotli als het `Brotli` package geïnstalleerd is).
+
+- Enkel voor content types uit COMPRESS_MIMETYPES en als de client het
+  aanvraagt (Accept-Encoding); brotli krijgt voorrang op gzip.
+- Gebufferde responses: pas vanaf COMPRESS_MIN_SIZE bytes (kleine
+  responses worden er niet kleiner van).
+- Gestreamde responses (stream_page): elk stuk wordt gecomprimeerd en
+  meteen geflusht, zodat de browser de kop van de pagina al kan tonen
+  terwijl de rest nog gerenderd wordt.
+- Bestanden (send_file: direct_passthrough) en responses die al een
+  Content-Encoding hebben blijven ongemoeid.
+"""
+import gzip
+import zlib
+
+from flask import request
+
+_brotli = None
+
+
+def _load_brotli():
+    global _brotli
+    if _brotli is None:
+        try:
+            import brotli
+        except ImportError:
+            brotli = False
+        _brotli = brotli
+    return _brotli or None
+
+
+def accepted_encodings(header):
+    """Accept-Encoding -> set van encodings met q > 0."""
+    encodings = set()
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name and quality > 0:
+            encodings.add(name.strip().lower())
+    return encodings
+
+
+def choose_encoding(header):
+    encodings = accepted_encodings(header)
+    if "br" in encodings and _load_brotli():
+        return "br"
+    if "gzip" in encodings:
+        return "gzip"
+    return None
+
+
+class _GzipStream:
+    def __init__(self, level):
+        # wbits 16 + MAX_WBITS: gzip-header i.p.v. een kale zlib stream
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data):
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliStream:
+    def __init__(self, quality):
+        brotli = _load_brotli()
+        self._compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=quality)
+
+    def chunk(self, data):
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+def compress_stream(chunks, encoding, level):
+    """Comprimeer een iterable van (byte)strings stuk per stuk, met flush per stuk."""
+    stream = _BrotliStream(level) if encoding == "br" else _GzipStream(level)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            if chunk:
+                yield stream.chunk(chunk)
+        yield stream.finish()
+    finally:
+        # Client weg: ook de onderliggende stream (en zijn request context) sluiten
+        if hasattr(chunks, "close"):
+            chunks.close()
+
+
+def compress_bytes(data, encoding, level):
+    if encoding == "br":
+        brotli = _load_brotli()
+        return brotli.compress(data, mode=brotli.MODE_TEXT, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def compress_response(response, config):
+    if (
+        response.direct_passthrough
+        or response.status_code < 200
+        or response.status_code in (204, 206, 304)
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in config["COMPRESS_MIMETYPES"]
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = choose_encoding(request.headers.get("Accept-Encoding"))
+    if encoding is None:
+        return response
+    level = config["COMPRESS_BR_QUALITY"] if encoding == "br" else config["COMPRESS_GZIP_LEVEL"]
+
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding, level)
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < config["COMPRESS_MIN_SIZE"]:
+            return response
+        response.set_data(compress_bytes(data, encoding, level))
+
+    response.headers["Content-Encoding"] = encoding
+    if response.headers.get("ETag"):
+        # Andere bytes dan de ongecomprimeerde versie: sterke ETag afzwakken
+        tag, _ = response.get_etag()
+        response.set_etag(tag, weak=True)
+    return response
+
+
+def init_compression(app):
+    if not app.config["COMPRESS_ENABLED"]:
+        return
+
+    @app.after_request
+    def _compress(response):
+        return compress_response(response, app.config)
@@ -17,4 +17,18 @@ USER_ROLES = [
     ('reviewer', 'Reviewer'),
     ('editor', 'Editor'),
     ('admin', 'Administrator')
-]
\ No newline at end of file
+]
+
+COMPLAINT_CATEGORIES = [
+    'Plagiarism',
+    'Ethics / Compliance',
+    'Data quality',
+    'Inappropriate content',
+    'Other'
+]
+
+COMPLAINT_STATUSES = [
+    ('open', 'Open'),
+    ('resolved', 'Resolved'),
+    ('dismissed', 'Dismissed')
+]
@@ -0,0 +1,69 @@
+# app/db_routing.py
+"""
+Read-replica routing.
+
+Views met @read_replica lezen van de "replica" bind (DATABASE_REPLICA_URL);
+alle writes (flush, INSERT/UPDATE/DELETE) gaan altijd naar de primary.
+Zonder replica-config is alles een no-op en gaat alles naar de primary.
+
+Read-your-writes: na een write onthoudt de sessie-cookie het tijdstip van
+de write, en leest die browser DB_REPLICA_STICKY_SECONDS lang van de primary.
+"""
+import time
+from functools import wraps
+
+import sqlalchemy as sa
+from flask import g, request, session, current_app, has_request_context
+from flask_sqlalchemy.session import Session
+
+REPLICA_BIND = "replica"
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session die reads naar de replica kan sturen."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and not self._flushing
+            and not isinstance(clause, sa.UpdateBase)
+            and g.get("use_replica")
+        ):
+            engines = self._db.engines
+            if REPLICA_BIND in engines:
+                return engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _recently_wrote() -> bool:
+    wrote_at = session.get("db_write_at")
+    if not wrote_at:
+        return False
+    return time.time() - wrote_at < current_app.config["DB_REPLICA_STICKY_SECONDS"]
+
+
+def read_replica(view):
+    """Decorator: GET-requests van deze view lezen van de replica."""
+    @wraps(view)
+    def wrapped_view(*args, **kwargs):
+        if request.method == "GET" and not _recently_wrote():
+            g.use_replica = True
+        return view(*args, **kwargs)
+    return wrapped_view
+
+
+def init_replica_routing(app):
+    """Registreer de write-tracking die read-your-writes mogelijk maakt."""
+    if not app.config.get("DATABASE_REPLICA_URL"):
+        return
+
+    @sa.event.listens_for(RoutingSession, "after_flush")
+    def mark_write(_session, _flush_context):
+        if has_request_context():
+            g.db_wrote = True
+
+    @app.after_request
+    def stick_to_primary(response):
+        if g.get("db_wrote"):
+            session["db_write_at"] = time.time()
+        return response
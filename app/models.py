@@ -1,5 +1,55 @@
 from flask_sqlalchemy import SQLAlchemy
-db = SQLAlchemy()
+from sqlalchemy import DateTime
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import validates
+from sqlalchemy.sql.functions import FunctionElement
+from .db_routing import RoutingSession
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+
+
+class sortable_datetime(FunctionElement):
+    """
+    Datetime-expressie voor keyset-paginatie (ORDER BY + cursor-vergelijking).
+
+    SQLite bewaart datetimes als tekst: een server_default (now()) als
+    'YYYY-MM-DD HH:MM:SS', een waarde uit Python als '...SS.ffffff'. Die
+    vergelijken als strings verkeerd met een cursorwaarde, dus op SQLite
+    beide kanten normaliseren met datetime() (op de seconde; het id beslist
+    bij gelijke tijden). Op Postgres gewoon de kolom, zodat de index blijft werken.
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(sortable_datetime)
+def _compile_sortable_datetime(element, compiler, **kw):
+    return compiler.process(element.clauses, **kw)
+
+
+@compiles(sortable_datetime, "sqlite")
+def _compile_sortable_datetime_sqlite(element, compiler, **kw):
+    return f"datetime({compiler.process(element.clauses, **kw)})"
+
+# Lengte van Paper.abstract_snippet (kaarten tonen max. 2-3 regels)
+ABSTRACT_SNIPPET_LENGTH = 280
+
+
+def make_abstract_snippet(abstract):
+    """Korte versie van een abstract voor lijstweergaves."""
+    return abstract[:ABSTRACT_SNIPPET_LENGTH] if abstract else None
+
+
+def make_ai_total_score(business, academic):
+    """Gecombineerde AI-score (None zolang een van beide ontbreekt)."""
+    if business is None or academic is None:
+        return None
+    return business + academic
+
+
+def parse_interests(value):
+    """Company.interests als lijst: 'AI, Robotics,AI' -> ['AI', 'Robotics']."""
+    tags = [t.strip() for t in (value or "").split(",") if t.strip()]
+    return list(dict.fromkeys(tags))
 
 # ================================
 # USER
@@ -11,6 +61,13 @@ class User(db.Model):
     name = db.Column(db.String(255), nullable=False)
     email = db.Column(db.String(255), unique=True, nullable=False)
     role = db.Column(db.String(100), nullable=False, default ='User')
+    # Company-accounts: expliciete koppeling i.p.v. opzoeken op naam
+    company_id = db.Column(
+        db.Integer,
+        db.ForeignKey('Company.company_id', ondelete='SET NULL'),
+        nullable=True,
+        index=True,
+    )
     
     @property
     def role_display(self):
@@ -22,17 +79,23 @@ class User(db.Model):
         return self.role
 
     # Relationships
+    company = db.relationship('Company', foreign_keys=[company_id])
+
+    # passive_deletes: de ON DELETE CASCADE foreign keys ruimen de kinderen op
+    # in de database, i.p.v. ze eerst te laden en één DELETE per rij te sturen
     papers = db.relationship(
         'Paper',
         backref='author',
         lazy=True,
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     reviews = db.relationship(
         'Review',
         backref='reviewer',
         lazy=True,
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     def __repr__(self):
@@ -46,18 +109,58 @@ class Company(db.Model):
     __tablename__ = "Company"
 
     company_id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(255), nullable=False)
+    name = db.Column(db.String(255), nullable=False, index=True)
     industry = db.Column(db.String(255))
 
     # 🔹 Interests die we net toegevoegd hebben (MVP)
     interests = db.Column(db.String(255))  # bijv. "AI,Robotics,Biotech"
+    # Tot wanneer de interest-digest al verstuurd is (zie services/digest.py)
+    last_digest_at = db.Column(db.DateTime, nullable=True)
 
     # 🔹 N-M relatie via koppeltabel PaperCompany
     papers = db.relationship(
         "PaperCompany",
         back_populates="company",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
+    # Genormaliseerde kopie van `interests`, zodat de digest kan joinen op domein
+    interest_rows = db.relationship(
+        "CompanyInterest",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    @validates("interests")
+    def _sync_interest_rows(self, key, value):
+        # Bestaande rijen hergebruiken: delete + insert van dezelfde PK in één flush faalt
+        existing = {row.research_domain: row for row in self.interest_rows}
+        self.interest_rows = [
+            existing.get(tag) or CompanyInterest(research_domain=tag)
+            for tag in parse_interests(value)
+        ]
+        return value
+
+
+# Type-ahead (services/company_search.py): prefix-zoeken op lower(name);
+# text_pattern_ops zodat LIKE 'abc%' de index ook buiten de C-collatie gebruikt
+db.Index(
+    "ix_Company_name_lower_prefix",
+    db.func.lower(Company.name).label("name_lower"),
+    postgresql_ops={"name_lower": "text_pattern_ops"},
+)
+
+
+class CompanyInterest(db.Model):
+    """Eén rij per (company, domein) uit Company.interests."""
+    __tablename__ = "CompanyInterest"
+
+    company_id = db.Column(
+        db.Integer,
+        db.ForeignKey('Company.company_id', ondelete='CASCADE'),
+        primary_key=True
+    )
+    research_domain = db.Column(db.String(120), primary_key=True, index=True)
 
 
 
@@ -71,6 +174,8 @@ class Paper(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('User.user_id', ondelete='CASCADE'))
     title = db.Column(db.String(255), nullable=False)
     abstract = db.Column(db.Text)
+    # Voorberekend stuk van abstract, zodat lijsten de volledige Text niet laden
+    abstract_snippet = db.Column(db.String(300))
     research_domain = db.Column(db.String(120), default="General", nullable=False)
     upload_date = db.Column(db.DateTime, server_default=db.func.now())
 
@@ -105,26 +210,29 @@ class Paper(db.Model):
                 return label
         return self.research_domain
 
-    # Relationships
+    # Relationships (passive_deletes: zie User.papers)
     reviews = db.relationship(
         'Review',
         backref='paper',
         lazy=True,
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     companies = db.relationship(
         'PaperCompany',
         back_populates='paper',
         lazy=True,
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     complaints = db.relationship(
         'Complaint',
         backref='paper',
         lazy=True,
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     # AI fields
@@ -134,11 +242,77 @@ class Paper(db.Model):
     ai_strengths = db.Column(db.Text)
     ai_weaknesses = db.Column(db.Text)
     ai_status = db.Column(db.String(20), default="pending")
+    # Business + academic, opgeslagen zodat de leaderboard-index erop kan sorteren
+    ai_total_score = db.Column(db.Integer)
+    # Laatste berekening van de "similar papers" (services/related.py); NULL = te doen,
+    # ook als de paper geen enkele buur boven MIN_SCORE heeft
+    neighbors_computed_at = db.Column(db.DateTime)
+
+    @validates("abstract")
+    def _sync_abstract_snippet(self, key, value):
+        self.abstract_snippet = make_abstract_snippet(value)
+        return value
+
+    @validates("ai_business_score", "ai_academic_score")
+    def _sync_ai_total_score(self, key, value):
+        business = value if key == "ai_business_score" else self.ai_business_score
+        academic = value if key == "ai_academic_score" else self.ai_academic_score
+        self.ai_total_score = make_ai_total_score(business, academic)
+        return value
 
     def __repr__(self):
         return f"<Paper {self.paper_id}: {self.title}>"
 
 
+# AI-leaderboard: partiële indexen op afgewerkte analyses (globaal en per domein),
+# zodat een top-k een index scan van k rijen is i.p.v. een sort over alle papers
+# (papers zonder volledige score komen niet in de ranking: geen NULLS LAST nodig)
+LEADERBOARD_WHERE = db.and_(
+    Paper.ai_status == "done", Paper.ai_total_score.isnot(None)
+)
+
+db.Index(
+    "ix_Paper_ai_leaderboard",
+    Paper.ai_total_score.desc(),
+    Paper.paper_id.desc(),
+    postgresql_where=LEADERBOARD_WHERE,
+    sqlite_where=LEADERBOARD_WHERE,
+)
+db.Index(
+    "ix_Paper_ai_leaderboard_domain",
+    Paper.research_domain,
+    Paper.ai_total_score.desc(),
+    Paper.paper_id.desc(),
+    postgresql_where=LEADERBOARD_WHERE,
+    sqlite_where=LEADERBOARD_WHERE,
+)
+
+# AI-wachtrij (services/ai_queue.py, /readyz): enkel de pending papers
+AI_PENDING_WHERE = Paper.ai_status == "pending"
+db.Index(
+    "ix_Paper_ai_pending",
+    Paper.paper_id,
+    postgresql_where=AI_PENDING_WHERE,
+    sqlite_where=AI_PENDING_WHERE,
+)
+
+# Related-papers update (services/related.py): enkel papers zonder berekende buren
+NEIGHBORS_PENDING_WHERE = Paper.neighbors_computed_at.is_(None)
+db.Index(
+    "ix_Paper_neighbors_pending",
+    Paper.paper_id,
+    postgresql_where=NEIGHBORS_PENDING_WHERE,
+    sqlite_where=NEIGHBORS_PENDING_WHERE,
+)
+
+# Nieuwe papers per domein (interest-digest, aanbevelingen op /profile)
+db.Index(
+    "ix_Paper_domain_upload_date",
+    Paper.research_domain,
+    Paper.upload_date.desc(),
+)
+
+
 # ================================
 # PAPERCOMPANY (N-M TABLE)
 # ================================
@@ -169,12 +343,12 @@ class Review(db.Model):
     __tablename__ = "Review"
 
     review_id = db.Column(db.Integer, primary_key=True)
-    paper_id = db.Column(db.Integer, db.ForeignKey('Paper.paper_id', ondelete='CASCADE'))
-    reviewer_id = db.Column(db.Integer, db.ForeignKey('User.user_id', ondelete='CASCADE'))
+    paper_id = db.Column(db.Integer, db.ForeignKey('Paper.paper_id', ondelete='CASCADE'), index=True)
+    reviewer_id = db.Column(db.Integer, db.ForeignKey('User.user_id', ondelete='CASCADE'), index=True)
     company_id = db.Column(db.Integer, db.ForeignKey('Company.company_id', ondelete='SET NULL'), nullable=True)
     score = db.Column(db.Float)
     comments = db.Column(db.Text)
-    date_submitted = db.Column(db.DateTime, server_default=db.func.now())
+    date_submitted = db.Column(db.DateTime, server_default=db.func.now(), index=True)
 
     company = db.relationship('Company')
 
@@ -182,6 +356,127 @@ class Review(db.Model):
         return f"<Review Paper={self.paper_id}, Score={self.score}>"
 
 
+# ================================
+# PAPERNEIGHBOR (RELATED PAPERS)
+# ================================
+class PaperNeighbor(db.Model):
+    """Voorberekende top-k TF-IDF buren van een paper (zie services/related.py)."""
+    __tablename__ = "PaperNeighbor"
+
+    paper_id = db.Column(
+        db.Integer,
+        db.ForeignKey('Paper.paper_id', ondelete='CASCADE'),
+        primary_key=True
+    )
+    rank = db.Column(db.SmallInteger, primary_key=True, autoincrement=False)
+    neighbor_id = db.Column(
+        db.Integer,
+        db.ForeignKey('Paper.paper_id', ondelete='CASCADE'),
+        nullable=False,
+        index=True,
+    )
+    score = db.Column(db.Float, nullable=False)
+
+    neighbor = db.relationship('Paper', foreign_keys=[neighbor_id])
+
+    def __repr__(self):
+        return f"<PaperNeighbor {self.paper_id} #{self.rank} -> {self.neighbor_id}>"
+
+
+# ================================
+# PAPERSTATDAILY (VIEWS / DOWNLOADS)
+# ================================
+class PaperStatDaily(db.Model):
+    """Views en downloads per paper per dag (write-behind, zie services/counters.py)."""
+    __tablename__ = "PaperStatDaily"
+
+    paper_id = db.Column(
+        db.Integer,
+        db.ForeignKey('Paper.paper_id', ondelete='CASCADE'),
+        primary_key=True
+    )
+    day = db.Column(db.Date, primary_key=True, index=True)
+    views = db.Column(db.Integer, nullable=False, default=0)
+    downloads = db.Column(db.Integer, nullable=False, default=0)
+
+
+# ================================
+# INTERESTEVENT (INTEREST TOGGLES)
+# ================================
+class InterestEvent(db.Model):
+    """Log van interest-toggles (+1 aan, -1 uit) als input voor trending."""
+    __tablename__ = "InterestEvent"
+
+    event_id = db.Column(db.Integer, primary_key=True)
+    paper_id = db.Column(
+        db.Integer,
+        db.ForeignKey('Paper.paper_id', ondelete='CASCADE'),
+        nullable=False
+    )
+    company_id = db.Column(
+        db.Integer,
+        db.ForeignKey('Company.company_id', ondelete='CASCADE'),
+        nullable=False
+    )
+    delta = db.Column(db.SmallInteger, nullable=False)
+    created_at = db.Column(db.DateTime, server_default=db.func.now(), nullable=False, index=True)
+
+
+# ================================
+# PAPERTREND (TRENDING RANKING)
+# ================================
+class PaperTrend(db.Model):
+    """Voorberekende trending-score per paper (zie services/trends.py)."""
+    __tablename__ = "PaperTrend"
+
+    paper_id = db.Column(
+        db.Integer,
+        db.ForeignKey('Paper.paper_id', ondelete='CASCADE'),
+        primary_key=True
+    )
+    trend_score = db.Column(db.Float, nullable=False)
+    review_momentum = db.Column(db.Float, nullable=False, default=0)
+    score_change = db.Column(db.Float, nullable=False, default=0)
+    interest_momentum = db.Column(db.Float, nullable=False, default=0)
+    view_momentum = db.Column(db.Float, nullable=False, default=0)
+    computed_at = db.Column(db.DateTime, nullable=False)
+
+    __table_args__ = (
+        db.Index("ix_PaperTrend_rank", trend_score.desc(), paper_id.desc()),
+    )
+
+
+# ================================
+# REVIEWER PROFILE (SUGGESTIONS)
+# ================================
+class ReviewerProfile(db.Model):
+    """Voorberekende review-statistieken per reviewer (zie services/reviewer_suggestions.py)."""
+    __tablename__ = "ReviewerProfile"
+
+    user_id = db.Column(
+        db.Integer,
+        db.ForeignKey('User.user_id', ondelete='CASCADE'),
+        primary_key=True
+    )
+    review_count = db.Column(db.Integer, nullable=False, default=0)
+    # Reviews binnen het load-venster (huidige belasting)
+    recent_review_count = db.Column(db.Integer, nullable=False, default=0)
+    last_review_at = db.Column(db.DateTime)
+    refreshed_at = db.Column(db.DateTime, nullable=False, index=True)
+
+
+class ReviewerDomainStat(db.Model):
+    __tablename__ = "ReviewerDomainStat"
+
+    user_id = db.Column(
+        db.Integer,
+        db.ForeignKey('User.user_id', ondelete='CASCADE'),
+        primary_key=True
+    )
+    research_domain = db.Column(db.String(120), primary_key=True)
+    review_count = db.Column(db.Integer, nullable=False)
+
+
 # ================================
 # COMPLAINT
 # ================================
@@ -189,12 +484,63 @@ class Complaint(db.Model):
     __tablename__ = "Complaint"
 
     complaint_id = db.Column(db.Integer, primary_key=True)
-    paper_id = db.Column(db.Integer, db.ForeignKey('Paper.paper_id', ondelete='CASCADE'), nullable=False)
+    paper_id = db.Column(db.Integer, db.ForeignKey('Paper.paper_id', ondelete='CASCADE'), nullable=False, index=True)
     reporter_name = db.Column(db.String(255))
     reporter_email = db.Column(db.String(255))
     category = db.Column(db.String(100), default="General", nullable=False)
     description = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, server_default=db.func.now(), nullable=False)
 
+    # Moderatie: open -> resolved / dismissed
+    status = db.Column(db.String(20), nullable=False, default="open", server_default="open")
+    resolved_at = db.Column(db.DateTime)
+    resolved_by = db.Column(
+        db.Integer,
+        db.ForeignKey('User.user_id', ondelete='SET NULL'),
+        nullable=True,
+    )
+
+    __table_args__ = (
+        # Moderatiewachtrij: WHERE status = ? ORDER BY created_at DESC, complaint_id DESC
+        db.Index("ix_Complaint_queue", "status", created_at.desc(), complaint_id.desc()),
+    )
+
     def __repr__(self):
         return f"<Complaint Paper={self.paper_id}, Category={self.category}>"
+
+
+# ================================
+# SCHEDULER (JOB HISTORY / LOCKS)
+# ================================
+class JobRun(db.Model):
+    """Eén uitvoering van een geplande job (zie services/scheduler.py)."""
+    __tablename__ = "JobRun"
+
+    run_id = db.Column(db.Integer, primary_key=True)
+    job_name = db.Column(db.String(100), nullable=False)
+    started_at = db.Column(db.DateTime, nullable=False)
+    finished_at = db.Column(db.DateTime)
+    duration_ms = db.Column(db.Integer)
+    # running -> success / failed
+    status = db.Column(db.String(20), nullable=False, default="running")
+    result = db.Column(db.String(255))
+    error = db.Column(db.Text)
+    # hostname:pid van het proces dat de job draaide
+    host = db.Column(db.String(255))
+
+    __table_args__ = (
+        # Laatste run per job: WHERE job_name = ? ORDER BY started_at DESC
+        db.Index("ix_JobRun_job_started", job_name, started_at.desc()),
+    )
+
+    def __repr__(self):
+        return f"<JobRun {self.job_name} {self.status} {self.started_at}>"
+
+
+class JobLock(db.Model):
+    """Lease-lock per job voor databases zonder advisory locks (bv. SQLite)."""
+    __tablename__ = "JobLock"
+
+    job_name = db.Column(db.String(100), primary_key=True)
+    owner = db.Column(db.String(255), nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
@@ -10,25 +10,58 @@ from flask import (
     current_app,
     abort,
     send_from_directory,
+    Response,
+    stream_with_context,
+    jsonify,
 )
 from functools import wraps
 from collections import Counter
 from datetime import datetime
 import os
 import time
-import io # Nodig om bestanden in het geheugen te lezen
-from supabase import create_client # Nodig voor communicatie met Supabase
+from urllib.parse import urlsplit
 
-from sqlalchemy import or_, func
-from sqlalchemy.orm import joinedload
+from sqlalchemy import or_, func, cast, extract, Integer
+from sqlalchemy.orm import joinedload, load_only, selectinload
 from werkzeug.utils import secure_filename
-from pypdf import PdfReader # Zorg dat je pypdf geinstalleerd hebt
 
-from .models import db, User, Company, Paper, Review, PaperCompany, Complaint
-# We gebruiken analyze_paper_text nog steeds, maar extract_text_from_pdf doen we nu inline
-from app.services.ai_analysis import analyze_paper_text
+from .models import db, User, Company, Paper, Review, PaperCompany, Complaint, InterestEvent
+from .db_routing import read_replica
+from .streaming import stream_page
+from app.services.identity import get_current_identity, invalidate_identity
+from app.services.accounts import delete_user
+from app.services.facets import get_facets, get_catalogue_facets, invalidate_facets
+from app.services.company_search import search_companies, invalidate_company_search
+from app.services.health import get_readiness
+from app.services.leaderboard import get_leaderboard
+from app.services.related import get_related_papers, mark_stale
+from app.services.reviewer_suggestions import refresh_profiles
+from app.services.moderation import (
+    paper_complaints,
+    get_queue_page,
+    complaint_counts,
+    most_reported_papers,
+    bulk_update_status,
+    BULK_ACTIONS,
+)
+from app.services.counters import record_view, record_download
+from app.services.trends import trend_score_expr
+from app.services.view_models import paper_card
+from app.services.ai_analysis import (
+    analyze_paper_text,
+    apply_analysis_result,
+    extract_pdf_text,
+)
+# Gedeelde (gepoolde) Supabase client
+from app.services.storage import get_bucket, BUCKET_NAME
 # Import alleen HIER in routes
-from app.constants import PAPER_CATEGORIES, RESEARCH_DOMAINS, USER_ROLES
+from app.constants import (
+    PAPER_CATEGORIES,
+    RESEARCH_DOMAINS,
+    USER_ROLES,
+    COMPLAINT_CATEGORIES,
+    COMPLAINT_STATUSES,
+)
 
 main = Blueprint("main", __name__)
 
@@ -36,13 +69,6 @@ main = Blueprint("main", __name__)
 # CONSTANTS & CONFIG
 # ---------------------------------------------------
 ALLOWED_EXTENSIONS = {"pdf"}
-BUCKET_NAME = "paper-pdfs" # Zorg dat deze bucket bestaat in Supabase en 'Public' is
-
-def get_supabase():
-    """Helper om de Supabase client op te halen uit de config"""
-    url = current_app.config["SUPABASE_URL"]
-    key = current_app.config["SUPABASE_KEY"]
-    return create_client(url, key)
 
 def allowed_file(filename: str) -> bool:
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -105,6 +131,30 @@ def about():
     return render_template("about.html", title="About")
 
 
+# ---------------------------------------------------
+# COLUMN PROFILES
+# ---------------------------------------------------
+# Lijstweergaves (dashboard, top 5, profiel) tonen enkel een snippet: de
+# grote Text-kolommen (abstract, ai_summary, ai_strengths, ai_weaknesses)
+# worden niet geladen. paper_detail laadt de volledige rij.
+PAPER_LIST_COLUMNS = (
+    Paper.paper_id,
+    Paper.user_id,
+    Paper.title,
+    Paper.abstract_snippet,
+    Paper.research_domain,
+    Paper.upload_date,
+    Paper.ai_status,
+    Paper.ai_business_score,
+    Paper.ai_academic_score,
+    Paper.ai_total_score,
+)
+
+
+def paper_list_columns():
+    return load_only(*PAPER_LIST_COLUMNS)
+
+
 # ---------------------------------------------------
 # DASHBOARD HELPERS
 # ---------------------------------------------------
@@ -139,32 +189,9 @@ def compute_paper_score(paper: Paper, user_prefs, score_map, now: datetime):
     return 0.5 * pref_score + 0.3 * pop_score + 0.2 * recency_score
 
 
-def get_dashboard_data(args, sess):
-    """Shared dashboard logic: filters, sorting, scores & context."""
-    search = args.get("q", "").strip()
-    selected_domain = args.get("domain", "all")
-    selected_company = args.get("company", "").strip()
-    min_score = args.get("min_score", "").strip()
-    sort = args.get("sort", "newest")
-
-    # ------------------------------
-    # ACTIVE FILTERS
-    # ------------------------------
-    active_filters = 0
-    if search: active_filters += 1
-    if selected_domain != "all": active_filters += 1
-    if selected_company: active_filters += 1
-    if min_score:
-        try:
-            float(min_score)
-            active_filters += 1
-        except ValueError:
-            pass
-
-    # ------------------------------
-    # SCORE SUBQUERY
-    # ------------------------------
-    avg_subq = (
+def build_avg_score_subquery():
+    """Average score + review count per paper (one row per reviewed paper)."""
+    return (
         db.session.query(
             Review.paper_id.label("paper_id"),
             func.avg(Review.score).label("avg_score"),
@@ -174,11 +201,9 @@ def get_dashboard_data(args, sess):
         .subquery()
     )
 
-    # ------------------------------
-    # BASE QUERY
-    # ------------------------------
-    query = Paper.query.outerjoin(avg_subq, Paper.paper_id == avg_subq.c.paper_id)
 
+def apply_paper_filters(query, avg_subq, search, selected_domain, selected_company, min_score):
+    """Dashboard filters (search, domain, facility, min score) on a Paper query."""
     # SEARCH
     if search:
         query = query.filter(
@@ -214,87 +239,117 @@ def get_dashboard_data(args, sess):
         except ValueError:
             pass
 
-    # SORTING
+    return query
+
+
+def paper_sort_key(sort, avg_subq):
+    """Return (expression, descending) for a dashboard sort option."""
     if sort == "best":
-        query = query.order_by(func.coalesce(avg_subq.c.avg_score, 0).desc())
-    elif sort == "oldest":
-        query = query.order_by(Paper.upload_date.asc())
-    elif sort == "a_to_z":
-        query = query.order_by(Paper.title.asc())
-    elif sort == "z_to_a":
-        query = query.order_by(Paper.title.desc())
-    elif sort == "most_reviewed":
-        query = query.order_by(
-            func.coalesce(avg_subq.c.review_count, 0).desc()
-        )
-    elif sort == "ai_score":
-        query = query.order_by(
-            (Paper.ai_business_score + Paper.ai_academic_score).desc()
-        )
-    else:
-        # newest
-        query = query.order_by(Paper.upload_date.desc())
+        return func.coalesce(avg_subq.c.avg_score, 0), True
+    if sort == "oldest":
+        return Paper.upload_date, False
+    if sort == "a_to_z":
+        return Paper.title, False
+    if sort == "z_to_a":
+        return Paper.title, True
+    if sort == "most_reviewed":
+        return func.coalesce(avg_subq.c.review_count, 0), True
+    if sort == "ai_score":
+        return Paper.ai_total_score, True
+    if sort == "trending":
+        # Voorberekend door `flask trends` (services/trends.py)
+        return trend_score_expr(Paper.paper_id), True
+    # newest
+    return Paper.upload_date, True
 
-    # EXECUTE WITH JOINEDLOAD
-    papers = (
-        query.options(
-            joinedload(Paper.author),
-            joinedload(Paper.reviews).joinedload(Review.reviewer),
-            joinedload(Paper.reviews).joinedload(Review.company),
-            joinedload(Paper.companies).joinedload(PaperCompany.company),
-        ).all()
-    )
 
-    # SCORE MAP
-    score_map = {
-        row.paper_id: {
-            "avg": round(float(row.avg_score), 1) if row.avg_score else None,
-            "count": row.review_count,
-        }
-        for row in db.session.query(
-            avg_subq.c.paper_id,
-            avg_subq.c.avg_score,
-            avg_subq.c.review_count,
-        ).all()
-    }
+def get_dashboard_data(args, sess):
+    """Shared dashboard logic: filters, sorting, scores & context."""
+    search = args.get("q", "").strip()
+    selected_domain = args.get("domain", "all")
+    selected_company = args.get("company", "").strip()
+    min_score = args.get("min_score", "").strip()
+    sort = args.get("sort", "newest")
 
-    # TOP 5 AI PAPERS
-    top5 = (
-        Paper.query.filter(Paper.ai_status == "done")
-        .order_by((Paper.ai_business_score + Paper.ai_academic_score).desc())
-        .limit(5)
-        .all()
+    # ------------------------------
+    # ACTIVE FILTERS
+    # ------------------------------
+    active_filters = 0
+    if search: active_filters += 1
+    if selected_domain != "all": active_filters += 1
+    if selected_company: active_filters += 1
+    if min_score:
+        try:
+            float(min_score)
+            active_filters += 1
+        except ValueError:
+            pass
+
+    # ------------------------------
+    # SCORE SUBQUERY
+    # ------------------------------
+    avg_subq = build_avg_score_subquery()
+
+    # ------------------------------
+    # BASE QUERY
+    # ------------------------------
+    query = Paper.query.outerjoin(avg_subq, Paper.paper_id == avg_subq.c.paper_id)
+    query = apply_paper_filters(
+        query, avg_subq, search, selected_domain, selected_company, min_score
+    )
+
+    # SORTING
+    sort_expr, descending = paper_sort_key(sort, avg_subq)
+    query = query.order_by(sort_expr.desc() if descending else sort_expr.asc())
+
+    # JOINEDLOAD (reviews zelf zijn niet nodig: gemiddelde + aantal komen mee uit avg_subq)
+    query = query.options(
+        paper_list_columns(),
+        joinedload(Paper.companies).joinedload(PaperCompany.company),
+    ).add_columns(avg_subq.c.avg_score, avg_subq.c.review_count)
+
+    # TOP 5 AI PAPERS (per domein als er op domein gefilterd wordt)
+    top5 = get_leaderboard(
+        selected_domain if selected_domain != "all" else None,
+        options=[paper_list_columns()],
     )
 
     # INTERESTED LIST
     interested_ids = set()
     if sess.get("user_role") == "Company":
-        user = User.query.get(sess["user_id"])
-        company = Company.query.filter_by(name=user.name).first()
-        if company:
-            links = PaperCompany.query.filter_by(
-                company_id=company.company_id, relation_type="interest"
-            ).all()
-            interested_ids = {l.paper_id for l in links}
-
-    # FILTER POPULATION
-    domain_filters = sorted(
-        d[0] for d in db.session.query(Paper.research_domain).distinct()
-    )
-    companies = Company.query.order_by(Company.name).all()
+        identity = get_current_identity()
+        if identity and identity.company_id:
+            interested_ids = {
+                row.paper_id
+                for row in db.session.query(PaperCompany.paper_id).filter_by(
+                    company_id=identity.company_id, relation_type="interest"
+                )
+            }
+
+    # VIEW MODELS: facility-namen, interesses en scores één keer per kaart.
+    # Lazy: bij een gestreamde pagina loopt de query pas als de kop al verstuurd is.
+    def papers():
+        for paper, avg_score, review_count in query.all():
+            yield paper_card(paper, avg_score, review_count, interested_ids)
+
+    # FILTER POPULATION + FACET COUNTS
+    # Opties komen uit de (gecachte) catalogus-facets, tellingen uit de huidige filterset
+    catalogue = get_catalogue_facets()
+    facets = get_facets(search, selected_domain, selected_company, min_score)
 
     return {
         "title": "Dashboard",
-        "papers": papers,
-        "score_map": score_map,
-        "domains": domain_filters,
-        "companies": companies,
+        "papers": papers(),
+        # Elke paper heeft precies één AI-status: de som is het aantal resultaten
+        "paper_count": sum(facets["ai_status"].values()),
+        "domains": list(catalogue["domains"]),
+        "companies": list(catalogue["facilities"]),
+        "facets": facets,
         "selected_domain": selected_domain,
         "selected_company": selected_company,
         "min_score": min_score,
         "sort": sort,
         "query": search,
-        "interested_ids": interested_ids,
         "top5": top5,
         "active_filters": active_filters,
     }
@@ -304,9 +359,10 @@ def get_dashboard_data(args, sess):
 # DASHBOARD
 # ---------------------------------------------------
 @main.route("/dashboard")
+@read_replica
 def dashboard():
     context = get_dashboard_data(request.args, session)
-    return render_template("dashboard.html", **context)
+    return stream_page("dashboard.html", **context)
 
 
 @main.route("/search_papers")
@@ -320,8 +376,12 @@ def search_papers():
 # ---------------------------------------------------
 @main.route("/paper/<int:paper_id>/download")
 def download_paper(paper_id):
-    paper = Paper.query.get_or_404(paper_id)
-    
+    paper = Paper.query.options(load_only(Paper.paper_id, Paper.file_path)).get_or_404(paper_id)
+    record_download(paper.paper_id)
+
+    if current_app.config["STORAGE_BACKEND"] == "local":
+        return send_from_directory(current_app.config["STORAGE_LOCAL_DIR"], paper.file_path)
+
     # We bouwen de publieke URL naar Supabase
     supabase_url = current_app.config["SUPABASE_URL"]
     
@@ -337,9 +397,9 @@ def download_paper(paper_id):
 # UPLOAD PAPER HELPERS (AANGEPAST VOOR SUPABASE)
 # ---------------------------------------------------
 def get_upload_paper_context():
-    companies = Company.query.order_by(Company.name).all()
+    # Geen volledige company-lijst meer: het formulier zoekt via /companies/search
     domains = ["AI", "Robotics", "Biotech", "Software"]
-    return {"companies": companies, "domains": domains, "title": "Upload Paper"}
+    return {"domains": domains, "title": "Upload Paper"}
 
 
 def process_paper_upload(user_id: int):
@@ -373,13 +433,11 @@ def process_paper_upload(user_id: int):
 
     # 2. Uploaden naar Supabase Storage
     try:
-        supabase = get_supabase()
-        
         # We moeten de file pointer uitlezen. 
         # BELANGRIJK: Na .read() staat de pointer aan het eind. We slaan het op in een variabele.
         file_content = file.read() 
         
-        res = supabase.storage.from_(BUCKET_NAME).upload(
+        res = get_bucket().upload(
             path=unique_name,
             file=file_content,
             file_options={"content-type": "application/pdf"}
@@ -432,30 +490,20 @@ def process_paper_upload(user_id: int):
         )
 
     db.session.commit()
+    invalidate_facets()
+    if new_company_name:
+        invalidate_company_search()
 
     # AUTOMATIC AI ANALYSIS (Aangepast voor In-Memory PDF)
     print(f"🔍 Starting automatic AI analysis for: {unique_name}")
 
     try:
         # We gebruiken de bytes die we net hebben geupload (file_content)
-        # We wrappen dit in io.BytesIO zodat PyPDF denkt dat het een bestand is
-        pdf_stream = io.BytesIO(file_content)
-        
-        reader = PdfReader(pdf_stream)
-        full_text = "\n".join(page.extract_text() or "" for page in reader.pages)
+        full_text = extract_pdf_text(file_content)
 
         # Roep de AI service aan
         ai_result = analyze_paper_text(full_text)
-
-        if ai_result:
-            paper.ai_business_score = ai_result.get("business_score")
-            paper.ai_academic_score = ai_result.get("academic_score")
-            paper.ai_summary = ai_result.get("summary")
-            paper.ai_strengths = ai_result.get("strengths")
-            paper.ai_weaknesses = ai_result.get("weaknesses")
-            paper.ai_status = "done"
-        else:
-            paper.ai_status = "failed"
+        apply_analysis_result(paper, ai_result)
 
     except Exception as e:
         print("❌ AI Analysis FAILED:", e)
@@ -475,13 +523,9 @@ def process_paper_upload(user_id: int):
 @roles_required("Researcher", "Founder", "System/Admin")
 def upload_paper():
     if request.method == "GET":
-        # Krijg companies zoals voorheen
-        companies = Company.query.order_by(Company.name).all()
-        
-        # Geef dropdowns door aan template
+        # Geef dropdowns door aan template (facility: type-ahead via /companies/search)
         return render_template(
             "upload_paper.html",
-            companies=companies,
             paper_categories=PAPER_CATEGORIES,
             research_domains=RESEARCH_DOMAINS
         )   
@@ -502,7 +546,6 @@ def load_paper_with_relations(paper_id: int) -> Paper:
             joinedload(Paper.reviews).joinedload(Review.reviewer),
             joinedload(Paper.reviews).joinedload(Review.company),
             joinedload(Paper.companies).joinedload(PaperCompany.company),
-            joinedload(Paper.complaints),
         ).get_or_404(paper_id)
     )
 
@@ -551,13 +594,13 @@ def handle_review_post(paper: Paper, can_review: bool):
     )
     db.session.add(review)
     db.session.commit()
+    invalidate_facets()
+    refresh_profiles([review.reviewer_id])
     flash("Review gepubliceerd en zichtbaar voor iedereen.", "success")
     return redirect(url_for("main.paper_detail", paper_id=paper.paper_id))
 
 
-def build_paper_detail_context(
-    paper: Paper, companies, can_review: bool, complaint_submitted: bool
-):
+def build_paper_detail_context(paper: Paper, can_review: bool, complaint_submitted: bool):
     scored = [r.score for r in paper.reviews if r.score is not None]
     average_score = round(sum(scored) / len(scored), 1) if scored else None
     score_count = len(scored)
@@ -568,16 +611,12 @@ def build_paper_detail_context(
     can_view_complaints = session.get("user_role") in ["System/Admin", "Founder"]
     complaints_sorted = []
     if can_view_complaints:
-        complaints_sorted = sorted(
-            paper.complaints,
-            key=lambda c: c.created_at or datetime.min,
-            reverse=True,
-        )
+        # Enkel voor moderators laden (niet meer mee-gejoind voor elke bezoeker)
+        complaints_sorted = paper_complaints(paper.paper_id)
 
     return {
         "title": paper.title,
         "paper": paper,
-        "companies": companies,
         "can_review": can_review,
         "average_score": average_score,
         "score_count": score_count,
@@ -585,6 +624,7 @@ def build_paper_detail_context(
         "can_view_complaints": can_view_complaints,
         "complaints": complaints_sorted,
         "complaint_submitted": complaint_submitted,
+        "related": get_related_papers(paper.paper_id),
     }
 
 
@@ -592,22 +632,42 @@ def build_paper_detail_context(
 # PAPER DETAIL + REVIEWS
 # ---------------------------------------------------
 @main.route("/papers/<int:paper_id>", methods=["GET", "POST"])
+@read_replica
 def paper_detail(paper_id):
     paper = load_paper_with_relations(paper_id)
-    companies = Company.query.order_by(Company.name).all()
     can_review_roles = ["Reviewer", "Company", "System/Admin", "Founder"]
     can_review = session.get("user_role") in can_review_roles
 
     if request.method == "POST":
         return handle_review_post(paper, can_review)
 
+    record_view(paper.paper_id)
     complaint_submitted = request.args.get("complaint_submitted") == "1"
-    context = build_paper_detail_context(
-        paper, companies, can_review, complaint_submitted
-    )
+    context = build_paper_detail_context(paper, can_review, complaint_submitted)
     return render_template("paper_detail.html", **context)
 
 
+@main.route("/papers/<int:paper_id>/suggest_reviewers")
+@login_required
+@roles_required("System/Admin", "Founder")
+def suggest_reviewers_view(paper_id):
+    from app.services.reviewer_suggestions import suggest_reviewers, LOAD_WINDOW_DAYS
+
+    paper = Paper.query.options(
+        load_only(
+            Paper.paper_id, Paper.user_id, Paper.title, Paper.research_domain
+        )
+    ).get_or_404(paper_id)
+    limit = request.args.get("limit", 10, type=int)
+    return render_template(
+        "suggest_reviewers.html",
+        title="Suggested reviewers",
+        paper=paper,
+        suggestions=suggest_reviewers(paper, limit=max(1, min(limit, 50))),
+        load_window_days=LOAD_WINDOW_DAYS,
+    )
+
+
 # ---------------------------------------------------
 # REPORT / COMPLAINT
 # ---------------------------------------------------
@@ -653,6 +713,107 @@ def submit_complaint(paper_id):
     )
 
 
+# ---------------------------------------------------
+# ADMIN: COMPLAINT MODERATION QUEUE
+# ---------------------------------------------------
+def parse_queue_filters(args):
+    from app.services.export import parse_date
+
+    status = args.get("status", "open")
+    if status not in {value for value, _ in COMPLAINT_STATUSES}:
+        status = "open"
+    try:
+        since = parse_date(args.get("since"))
+        until = parse_date(args.get("until"))
+    except ValueError as e:
+        flash(str(e), "error")
+        since = until = None
+    return {
+        "status": status,
+        "category": args.get("category") or None,
+        "paper_id": args.get("paper_id", type=int),
+        "since": since,
+        "until": until,
+    }
+
+
+def is_local_url(url):
+    """
+    Enkel een pad op deze site: geen scheme of host, ook niet via een
+    backslash of stuurteken (browsers lezen "/\\evil.example" en
+    "/\t/evil.example" als "//evil.example").
+    """
+    if not url.startswith("/") or any(c == "\\" or ord(c) < 32 for c in url):
+        return False
+    parts = urlsplit(url)
+    return not parts.scheme and not parts.netloc
+
+
+@main.route("/admin/complaints")
+@login_required
+@roles_required("System/Admin", "Founder")
+def complaint_queue():
+    filters = parse_queue_filters(request.args)
+
+    cursor = None
+    before = request.args.get("before")
+    before_id = request.args.get("before_id", type=int)
+    if before and before_id:
+        try:
+            cursor = (datetime.fromisoformat(before), before_id)
+        except ValueError:
+            cursor = None
+
+    complaints, next_cursor = get_queue_page(filters, cursor)
+    paper_counts = complaint_counts(
+        {c.paper_id for c in complaints}, status=filters["status"]
+    )
+
+    # Filters meenemen in de "volgende pagina"-link
+    next_url = None
+    if next_cursor:
+        params = {k: v for k, v in request.args.items() if k not in ("before", "before_id")}
+        next_url = url_for(
+            "main.complaint_queue",
+            **params,
+            before=next_cursor[0].isoformat(),
+            before_id=next_cursor[1],
+        )
+
+    return render_template(
+        "complaint_queue.html",
+        title="Moderation queue",
+        complaints=complaints,
+        paper_counts=paper_counts,
+        most_reported=most_reported_papers(status=filters["status"]),
+        filters=filters,
+        args=request.args,
+        categories=COMPLAINT_CATEGORIES,
+        statuses=COMPLAINT_STATUSES,
+        next_url=next_url,
+    )
+
+
+@main.route("/admin/complaints/bulk", methods=["POST"])
+@login_required
+@roles_required("System/Admin", "Founder")
+def complaint_bulk_action():
+    action = request.form.get("action")
+    if action not in BULK_ACTIONS:
+        abort(400)
+
+    complaint_ids = [
+        int(value) for value in request.form.getlist("complaint_ids") if value.isdigit()
+    ]
+    updated = bulk_update_status(complaint_ids, action, session.get("user_id"))
+    flash(f"{updated} complaint(s) marked as {BULK_ACTIONS[action]}.", "success")
+    next_url = request.form.get("next") or ""
+    if not is_local_url(next_url):
+        next_url = url_for("main.complaint_queue")
+    return redirect(next_url)
+
+
+
 # ---------------------------------------------------
 # AUTH ROUTES
 # ---------------------------------------------------
@@ -673,6 +834,8 @@ def login():
         session["user_id"] = user.user_id
         session["user_name"] = user.name
         session["user_role"] = user.role
+        # Nieuwe identity_version: geen cache-entry van een vorige sessie hergebruiken
+        invalidate_identity(user.user_id)
         return redirect(url_for("main.index"))
     return render_template("login.html", title="Login")
 
@@ -698,16 +861,22 @@ def register():
         db.session.flush()  # zodat user.user_id al bestaat
 
         if role == "Company":
-            existing_company = Company.query.filter_by(name=name).first()
-            if not existing_company:
+            company = Company.query.filter_by(name=name).first()
+            if not company:
                 company = Company(name=name, industry=None)
                 db.session.add(company)
+                db.session.flush()
+            user.company_id = company.company_id
 
         db.session.commit()
+        if role == "Company":
+            invalidate_company_search()
 
         session["user_id"] = user.user_id
         session["user_name"] = user.name
         session["user_role"] = user.role
+        # Nieuwe identity_version: geen cache-entry van een vorige sessie hergebruiken
+        invalidate_identity(user.user_id)
 
         flash("Account created successfully.", "success")
         return redirect(url_for("main.index"))
@@ -716,15 +885,22 @@ def register():
 
 
 # ---------------------------------------------------
-# TEST DATABASE CONNECTION
+# HEALTH PROBES (load balancer / orchestrator)
 # ---------------------------------------------------
-@main.route("/test_db")
-def test_db():
-    try:
-        users = User.query.all()
-        return f"DB werkt! Aantal users in tabel User: {len(users)}"
-    except Exception as e:
-        return f"Fout bij DB-verbinding: {e}"
+@main.route("/healthz")
+def healthz():
+    """Liveness: het process antwoordt. Geen database of andere I/O."""
+    return jsonify({"status": "ok"})
+
+
+@main.route("/readyz")
+def readyz():
+    """Readiness: database, pool, storage en AI-wachtrij (gecached, zie services/health.py)."""
+    report, age = get_readiness(current_app._get_current_object())
+    response = jsonify({**report, "cache_age_seconds": round(age, 1)})
+    response.status_code = 503 if report["status"] == "unavailable" else 200
+    response.cache_control.no_store = True
+    return response
 
 
 # ---------------------------------------------------
@@ -741,7 +917,12 @@ def change_role():
             flash("Choose a valid role.", "error")
             return redirect(url_for("main.change_role"))
         user.role = new_role
+        if new_role == "Company" and not user.company_id:
+            company = Company.query.filter_by(name=user.name).first()
+            if company:
+                user.company_id = company.company_id
         db.session.commit()
+        invalidate_identity(user.user_id)
         session["user_role"] = new_role
         flash("Role updated successfully.", "success")
         return redirect(url_for("main.index"))
@@ -756,7 +937,6 @@ def change_role():
 # UPDATE PAPER HELPERS
 # ---------------------------------------------------
 def build_update_paper_context(paper: Paper, current_facility):
-    companies = Company.query.order_by(Company.name).all()
     domains = [
         "AI",
         "Robotics",
@@ -768,7 +948,6 @@ def build_update_paper_context(paper: Paper, current_facility):
     ]
     return {
         "paper": paper,
-        "companies": companies,
         "domains": domains,
         "current_facility": current_facility,
         "title": "Update Paper",
@@ -821,7 +1000,13 @@ def handle_update_paper_post(paper: Paper):
             )
         )
 
+    # Titel/abstract gewijzigd: buren opnieuw laten berekenen (flask related)
+    mark_stale(paper.paper_id)
+
     db.session.commit()
+    invalidate_facets()
+    if new_company_name:
+        invalidate_company_search()
     flash("Paper updated successfully.", "success")
     return redirect(url_for("main.dashboard"))
 
@@ -877,10 +1062,9 @@ def delete_paper(paper_id):
     # STAP 1: Verwijder het bestand uit Supabase Storage
     # ---------------------------------------------------------
     try:
-        supabase = get_supabase()
         # De .remove() functie verwacht een LIJST van bestandsnamen
         # Let op: paper.file_path is nu de naam in de bucket (bijv. "12_1783_thesis.pdf")
-        res = supabase.storage.from_(BUCKET_NAME).remove([paper.file_path])
+        res = get_bucket().remove([paper.file_path])
         
         # Optioneel: check of er een error was in de response (afhankelijk van versie)
         # print("Supabase remove result:", res)
@@ -888,6 +1072,7 @@ def delete_paper(paper_id):
     except Exception as e:
         # Als het mislukt (bijv. bestand bestond al niet meer), loggen we het
         # Maar we gaan wel door met de DB delete, anders kan de gebruiker nooit van zijn paper af.
+        # Het achtergebleven bestand ruimt `flask storage reconcile` later op.
         print(f"⚠️ LET OP: Kon bestand niet uit Supabase verwijderen: {e}")
 
     # ---------------------------------------------------------
@@ -895,6 +1080,7 @@ def delete_paper(paper_id):
     # ---------------------------------------------------------
     db.session.delete(paper)
     db.session.commit()
+    invalidate_facets()
     
     flash("Paper deleted successfully (and removed from cloud storage).", "success")
     return redirect(url_for("main.dashboard"))
@@ -915,6 +1101,7 @@ def add_company():
         company = Company(name=name, industry=industry)
         db.session.add(company)
         db.session.commit()
+        invalidate_company_search()
         flash("Company added successfully.", "success")
         return redirect(url_for("main.list_companies"))
 
@@ -925,67 +1112,151 @@ def add_company():
 # LIST COMPANIES
 # ---------------------------------------------------
 @main.route("/companies")
+@read_replica
 def list_companies():
     companies = Company.query.all()
     return render_template("list_companies.html", title="Companies", companies=companies)
 
 
+# ---------------------------------------------------
+# COMPANY TYPE-AHEAD (JSON)
+# ---------------------------------------------------
+@main.route("/companies/search")
+@read_replica
+def company_search():
+    """Top-N companies waarvan de naam met ?prefix= begint (paper-formulieren)."""
+    limit = request.args.get("limit", type=int) or current_app.config["COMPANY_SEARCH_LIMIT"]
+    companies = search_companies(request.args.get("prefix", ""), limit)
+    response = jsonify({"data": companies})
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config["COMPANY_SEARCH_MAX_AGE"]
+    return response
+
+
+# ---------------------------------------------------
+# ADMIN EXPORT (STREAMING)
+# ---------------------------------------------------
+@main.route("/admin/export/<dataset>")
+@login_required
+@roles_required("System/Admin", "Founder")
+def export_data(dataset):
+    from app.services.export import (
+        DATASETS,
+        FORMATS,
+        CONTENT_TYPES,
+        ExportUnavailable,
+        stream_export,
+        export_filename,
+        parse_date,
+    )
+
+    fmt = request.args.get("format", "csv")
+    use_gzip = request.args.get("gzip") == "1"
+
+    if dataset not in DATASETS or fmt not in FORMATS:
+        abort(404)
+
+    try:
+        since = parse_date(request.args.get("since"))
+        until = parse_date(request.args.get("until"))
+    except ValueError:
+        abort(400)
+
+    try:
+        chunks = stream_export(
+            dataset, fmt=fmt, since=since, until=until, gzip=use_gzip
+        )
+    except ExportUnavailable as e:
+        # Vóór de response: anders een 200 met een afgebroken bestand
+        abort(501, description=str(e))
+    filename = export_filename(dataset, fmt, gzip=use_gzip)
+
+    return Response(
+        stream_with_context(chunks),
+        mimetype="application/gzip" if use_gzip else CONTENT_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 # ---------------------------------------------------
 # PROFILE HELPERS
 # ---------------------------------------------------
+def profile_page(section: str) -> int:
+    """Paginanummer van een profielsectie (?papers_page=2, ...)."""
+    return max(1, request.args.get(f"{section}_page", 1, type=int))
+
+
 def get_profile_data(user_id: int):
+    """
+    Profiel met per sectie één pagina (PROFILE_PAGE_SIZE) en tellingen via
+    COUNT, zodat het aantal queries niet groeit met de geschiedenis van de user.
+    """
     user = User.query.get(user_id)
+    per_page = current_app.config["PROFILE_PAGE_SIZE"]
+    author_only = selectinload(Paper.author).load_only(User.user_id, User.name)
 
     authored_papers = (
-        Paper.query.filter_by(user_id=user.user_id)
-        .order_by(Paper.upload_date.desc())
-        .all()
+        Paper.query.options(paper_list_columns())
+        .filter_by(user_id=user.user_id)
+        .order_by(Paper.upload_date.desc(), Paper.paper_id.desc())
+        .paginate(page=profile_page("papers"), per_page=per_page, error_out=False)
     )
 
-    interested_papers = []
+    interested_papers = None
     company = None
     recommended_papers = []
+    active_domains = None
 
     if user.role == "Company":
-        company = Company.query.filter_by(name=user.name).first()
+        company = user.company
         if company:
-            links = (
-                PaperCompany.query.filter_by(
-                    company_id=company.company_id, relation_type="interest"
+            interested_papers = (
+                Paper.query.options(paper_list_columns(), author_only)
+                .join(PaperCompany, PaperCompany.paper_id == Paper.paper_id)
+                .filter(
+                    PaperCompany.company_id == company.company_id,
+                    PaperCompany.relation_type == "interest",
                 )
-                .join(Paper, Paper.paper_id == PaperCompany.paper_id)
-                .options(joinedload(PaperCompany.paper).joinedload(Paper.author))
-                .all()
+                .order_by(Paper.upload_date.desc(), Paper.paper_id.desc())
+                .paginate(page=profile_page("interested"), per_page=per_page, error_out=False)
             )
-            interested_papers = [link.paper for link in links]
 
             if company.interests:
                 tags = [t.strip() for t in company.interests.split(",") if t.strip()]
                 if tags:
                     recommended_papers = (
-                        Paper.query.filter(Paper.research_domain.in_(tags))
+                        Paper.query.options(paper_list_columns(), author_only)
+                        .filter(Paper.research_domain.in_(tags))
                         .order_by(Paper.upload_date.desc())
                         .limit(5)
                         .all()
                     )
+    else:
+        active_domains = (
+            db.session.query(func.count(Paper.research_domain.distinct()))
+            .join(Review, Review.paper_id == Paper.paper_id)
+            .filter(Review.reviewer_id == user.user_id)
+            .scalar()
+        )
 
     reviews = (
-        Review.query.filter_by(reviewer_id=user.user_id)
-        .order_by(Review.date_submitted.desc())
-        .all()
+        Review.query.options(
+            selectinload(Review.paper).load_only(Paper.paper_id, Paper.title)
+        )
+        .filter_by(reviewer_id=user.user_id)
+        .order_by(Review.date_submitted.desc(), Review.review_id.desc())
+        .paginate(page=profile_page("reviews"), per_page=per_page, error_out=False)
     )
 
-    papers_count = len(authored_papers)
-    reviews_count = len(reviews)
-
     return {
         "user": user,
         "company": company,
         "authored_papers": authored_papers,
         "interested_papers": interested_papers,
         "reviews": reviews,
-        "papers_count": papers_count,
-        "reviews_count": reviews_count,
+        "papers_count": authored_papers.total,
+        "reviews_count": reviews.total,
+        "active_domains": active_domains,
         "recommended_papers": recommended_papers,
     }
 
@@ -995,6 +1266,7 @@ def get_profile_data(user_id: int):
 # ---------------------------------------------------
 @main.route("/profile")
 @login_required
+@read_replica
 def profile():
     context = get_profile_data(session["user_id"])
     return render_template("profile.html", **context)
@@ -1019,7 +1291,7 @@ def build_edit_profile_context(user: User):
     company_interests_list = []
 
     if user.role == "Company":
-        company = Company.query.filter_by(name=user.name).first()
+        company = user.company
         if company and company.interests:
             company_interests_list = [
                 t.strip() for t in company.interests.split(",") if t.strip()
@@ -1035,9 +1307,7 @@ def build_edit_profile_context(user: User):
 
 
 def handle_edit_profile_post(user: User):
-    company = None
-    if user.role == "Company":
-        company = Company.query.filter_by(name=user.name).first()
+    company = user.company if user.role == "Company" else None
 
     new_name = (request.form.get("name") or "").strip()
     new_email = (request.form.get("email") or "").strip()
@@ -1050,6 +1320,7 @@ def handle_edit_profile_post(user: User):
         company.interests = ",".join(selected_interests) if selected_interests else None
 
     db.session.commit()
+    invalidate_identity(user.user_id)
 
     session["user_name"] = user.name
     session["user_email"] = user.email
@@ -1076,31 +1347,44 @@ def edit_profile():
 # ---------------------------------------------------
 # STATS HELPERS
 # ---------------------------------------------------
-def get_stats_data():
-    total_reviews = Review.query.count()
-    total_papers = Paper.query.count()
-    ai_done = Paper.query.filter_by(ai_status="done").count()
-    ai_pending = Paper.query.filter_by(ai_status="pending").count()
+def weekday_expr(column):
+    """Weekdag in SQL zoals datetime.weekday(): 0 = maandag ... 6 = zondag."""
+    if db.session.get_bind().dialect.name == "postgresql":
+        return extract("isodow", column) - 1
+    # SQLite: %w geeft 0 = zondag
+    return (cast(func.strftime("%w", column), Integer) + 6) % 7
 
-    weekday_map = {}
-    for r in Review.query.all():
-        if r.date_submitted:
-            day = r.date_submitted.weekday()
-            weekday_map[day] = weekday_map.get(day, 0) + 1
 
+def get_stats_data():
+    """KPI's en weekdagverdeling via twee GROUP BY's (geen volledige tabellen laden)."""
+    review_day = weekday_expr(Review.date_submitted)
+    review_rows = (
+        db.session.query(review_day, func.count(Review.review_id))
+        .group_by(review_day)
+        .all()
+    )
+    paper_day = weekday_expr(Paper.upload_date)
+    paper_rows = (
+        db.session.query(paper_day, Paper.ai_status, func.count(Paper.paper_id))
+        .group_by(paper_day, Paper.ai_status)
+        .all()
+    )
+
+    weekday_map = {int(day): n for day, n in review_rows if day is not None}
     paper_weekday_map = {}
-    for p in Paper.query.all():
-        if p.upload_date:
-            day = p.upload_date.weekday()
-            paper_weekday_map[day] = paper_weekday_map.get(day, 0) + 1
+    status_counts = Counter()
+    for day, status, n in paper_rows:
+        status_counts[status] += n
+        if day is not None:
+            paper_weekday_map[int(day)] = paper_weekday_map.get(int(day), 0) + n
 
     return {
-        "total_reviews": total_reviews,
-        "total_papers": total_papers,
+        "total_reviews": sum(n for _, n in review_rows),
+        "total_papers": sum(status_counts.values()),
         "weekday_map": weekday_map,
         "paper_weekday_map": paper_weekday_map,
-        "ai_done": ai_done,
-        "ai_pending": ai_pending,
+        "ai_done": status_counts["done"],
+        "ai_pending": status_counts["pending"],
     }
 
 
@@ -1108,6 +1392,7 @@ def get_stats_data():
 # STATS
 # ---------------------------------------------------
 @main.route("/stats")
+@read_replica
 def stats():
     context = get_stats_data()
     return render_template("stats.html", **context)
@@ -1123,31 +1408,35 @@ def toggle_interest(paper_id):
         flash("Only company users can mark interest.", "error")
         return redirect(url_for("main.login"))
 
-    user = User.query.get(session["user_id"])
-
-    company = Company.query.filter_by(name=user.name).first()
-    if not company:
-        flash(
-            "Your account is not linked to a company (no Company with this name found).",
-            "error",
-        )
+    identity = get_current_identity()
+    if not identity or not identity.company_id:
+        flash("Your account is not linked to a company.", "error")
         return redirect(url_for("main.dashboard"))
 
     paper = Paper.query.get_or_404(paper_id)
 
     interest_link = PaperCompany.query.filter_by(
         paper_id=paper.paper_id,
-        company_id=company.company_id,
+        company_id=identity.company_id,
         relation_type="interest",
     ).first()
 
+    # Toggle loggen voor de trending-job (interest_momentum)
+    db.session.add(
+        InterestEvent(
+            paper_id=paper.paper_id,
+            company_id=identity.company_id,
+            delta=-1 if interest_link else 1,
+        )
+    )
+
     if interest_link:
         db.session.delete(interest_link)
         flash("Paper removed from your company's interest list.", "success")
     else:
         new_interest = PaperCompany(
             paper_id=paper.paper_id,
-            company_id=company.company_id,
+            company_id=identity.company_id,
             relation_type="interest",
         )
         db.session.add(new_interest)
@@ -1172,14 +1461,8 @@ def delete_account():
         flash("Admin accounts cannot be deleted via the UI.", "error")
         return redirect(url_for("main.profile"))
 
-    if user.role == "Company":
-        company = Company.query.filter_by(name=user.name).first()
-        if company:
-            PaperCompany.query.filter_by(company_id=company.company_id).delete()
-            db.session.delete(company)
-
-    db.session.delete(user)
-    db.session.commit()
+    # Papers, reviews, koppelingen: ON DELETE CASCADE; PDF's in één storage-call
+    delete_user(user)
 
     session.clear()
     flash("Your account has been deleted.", "success")
@@ -1199,17 +1482,11 @@ def analyze_paper(paper_id):
     print(f"🔍 Re-analyzing Supabase file: {paper.file_path}")
 
     try:
-        supabase = get_supabase()
-        
         # Download bytes van Supabase
-        res = supabase.storage.from_(BUCKET_NAME).download(paper.file_path)
-        
-        # Zet bytes om naar stream
-        pdf_stream = io.BytesIO(res)
+        res = get_bucket().download(paper.file_path)
         
         # Lees PDF
-        reader = PdfReader(pdf_stream)
-        full_text = "\n".join(page.extract_text() or "" for page in reader.pages)
+        full_text = extract_pdf_text(res)
         
     except Exception as e:
         flash("PDF extraction from Supabase failed.", "error")
@@ -1217,19 +1494,13 @@ def analyze_paper(paper_id):
         return redirect(url_for("main.paper_detail", paper_id=paper_id))
 
     analysis = analyze_paper_text(full_text)
+    apply_analysis_result(paper, analysis)
+    db.session.commit()
+    invalidate_facets()
 
     if analysis:
-        paper.ai_business_score = analysis.get("business_score")
-        paper.ai_academic_score = analysis.get("academic_score")
-        paper.ai_summary = analysis.get("summary")
-        paper.ai_strengths = analysis.get("strengths")
-        paper.ai_weaknesses = analysis.get("weaknesses")
-        paper.ai_status = "done"
-        db.session.commit()
         flash("AI analysis completed.", "success")
     else:
-        paper.ai_status = "failed"
-        db.session.commit()
         flash("AI analysis failed.", "error")
 
     return redirect(url_for("main.paper_detail", paper_id=paper_id))
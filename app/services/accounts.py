@@ -0,0 +1,49 @@
+# app/services/accounts.py
+"""
+Accounts verwijderen.
+
+De papers, reviews, koppelingen, klachten, statistieken, ... van een user
+verdwijnen via de ON DELETE CASCADE foreign keys in de database (de
+relaties staan op passive_deletes), dus zonder ze eerst in het geheugen te
+laden. De PDF's van zijn papers worden vooraf verzameld (één smalle query)
+en na de commit in één batch uit storage verwijderd.
+"""
+from sqlalchemy import select
+
+from app.models import db, Paper
+from app.services.facets import invalidate_facets
+from app.services.identity import invalidate_identity
+from app.services.storage import get_bucket, remove_files
+
+
+def delete_user(user, bucket=None):
+    """
+    Verwijder `user` (en bij een Company-account ook de company) met alles
+    wat eraan hangt. Geeft het aantal verwijderde PDF's terug.
+    """
+    user_id = user.user_id
+    file_paths = (
+        db.session.execute(
+            select(Paper.file_path).where(
+                Paper.user_id == user_id, Paper.file_path.isnot(None)
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+    if user.role == "Company" and user.company:
+        db.session.delete(user.company)
+    db.session.delete(user)
+    db.session.commit()
+    invalidate_identity(user_id)
+    if file_paths:
+        invalidate_facets()
+
+    # Pas na de commit: een mislukte remove laat enkel wezen achter, die
+    # `flask storage reconcile` later opruimt
+    try:
+        return remove_files(bucket or get_bucket(), file_paths) if file_paths else 0
+    except Exception as e:
+        print(f"⚠️ Could not remove {len(file_paths)} files of user {user_id}: {e}")
+        return 0
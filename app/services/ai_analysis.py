@@ -1,9 +1,19 @@
 # app/services/ai_analysis.py
 
+import io
 import json
 import re
 from flask import current_app
-import google.generativeai as genai
+
+
+def get_genai():
+    """
+    Lazy import van de Gemini SDK. google.generativeai trekt grpc en protobuf
+    mee; dat willen we niet in elke worker of bij elk `flask db` commando laden.
+    """
+    import google.generativeai as genai
+
+    return genai
 
 
 def clean_json_output(text: str) -> str:
@@ -21,6 +31,28 @@ def clean_json_output(text: str) -> str:
     return text.strip()
 
 
+def extract_pdf_text(pdf_bytes: bytes) -> str:
+    """Alle tekst uit een PDF (bytes), pagina per pagina."""
+    from pypdf import PdfReader
+
+    # io.BytesIO zodat PyPDF denkt dat het een bestand is
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def apply_analysis_result(paper, result):
+    """Schrijf een AI-resultaat (of None bij falen) naar de Paper-velden."""
+    if result:
+        paper.ai_business_score = result.get("business_score")
+        paper.ai_academic_score = result.get("academic_score")
+        paper.ai_summary = result.get("summary")
+        paper.ai_strengths = result.get("strengths")
+        paper.ai_weaknesses = result.get("weaknesses")
+        paper.ai_status = "done"
+    else:
+        paper.ai_status = "failed"
+
+
 def analyze_paper_text(full_text: str):
 
     api_key = current_app.config.get("GEMINI_API_KEY")
@@ -29,6 +61,7 @@ def analyze_paper_text(full_text: str):
         return None
 
     # Configure Gemini
+    genai = get_genai()
     genai.configure(api_key=api_key)
 
     # This is the CORRECT model for your installed SDK version
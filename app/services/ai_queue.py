@@ -0,0 +1,54 @@
+# app/services/ai_queue.py
+"""
+Wachtrij voor AI-analyses.
+
+Papers met ai_status == "pending" staan in de wachtrij. Bulk imports zetten
+papers op "pending" i.p.v. Gemini inline aan te roepen; `flask ai-queue`
+werkt de wachtrij daarna in kleine batches af.
+"""
+from app.models import db, Paper
+from app.services.ai_analysis import (
+    analyze_paper_text,
+    apply_analysis_result,
+    extract_pdf_text,
+)
+from app.services.storage import get_bucket
+
+
+def pending_count() -> int:
+    # COUNT op de partiële index ix_Paper_ai_pending (geen subquery met alle kolommen)
+    return db.session.execute(
+        db.select(db.func.count()).select_from(Paper).where(Paper.ai_status == "pending")
+    ).scalar_one()
+
+
+def process_pending_analyses(limit: int = 20):
+    """Analyseer max `limit` papers uit de wachtrij. Geeft (done, failed) terug."""
+    papers = (
+        Paper.query.filter(Paper.ai_status == "pending")
+        .order_by(Paper.paper_id.asc())
+        .limit(limit)
+        .all()
+    )
+
+    done = failed = 0
+    bucket = get_bucket() if papers else None
+
+    for paper in papers:
+        try:
+            full_text = extract_pdf_text(bucket.download(paper.file_path))
+            analysis = analyze_paper_text(full_text)
+        except Exception as e:
+            print(f"❌ AI queue: paper {paper.paper_id} failed: {e}")
+            analysis = None
+
+        apply_analysis_result(paper, analysis)
+        # Per paper committen: een crash halverwege verliest geen resultaten
+        db.session.commit()
+
+        if analysis:
+            done += 1
+        else:
+            failed += 1
+
+    return done, failed
@@ -0,0 +1,477 @@
+# app/services/bulk_import.py
+"""
+Bulk import van papers (+ PDF's) en historische reviews vanuit een manifest.
+
+Pipeline:
+  1. manifest inlezen (CSV of JSONL) en per rij valideren
+  2. PDF's parallel hashen + tekst extraheren (process pool)
+  3. PDF's parallel uploaden via de gedeelde Supabase client (thread pool)
+  4. metadata in batches wegschrijven: COPY op Postgres, executemany elders
+  5. AI-analyse niet inline: papers blijven "pending" voor `flask ai-queue`
+
+Herstartbaar: de storage key is afgeleid van de inhoud van de PDF, dus rijen
+die al in de database staan worden bij een tweede run overgeslagen.
+"""
+import csv
+import hashlib
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+
+from sqlalchemy import insert, tuple_
+from werkzeug.utils import secure_filename
+
+from app.models import db, User, Company, Paper, Review, PaperCompany, make_abstract_snippet
+from app.services.storage import get_bucket, upload_pdf
+from app.services.facets import invalidate_facets
+from app.services.company_search import invalidate_company_search
+from app.services.reviewer_suggestions import refresh_profiles
+
+DEFAULT_BATCH_SIZE = 500
+ABSTRACT_FALLBACK_CHARS = 1500
+
+PAPER_COLUMNS = [
+    "user_id",
+    "title",
+    "abstract",
+    "abstract_snippet",
+    "research_domain",
+    "upload_date",
+    "file_path",
+    "ai_status",
+]
+REVIEW_COLUMNS = [
+    "paper_id",
+    "reviewer_id",
+    "company_id",
+    "score",
+    "comments",
+    "date_submitted",
+]
+
+
+class ImportReport:
+    """Houdt per manifest-rij bij wat er gebeurd is."""
+
+    def __init__(self):
+        self.imported = 0
+        self.skipped = 0
+        self.errors = []  # (manifest, line, message)
+
+    def error(self, manifest, line, message):
+        self.errors.append((manifest, line, message))
+
+    def write_errors(self, path):
+        with open(path, "w", newline="", encoding="utf-8") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(["manifest", "line", "error"])
+            writer.writerows(self.errors)
+
+    def summary(self):
+        return (
+            f"{self.imported} imported, {self.skipped} already present, "
+            f"{len(self.errors)} errors"
+        )
+
+
+# ---------------------------------------------------
+# MANIFEST
+# ---------------------------------------------------
+def read_manifest(path, report):
+    """
+    Yield (regelnummer, dict) voor een .csv of .jsonl manifest. Ongeldige
+    JSONL-regels komen in het rapport en worden overgeslagen.
+    """
+    if path.endswith(".jsonl") or path.endswith(".ndjson"):
+        with open(path, encoding="utf-8") as fh:
+            for line_no, line in enumerate(fh, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    report.error(path, line_no, f"Invalid JSON: {e}")
+                    continue
+                if not isinstance(record, dict):
+                    report.error(path, line_no, "Each line must be a JSON object")
+                    continue
+                yield line_no, record
+    else:
+        with open(path, newline="", encoding="utf-8") as fh:
+            # regel 1 is de header
+            for line_no, row in enumerate(csv.DictReader(fh), start=2):
+                yield line_no, row
+
+
+def _clean(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _parse_datetime(value):
+    value = _clean(value)
+    return datetime.fromisoformat(value) if value else None
+
+
+def _too_long(column, value):
+    """Foutmelding als `value` niet in een String(n)-kolom past, anders None."""
+    limit = column.type.length
+    if value is not None and limit is not None and len(value) > limit:
+        return f"{column.name} is longer than {limit} characters"
+    return None
+
+
+# ---------------------------------------------------
+# PDF WORKERS
+# ---------------------------------------------------
+def inspect_pdf(path):
+    """
+    Draait in een aparte process: hash + eerste stuk tekst van een PDF.
+    Geeft (sha256, tekst, foutmelding) terug.
+    """
+    try:
+        with open(path, "rb") as fh:
+            content = fh.read()
+        from app.services.ai_analysis import extract_pdf_text
+
+        text = extract_pdf_text(content)
+        return hashlib.sha256(content).hexdigest(), text[:ABSTRACT_FALLBACK_CHARS], None
+    except Exception as e:
+        return None, None, str(e)
+
+
+def storage_key(sha256, filename):
+    """Deterministische key: dezelfde PDF komt altijd op dezelfde plek."""
+    return f"import_{sha256[:16]}_{secure_filename(filename)}"
+
+
+def _upload_one(bucket, path, key):
+    with open(path, "rb") as fh:
+        # upsert: een vorige run kan de upload al gedaan hebben zonder DB-commit
+        upload_pdf(bucket, key, fh.read(), upsert=True)
+
+
+# ---------------------------------------------------
+# BULK INSERT
+# ---------------------------------------------------
+def bulk_insert(model, columns, rows):
+    """COPY op Postgres, anders één executemany."""
+    if not rows:
+        return
+    connection = db.session.connection()
+    if connection.dialect.name == "postgresql":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(
+                [v.isoformat() if isinstance(v, datetime) else v for v in
+                 (row[c] for c in columns)]
+            )
+        buffer.seek(0)
+        column_sql = ", ".join(f'"{c}"' for c in columns)
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f'COPY "{model.__tablename__}" ({column_sql}) FROM STDIN WITH (FORMAT csv)',
+                buffer,
+            )
+        finally:
+            cursor.close()
+    else:
+        db.session.execute(insert(model.__table__), rows)
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+# ---------------------------------------------------
+# PAPERS
+# ---------------------------------------------------
+def import_papers(manifest, pdf_dir, report, workers=4, batch_size=DEFAULT_BATCH_SIZE):
+    """Importeer papers; geeft {pdf-bestandsnaam: paper_id} terug (voor reviews)."""
+    rows = []
+    for line_no, raw in read_manifest(manifest, report):
+        title = _clean(raw.get("title"))
+        file_name = _clean(raw.get("file"))
+        author_email = _clean(raw.get("author_email"))
+        if not title or not file_name or not author_email:
+            report.error(manifest, line_no, "title, file and author_email are required")
+            continue
+        pdf_path = os.path.join(pdf_dir, file_name)
+        if not os.path.isfile(pdf_path):
+            report.error(manifest, line_no, f"PDF not found: {pdf_path}")
+            continue
+        try:
+            upload_date = _parse_datetime(raw.get("upload_date"))
+        except ValueError:
+            report.error(manifest, line_no, "upload_date must be ISO formatted")
+            continue
+        research_domain = _clean(raw.get("research_domain")) or "General"
+        facility = _clean(raw.get("facility"))
+        too_long = (
+            _too_long(Paper.title, title)
+            or _too_long(Paper.research_domain, research_domain)
+            or _too_long(Company.name, facility)
+        )
+        if too_long:
+            report.error(manifest, line_no, too_long)
+            continue
+        rows.append({
+            "line": line_no,
+            "file": file_name,
+            "path": pdf_path,
+            "title": title,
+            "abstract": _clean(raw.get("abstract")),
+            "research_domain": research_domain,
+            "author_email": author_email,
+            "facility": facility,
+            "upload_date": upload_date,
+        })
+
+    # Auteurs in één query opzoeken
+    emails = {r["author_email"] for r in rows}
+    users = dict(
+        db.session.query(User.email, User.user_id).filter(User.email.in_(emails)).all()
+    ) if emails else {}
+
+    # 1) Parallel hashen + tekst extraheren
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        inspected = list(pool.map(inspect_pdf, [r["path"] for r in rows], chunksize=8))
+
+    valid = []
+    for row, (sha, text, err) in zip(rows, inspected):
+        if err:
+            report.error(manifest, row["line"], f"Unreadable PDF: {err}")
+            continue
+        if row["author_email"] not in users:
+            report.error(manifest, row["line"], f"Unknown author: {row['author_email']}")
+            continue
+        row["key"] = storage_key(sha, row["file"])
+        too_long = _too_long(Paper.file_path, row["key"])
+        if too_long:
+            report.error(manifest, row["line"], f"File name too long: {too_long}")
+            continue
+        row["user_id"] = users[row["author_email"]]
+        if not row["abstract"]:
+            row["abstract"] = (text or "").strip() or None
+        valid.append(row)
+
+    # 2) Herstartbaar: al geïmporteerde PDF's overslaan
+    file_to_id = {}
+    keys = [r["key"] for r in valid]
+    for chunk in _chunks(keys, batch_size):
+        existing = db.session.query(Paper.file_path, Paper.paper_id).filter(
+            Paper.file_path.in_(chunk)
+        )
+        for path, paper_id in existing:
+            file_to_id[path] = paper_id
+
+    todo = []
+    key_to_file = {}
+    for row in valid:
+        # dezelfde PDF twee keer in het manifest telt ook als "al aanwezig"
+        if row["key"] in file_to_id or row["key"] in key_to_file:
+            report.skipped += 1
+        else:
+            todo.append(row)
+        key_to_file.setdefault(row["key"], row["file"])
+
+    # 3) Parallel uploaden over één gedeelde client
+    bucket = get_bucket() if todo else None
+    uploaded = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [(row, pool.submit(_upload_one, bucket, row["path"], row["key"])) for row in todo]
+        for row, future in futures:
+            try:
+                future.result()
+                uploaded.append(row)
+            except Exception as e:
+                report.error(manifest, row["line"], f"Upload failed: {e}")
+
+    # 4) Metadata per batch wegschrijven en committen. Een mislukte batch
+    #    (COPY-fout, constraint) wordt rij per rij opnieuw geprobeerd, zodat
+    #    enkel de foute rijen in het rapport komen.
+    now = datetime.now()
+    for batch in _chunks(uploaded, batch_size):
+        try:
+            file_to_id.update(_insert_paper_batch(batch, now))
+        except Exception:
+            db.session.rollback()
+        else:
+            report.imported += len(batch)
+            continue
+        for row in batch:
+            try:
+                file_to_id.update(_insert_paper_batch([row], now))
+            except Exception as e:
+                db.session.rollback()
+                report.error(manifest, row["line"], f"Insert failed: {_first_line(e)}")
+            else:
+                report.imported += 1
+
+    if uploaded:
+        invalidate_facets()
+        invalidate_company_search()
+    return {key_to_file[k]: pid for k, pid in file_to_id.items() if k in key_to_file}
+
+
+def _insert_paper_batch(batch, now):
+    """Papers + facility-links van één batch in één transactie; {key: paper_id}."""
+    bulk_insert(
+        Paper,
+        PAPER_COLUMNS,
+        [
+            {
+                "user_id": r["user_id"],
+                "title": r["title"],
+                "abstract": r["abstract"],
+                "abstract_snippet": make_abstract_snippet(r["abstract"]),
+                "research_domain": r["research_domain"],
+                "upload_date": r["upload_date"] or now,
+                "file_path": r["key"],
+                # AI-analyse gaat via de wachtrij (flask ai-queue)
+                "ai_status": "pending",
+            }
+            for r in batch
+        ],
+    )
+    batch_ids = dict(
+        db.session.query(Paper.file_path, Paper.paper_id)
+        .filter(Paper.file_path.in_([r["key"] for r in batch]))
+        .all()
+    )
+    _link_facilities(batch, batch_ids)
+    db.session.commit()
+    return batch_ids
+
+
+def _first_line(error):
+    """Eerste regel van een (database)fout, zonder SQL en parameters."""
+    return (str(getattr(error, "orig", None) or error).splitlines() or [""])[0][:200]
+
+
+def _link_facilities(batch, file_to_id):
+    names = {r["facility"] for r in batch if r["facility"]}
+    if not names:
+        return
+    companies = dict(
+        db.session.query(Company.name, Company.company_id)
+        .filter(Company.name.in_(names))
+        .all()
+    )
+    for name in names - companies.keys():
+        company = Company(name=name)
+        db.session.add(company)
+        db.session.flush()
+        companies[name] = company.company_id
+
+    bulk_insert(
+        PaperCompany,
+        ["paper_id", "company_id", "relation_type"],
+        [
+            {
+                "paper_id": file_to_id[r["key"]],
+                "company_id": companies[r["facility"]],
+                "relation_type": "facility",
+            }
+            for r in batch
+            if r["facility"]
+        ],
+    )
+
+
+# ---------------------------------------------------
+# REVIEWS
+# ---------------------------------------------------
+def import_reviews(manifest, file_to_paper_id, report, batch_size=DEFAULT_BATCH_SIZE):
+    """Historische reviews; `paper_file` verwijst naar de PDF uit het papers-manifest."""
+    rows = []
+    for line_no, raw in read_manifest(manifest, report):
+        paper_file = _clean(raw.get("paper_file"))
+        reviewer_email = _clean(raw.get("reviewer_email"))
+        paper_id = file_to_paper_id.get(paper_file)
+        if paper_id is None:
+            report.error(manifest, line_no, f"Unknown paper_file: {paper_file}")
+            continue
+        if not reviewer_email:
+            report.error(manifest, line_no, "reviewer_email is required")
+            continue
+        try:
+            score = float(raw["score"]) if _clean(raw.get("score")) else None
+            date_submitted = _parse_datetime(raw.get("date_submitted"))
+        except ValueError:
+            report.error(manifest, line_no, "Invalid score or date_submitted")
+            continue
+        if score is not None and not 0 <= score <= 10:
+            report.error(manifest, line_no, "Score must be between 0 and 10")
+            continue
+        rows.append({
+            "line": line_no,
+            "paper_id": paper_id,
+            "reviewer_email": reviewer_email,
+            "company": _clean(raw.get("company")),
+            "score": score,
+            "comments": _clean(raw.get("comments")),
+            "date_submitted": date_submitted,
+        })
+
+    emails = {r["reviewer_email"] for r in rows}
+    reviewers = dict(
+        db.session.query(User.email, User.user_id).filter(User.email.in_(emails)).all()
+    ) if emails else {}
+    company_names = {r["company"] for r in rows if r["company"]}
+    companies = dict(
+        db.session.query(Company.name, Company.company_id)
+        .filter(Company.name.in_(company_names))
+        .all()
+    ) if company_names else {}
+
+    now = datetime.now()
+    valid = []
+    seen = set()
+    for row in rows:
+        reviewer_id = reviewers.get(row["reviewer_email"])
+        if reviewer_id is None:
+            report.error(manifest, row["line"], f"Unknown reviewer: {row['reviewer_email']}")
+            continue
+        # Max. één historische review per paper, ook binnen het manifest
+        if (row["paper_id"], reviewer_id) in seen:
+            report.skipped += 1
+            continue
+        seen.add((row["paper_id"], reviewer_id))
+        valid.append({
+            "paper_id": row["paper_id"],
+            "reviewer_id": reviewer_id,
+            "company_id": companies.get(row["company"]),
+            "score": row["score"],
+            "comments": row["comments"],
+            "date_submitted": row["date_submitted"] or now,
+        })
+
+    affected = set()
+    for batch in _chunks(valid, batch_size):
+        # Herstartbaar: een reviewer heeft max. één historische review per paper
+        existing = set(
+            db.session.query(Review.paper_id, Review.reviewer_id).filter(
+                tuple_(Review.paper_id, Review.reviewer_id).in_(
+                    [(r["paper_id"], r["reviewer_id"]) for r in batch]
+                )
+            )
+        )
+        new_rows = [r for r in batch if (r["paper_id"], r["reviewer_id"]) not in existing]
+        report.skipped += len(batch) - len(new_rows)
+        bulk_insert(Review, REVIEW_COLUMNS, new_rows)
+        db.session.commit()
+        report.imported += len(new_rows)
+        affected.update(r["reviewer_id"] for r in new_rows)
+
+    # Historische date_submitted valt vóór refreshed_at: stale_reviewer_ids ziet
+    # deze reviews niet als nieuw, dus de profielen hier expliciet bijwerken
+    if affected:
+        refresh_profiles(user_ids=sorted(affected))
@@ -0,0 +1,68 @@
+# app/services/company_search.py
+"""
+Type-ahead voor companies (research facilities) in de paper-formulieren.
+
+search_companies() zoekt op het begin van de naam, hoofdletterongevoelig:
+`lower(name) LIKE 'prefix%'`, wat op Postgres de index
+ix_Company_name_lower_prefix (text_pattern_ops) gebruikt. Het resultaat is
+begrensd, dus de kost groeit niet mee met de company-tabel.
+
+Korte prefixen (de eerste toetsaanslagen: elke gebruiker passeert er) zijn
+de populairste en matchen het meest; die worden per process gecached.
+Nieuwe companies: invalidate_company_search().
+"""
+import threading
+
+from cachetools import TTLCache
+from sqlalchemy import func
+
+from app.models import db, Company
+
+COMPANY_SEARCH_TTL_SECONDS = 60
+COMPANY_SEARCH_LIMIT = 10
+COMPANY_SEARCH_MAX_LIMIT = 25
+# Prefixen tot zoveel tekens gaan in de cache
+CACHED_PREFIX_LENGTH = 3
+
+_cache = TTLCache(maxsize=2048, ttl=COMPANY_SEARCH_TTL_SECONDS)
+_cache_lock = threading.Lock()
+
+
+def _like_prefix(prefix):
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
+
+
+def query_companies(prefix, limit=COMPANY_SEARCH_LIMIT):
+    """[{company_id, name}] waarvan de naam met prefix begint, alfabetisch."""
+    lowered = func.lower(Company.name)
+    rows = db.session.execute(
+        db.select(Company.company_id, Company.name)
+        .where(lowered.like(_like_prefix(prefix), escape="\\"))
+        .order_by(lowered, Company.company_id)
+        .limit(limit)
+    )
+    return [{"company_id": row.company_id, "name": row.name} for row in rows]
+
+
+def search_companies(prefix, limit=COMPANY_SEARCH_LIMIT):
+    prefix = (prefix or "").strip().lower()
+    limit = max(1, min(limit, COMPANY_SEARCH_MAX_LIMIT))
+    if not prefix:
+        return []
+    if len(prefix) > CACHED_PREFIX_LENGTH:
+        return query_companies(prefix, limit)
+
+    key = (prefix, limit)
+    with _cache_lock:
+        result = _cache.get(key)
+    if result is None:
+        result = query_companies(prefix, limit)
+        with _cache_lock:
+            _cache[key] = result
+    return result
+
+
+def invalidate_company_search():
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,200 @@
+# app/services/counters.py
+"""
+Write-behind tellers voor paper views en downloads.
+
+Requests verhogen enkel een teller in het geheugen van het process; een
+achtergrondthread schrijft de opgespaarde tellingen weg naar PaperStatDaily
+(één rij per paper per dag) wanneer COUNTER_FLUSH_SECONDS verstreken is of
+er COUNTER_FLUSH_MAX_KEYS verschillende (paper, dag) sleutels in de buffer
+zitten. Een flush is één INSERT ... ON CONFLICT DO UPDATE die de waarden
+optelt, zodat gunicorn workers elkaar niet overschrijven.
+
+At-least-once: mislukt een flush, dan gaan de tellingen terug in de buffer
+en worden ze bij de volgende flush opnieuw geprobeerd. Tellingen van papers
+die intussen verwijderd zijn worden weggelaten (anders faalt elke volgende
+flush op de foreign key en groeit de buffer onbeperkt). Bij het afsluiten van
+een worker (atexit + gunicorn worker_exit) wordt nog één keer geflusht.
+"""
+import atexit
+import threading
+from collections import defaultdict
+from datetime import date
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from app.models import db, Paper, PaperStatDaily
+
+VIEW = 0
+DOWNLOAD = 1
+
+
+class CounterBuffer:
+    def __init__(self):
+        self.app = None
+        self.flush_seconds = 10.0
+        self.max_keys = 500
+        self._counts = defaultdict(lambda: [0, 0])
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def init_app(self, app):
+        self.app = app
+        self.flush_seconds = app.config["COUNTER_FLUSH_SECONDS"]
+        self.max_keys = app.config["COUNTER_FLUSH_MAX_KEYS"]
+
+    # ---------------------------------------------------
+    # RECORDING (REQUEST THREAD)
+    # ---------------------------------------------------
+    def record(self, paper_id, kind):
+        with self._lock:
+            self._counts[(paper_id, date.today())][kind] += 1
+            full = len(self._counts) >= self.max_keys
+        self._ensure_thread()
+        if full:
+            self._wake.set()
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="counter-flush", daemon=True
+            )
+            self._thread.start()
+
+    # ---------------------------------------------------
+    # FLUSHING (BACKGROUND THREAD / SHUTDOWN)
+    # ---------------------------------------------------
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            self.flush()
+
+    def _take(self):
+        with self._lock:
+            counts, self._counts = self._counts, defaultdict(lambda: [0, 0])
+        return counts
+
+    def _restore(self, counts):
+        with self._lock:
+            for key, (views, downloads) in counts.items():
+                current = self._counts[key]
+                current[VIEW] += views
+                current[DOWNLOAD] += downloads
+
+    def flush(self):
+        """Schrijf de buffer weg. Geeft het aantal geschreven rijen terug."""
+        counts = self._take()
+        if not counts or self.app is None:
+            return 0
+        try:
+            with self.app.app_context():
+                return upsert_daily_counts(counts)
+        except IntegrityError as e:
+            # Terugzetten heeft geen zin: dezelfde rijen zouden opnieuw falen
+            print(f"❌ Counter flush dropped {len(counts)} rows: {e}")
+            return 0
+        except Exception as e:
+            # Niets verliezen: volgende flush probeert opnieuw
+            self._restore(counts)
+            print(f"❌ Counter flush failed ({len(counts)} rows kept): {e}")
+            return 0
+
+    def pending(self):
+        with self._lock:
+            return len(self._counts)
+
+    def shutdown(self):
+        self._stop.set()
+        self._wake.set()
+        self.flush()
+
+    def reset_after_fork(self):
+        """Het child start met een lege buffer en zonder (dode) flush-thread."""
+        self._counts = defaultdict(lambda: [0, 0])
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+
+def upsert_daily_counts(counts):
+    """
+    counts: {(paper_id, day): [views, downloads]} -> optellen in PaperStatDaily.
+    Geeft het aantal geschreven rijen terug (zonder die van verwijderde papers).
+    """
+    try:
+        # FOR SHARE (Postgres): een paper kan niet verdwijnen tussen deze check en de insert
+        existing = set(
+            db.session.execute(
+                db.select(Paper.paper_id)
+                .where(Paper.paper_id.in_({paper_id for paper_id, _ in counts}))
+                .with_for_update(read=True)
+            ).scalars()
+        )
+        rows = [
+            {"paper_id": paper_id, "day": day, "views": views, "downloads": downloads}
+            for (paper_id, day), (views, downloads) in counts.items()
+            if paper_id in existing
+        ]
+        if rows:
+            _upsert_rows(rows)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return len(rows)
+
+
+def _upsert_rows(rows):
+    dialect = db.session.get_bind().dialect.name
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+
+    stmt = insert(PaperStatDaily.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["paper_id", "day"],
+        set_={
+            "views": PaperStatDaily.__table__.c.views + stmt.excluded.views,
+            "downloads": PaperStatDaily.__table__.c.downloads + stmt.excluded.downloads,
+        },
+    )
+    # Gesorteerd: workers die tegelijk flushen locken rijen in dezelfde volgorde
+    rows.sort(key=lambda row: (row["paper_id"], row["day"]))
+    db.session.execute(stmt, rows)
+
+
+buffer = CounterBuffer()
+
+
+def init_counters(app):
+    buffer.init_app(app)
+    atexit.register(buffer.shutdown)
+
+
+def record_view(paper_id):
+    if buffer.app is not None and buffer.app.config["COUNTERS_ENABLED"]:
+        buffer.record(paper_id, VIEW)
+
+
+def record_download(paper_id):
+    if buffer.app is not None and buffer.app.config["COUNTERS_ENABLED"]:
+        buffer.record(paper_id, DOWNLOAD)
+
+
+def flush_counters():
+    return buffer.flush()
+
+
+def shutdown_counters():
+    buffer.shutdown()
+
+
+def reset_counters_after_fork():
+    buffer.reset_after_fork()
@@ -0,0 +1,240 @@
+# app/services/digest.py
+"""
+Interest-digest voor companies: nieuwe papers in hun interesse-domeinen
+sinds hun vorige digest, als één mail per company.
+
+Per batch van DIGEST_BATCH_SIZE companies (keyset op company_id):
+- set-based joins Company x nieuwe Papers in zijn interesse-domeinen
+  (CompanyInterest, upload_date tussen Company.last_digest_at en het begin
+  van de run): één COUNT per company en één query die enkel de top
+  DIGEST_MAX_PAPERS per company ophaalt (ix_Paper_domain_upload_date);
+- één query voor de ontvangers (users met rol Company);
+- renderen met de Jinja templates email/interest_digest.* (het blok per
+  paper maar één keer per run);
+- versturen als één batch over de gedeelde mailer-verbinding;
+- één UPDATE die last_digest_at voor de hele batch verzet.
+
+Mislukt het versturen, dan wordt de batch niet als verstuurd gemarkeerd en
+komt hij bij de volgende run opnieuw (at-least-once).
+"""
+from collections import defaultdict, namedtuple
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+
+from flask import current_app
+from markupsafe import Markup
+from sqlalchemy import and_, exists, func, select, update
+from sqlalchemy.orm import aliased
+
+from app.models import db, Company, CompanyInterest, Paper, PaperCompany, User
+from app.services.mailer import MailMessage, get_mailer
+
+DigestReport = namedtuple("DigestReport", ["companies", "messages", "papers"])
+
+
+def company_batches(batch_size):
+    """Companies met minstens één interest, per batch (keyset op company_id)."""
+    after = 0
+    while True:
+        batch = (
+            db.session.query(Company.company_id, Company.name, Company.interests)
+            .filter(Company.company_id > after, Company.interest_rows.any())
+            .order_by(Company.company_id)
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            return
+        yield batch
+        after = batch[-1].company_id
+
+
+def _new_papers(paper, since, now):
+    """Nieuw sinds de vorige digest, in een interesse-domein, nog niet gekoppeld."""
+    interests = (
+        select(CompanyInterest.research_domain)
+        .where(CompanyInterest.company_id == Company.company_id)
+        .correlate_except(CompanyInterest)
+    )
+    already_linked = exists().where(
+        PaperCompany.paper_id == paper.paper_id,
+        PaperCompany.company_id == Company.company_id,
+    )
+    return (
+        paper.research_domain.in_(interests),
+        paper.upload_date > since,
+        paper.upload_date <= now,
+        ~already_linked.correlate_except(PaperCompany),
+    )
+
+
+def match_query(company_ids, now, first_since, max_papers):
+    """
+    (company_id, paper_id) voor de max_papers nieuwste nieuwe papers per
+    company, nieuwste eerst.
+
+    De top-N is een gecorreleerde subquery met LIMIT (range scans op
+    ix_Paper_domain_upload_date), zodat niet alle matches van een company
+    opgehaald en gesorteerd moeten worden.
+    """
+    since = func.coalesce(Company.last_digest_at, first_since)
+    candidate = aliased(Paper)
+    top = (
+        select(candidate.paper_id)
+        .where(*_new_papers(candidate, since, now))
+        .order_by(candidate.upload_date.desc(), candidate.paper_id.desc())
+        .limit(max_papers)
+        .correlate_except(candidate)
+    )
+    # Smal: titels/snippets komen per paper maar één keer op (DigestRenderer)
+    return (
+        select(Company.company_id, Paper.paper_id)
+        .join(Paper, Paper.paper_id.in_(top.scalar_subquery()))
+        .where(Company.company_id.in_(company_ids))
+        .order_by(Company.company_id, Paper.upload_date.desc(), Paper.paper_id.desc())
+    )
+
+
+def total_query(company_ids, now, first_since):
+    """Aantal nieuwe papers per company (voor "...and N more")."""
+    since = func.coalesce(Company.last_digest_at, first_since)
+    return (
+        select(Company.company_id, func.count(Paper.paper_id))
+        .join(Paper, and_(*_new_papers(Paper, since, now)))
+        .where(Company.company_id.in_(company_ids))
+        .group_by(Company.company_id)
+    )
+
+
+def recipients_by_company(company_ids):
+    rows = db.session.query(User.company_id, User.email).filter(
+        User.company_id.in_(company_ids), User.role == "Company"
+    )
+    recipients = defaultdict(list)
+    for company_id, email in rows:
+        recipients[company_id].append(email)
+    return recipients
+
+
+class DigestRenderer:
+    """
+    Rendert digests met de Jinja templates van de app.
+
+    Het blok per paper is voor elke company hetzelfde en wordt dus maar één
+    keer per run gerenderd (fragments); de mail zelf voegt ze enkel samen.
+    """
+
+    def __init__(self, env, base_url):
+        self.base_url = base_url
+        self.text = env.get_template("email/interest_digest.txt")
+        self.html = env.get_template("email/interest_digest.html")
+        self.paper_text = env.get_template("email/_digest_paper.txt")
+        self.paper_html = env.get_template("email/_digest_paper.html")
+        self.fragments = {}
+
+    def load(self, paper_ids):
+        """Render de fragments van papers die nog niet gerenderd zijn (één query)."""
+        missing = [paper_id for paper_id in paper_ids if paper_id not in self.fragments]
+        if not missing:
+            return
+        rows = db.session.execute(
+            select(
+                Paper.paper_id,
+                Paper.title,
+                Paper.research_domain,
+                Paper.abstract_snippet,
+            ).where(Paper.paper_id.in_(missing))
+        )
+        for paper in rows:
+            context = {"paper": paper, "base_url": self.base_url}
+            self.fragments[paper.paper_id] = (
+                self.paper_text.render(context),
+                Markup(self.paper_html.render(context)),
+            )
+
+    def render(self, company, paper_ids, total, recipients):
+        fragments = [self.fragments[paper_id] for paper_id in paper_ids]
+        context = {
+            "company": company,
+            "count": len(paper_ids),
+            "total": total,
+            "base_url": self.base_url,
+        }
+        subject = f"{total} new paper{'s' if total != 1 else ''} matching your interests"
+        return MailMessage(
+            to=recipients,
+            subject=subject,
+            text=self.text.render(context, items=[text for text, _ in fragments]),
+            html=self.html.render(context, items=[html for _, html in fragments]),
+        )
+
+
+def build_messages(batch, now, first_since, max_papers, renderer):
+    """Alle digest-mails voor één batch companies (zonder ontvangers: geen mail)."""
+    company_ids = [company.company_id for company in batch]
+    totals = dict(db.session.execute(total_query(company_ids, now, first_since)).all())
+    if not totals:
+        return [], 0
+
+    matches = defaultdict(list)
+    for company_id, paper_id in db.session.execute(
+        match_query(company_ids, now, first_since, max_papers)
+    ):
+        matches[company_id].append(paper_id)
+
+    recipients = recipients_by_company(list(totals))
+    selected = {
+        company.company_id: matches[company.company_id]
+        for company in batch
+        if company.company_id in totals and recipients.get(company.company_id)
+    }
+    renderer.load({paper_id for ids in selected.values() for paper_id in ids})
+
+    messages = [
+        renderer.render(
+            company,
+            selected[company.company_id],
+            totals[company.company_id],
+            recipients[company.company_id],
+        )
+        for company in batch
+        if company.company_id in selected
+    ]
+    return messages, sum(len(ids) for ids in selected.values())
+
+
+def mark_sent(company_ids, now):
+    db.session.execute(
+        update(Company)
+        .where(Company.company_id.in_(company_ids))
+        .values(last_digest_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+
+def run_digest(now=None, mailer=None, dry_run=False, batch_size=None):
+    """Verstuur alle openstaande digests. Geeft een DigestReport terug."""
+    config = current_app.config
+    now = now or datetime.now()
+    first_since = now - timedelta(days=config["DIGEST_FIRST_WINDOW_DAYS"])
+    batch_size = batch_size or config["DIGEST_BATCH_SIZE"]
+    max_papers = config["DIGEST_MAX_PAPERS"]
+    renderer = DigestRenderer(current_app.jinja_env, config["APP_BASE_URL"].rstrip("/"))
+
+    companies = messages_sent = papers_sent = 0
+    if dry_run:
+        mailer = nullcontext()
+    elif mailer is None:
+        mailer = get_mailer()
+    with mailer:
+        for batch in company_batches(batch_size):
+            messages, papers = build_messages(batch, now, first_since, max_papers, renderer)
+            if not dry_run:
+                if messages:
+                    mailer.send_many(messages)
+                mark_sent([company.company_id for company in batch], now)
+            companies += len(batch)
+            messages_sent += len(messages)
+            papers_sent += papers
+    return DigestReport(companies, messages_sent, papers_sent)
@@ -0,0 +1,239 @@
+# app/services/export.py
+"""
+Streaming bulk export van Paper / Review / Complaint / PaperCompany.
+
+Rijen worden met yield_per (server-side cursor op Postgres) in batches
+opgehaald en meteen als CSV, NDJSON of Parquet weggeschreven, zodat het
+geheugengebruik constant blijft, ongeacht het aantal rijen.
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+
+from sqlalchemy import select, Integer, Float, DateTime
+
+from app.models import db, Paper, Review, Complaint, PaperCompany
+
+DEFAULT_BATCH_SIZE = 1000
+FORMATS = ("csv", "ndjson", "parquet")
+
+# dataset -> (model, datumkolom voor --since/--until)
+DATASETS = {
+    "papers": (Paper, Paper.upload_date),
+    "reviews": (Review, Review.date_submitted),
+    "complaints": (Complaint, Complaint.created_at),
+    # PaperCompany heeft geen eigen datum: filter op upload_date van de paper
+    "paper_companies": (PaperCompany, Paper.upload_date),
+}
+
+CONTENT_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class ExportUnavailable(RuntimeError):
+    """Het gevraagde formaat kan niet gemaakt worden (ontbrekende optionele dependency)."""
+
+
+def parse_date(value):
+    """'YYYY-MM-DD' (of volledige ISO timestamp) -> datetime, of None."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid date: {value!r} (expected YYYY-MM-DD)")
+
+
+def export_columns(dataset):
+    model, _ = DATASETS[dataset]
+    return list(model.__table__.columns)
+
+
+def iter_rows(dataset, since=None, until=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Yield tuples voor alle rijen van een dataset.
+
+    We selecteren kolommen i.p.v. ORM-objecten: niets komt in de identity map,
+    dus het geheugen groeit niet mee met de export.
+    """
+    model, date_col = DATASETS[dataset]
+    columns = export_columns(dataset)
+
+    stmt = select(*columns)
+    if date_col.class_ is not model:
+        stmt = stmt.join(Paper, Paper.paper_id == model.paper_id)
+    if since:
+        stmt = stmt.where(date_col >= since)
+    if until:
+        stmt = stmt.where(date_col < until)
+    stmt = stmt.order_by(*model.__table__.primary_key.columns)
+
+    result = db.session.execute(stmt.execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        yield from partition
+
+
+def _json_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _csv_chunks(names, rows, batch_size):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(names)
+    pending = 0
+    for row in rows:
+        writer.writerow(["" if v is None else _json_value(v) for v in row])
+        pending += 1
+        if pending >= batch_size:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue().encode("utf-8")
+
+
+def _ndjson_chunks(names, rows, batch_size):
+    lines = []
+    for row in rows:
+        record = {n: _json_value(v) for n, v in zip(names, row)}
+        lines.append(json.dumps(record))
+        if len(lines) >= batch_size:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """File-like object dat geschreven bytes bijhoudt tot ze opgehaald worden."""
+
+    def __init__(self):
+        self._chunks = []
+        self._pos = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._pos
+
+    def drain(self):
+        out = b"".join(self._chunks)
+        self._chunks = []
+        return out
+
+
+def _arrow_schema(pa, columns):
+    fields = []
+    for col in columns:
+        if isinstance(col.type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(col.type, Float):
+            arrow_type = pa.float64()
+        elif isinstance(col.type, DateTime):
+            arrow_type = pa.timestamp("us")
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(col.name, arrow_type))
+    return pa.schema(fields)
+
+
+def _pyarrow():
+    """
+    Lazy import van pyarrow. Wordt aangeroepen vóór het streamen begint: in de
+    generator zou een ontbrekende pyarrow pas na de 200-status opduiken.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ExportUnavailable("Parquet export requires pyarrow (pip install pyarrow).")
+    return pa, pq
+
+
+def _parquet_chunks(pa, pq, columns, rows, batch_size):
+    schema = _arrow_schema(pa, columns)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+
+    def flush(batch):
+        table = pa.Table.from_pylist(
+            [dict(zip(schema.names, row)) for row in batch], schema=schema
+        )
+        writer.write_table(table)
+
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+            yield sink.drain()
+    if batch:
+        flush(batch)
+    writer.close()
+    yield sink.drain()
+
+
+def gzip_chunks(chunks):
+    """Comprimeer een stroom bytes on-the-fly naar gzip."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_export(
+    dataset,
+    fmt="csv",
+    since=None,
+    until=None,
+    gzip=False,
+    batch_size=DEFAULT_BATCH_SIZE,
+):
+    """
+    Generator met bytes-chunks voor een volledige export. Fouten (onbekende
+    dataset of formaat, ExportUnavailable) komen bij de aanroep, niet tijdens
+    het streamen.
+    """
+    if dataset not in DATASETS:
+        raise ValueError(f"Unknown dataset: {dataset}")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt}")
+
+    pa, pq = _pyarrow() if fmt == "parquet" else (None, None)
+
+    columns = export_columns(dataset)
+    names = [c.name for c in columns]
+    rows = iter_rows(dataset, since=since, until=until, batch_size=batch_size)
+
+    if fmt == "csv":
+        chunks = _csv_chunks(names, rows, batch_size)
+    elif fmt == "ndjson":
+        chunks = _ndjson_chunks(names, rows, batch_size)
+    else:
+        chunks = _parquet_chunks(pa, pq, columns, rows, batch_size)
+
+    return gzip_chunks(chunks) if gzip else chunks
+
+
+def export_filename(dataset, fmt, gzip=False):
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    name = f"{dataset}_{stamp}.{fmt}"
+    return name + ".gz" if gzip else name
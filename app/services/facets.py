@@ -0,0 +1,155 @@
+# app/services/facets.py
+"""
+Facet-tellingen voor de dashboard filters.
+
+Eén gegroepeerde query telt papers per domein, facility, AI-status en
+score-band voor de huidige filterset: GROUPING SETS op Postgres, een
+UNION ALL van dezelfde groeperingen op SQLite. De facets van de volledige
+catalogus (geen filters) worden per process gecached.
+"""
+import threading
+
+from cachetools import TTLCache
+from sqlalchemy import case, func, literal, null, union_all, select
+from sqlalchemy.orm import aliased
+
+from app.models import db, Paper, PaperCompany, Company
+
+FACETS_TTL_SECONDS = 60
+
+FACET_KEYS = ("domains", "facilities", "ai_status", "score_bands")
+SCORE_BANDS = ["8-10", "6-8", "4-6", "2-4", "0-2", "unrated"]
+
+_cache = TTLCache(maxsize=1, ttl=FACETS_TTL_SECONDS)
+_cache_lock = threading.Lock()
+
+
+def score_band(avg_score):
+    """CASE-expressie: gemiddelde reviewscore -> band."""
+    return case(
+        (avg_score.is_(None), "unrated"),
+        (avg_score < 2, "0-2"),
+        (avg_score < 4, "2-4"),
+        (avg_score < 6, "4-6"),
+        (avg_score < 8, "6-8"),
+        else_="8-10",
+    )
+
+
+def _base_subquery(search, selected_domain, selected_company, min_score):
+    """Gefilterde papers met de kolommen waarop we groeperen."""
+    from app.routes import build_avg_score_subquery, apply_paper_filters
+
+    avg_subq = build_avg_score_subquery()
+    query = db.session.query(
+        Paper.paper_id.label("paper_id"),
+        Paper.research_domain.label("domain"),
+        func.coalesce(Paper.ai_status, "pending").label("ai_status"),
+        score_band(avg_subq.c.avg_score).label("band"),
+    ).outerjoin(avg_subq, Paper.paper_id == avg_subq.c.paper_id)
+    query = apply_paper_filters(
+        query, avg_subq, search, selected_domain, selected_company, min_score
+    )
+    base = query.subquery("base")
+
+    # Facility-naam los joinen (eigen aliassen: de company-filter joint al)
+    link = aliased(PaperCompany)
+    facility = aliased(Company)
+    return (
+        select(
+            base.c.paper_id,
+            base.c.domain,
+            base.c.ai_status,
+            base.c.band,
+            facility.name.label("facility"),
+        )
+        .select_from(base)
+        .outerjoin(
+            link,
+            (link.paper_id == base.c.paper_id) & (link.relation_type == "facility"),
+        )
+        .outerjoin(facility, facility.company_id == link.company_id)
+        .subquery("faceted")
+    )
+
+
+def _grouping_sets_query(rows):
+    columns = [rows.c.domain, rows.c.facility, rows.c.ai_status, rows.c.band]
+    return select(
+        *columns,
+        *[func.grouping(c).label(f"g_{c.name}") for c in columns],
+        func.count(rows.c.paper_id.distinct()).label("n"),
+    ).group_by(func.grouping_sets(*columns))
+
+
+def _union_query(rows):
+    """SQLite kent geen GROUPING SETS: zelfde resultaat via UNION ALL."""
+    selects = []
+    for key, column in [
+        ("domain", rows.c.domain),
+        ("facility", rows.c.facility),
+        ("ai_status", rows.c.ai_status),
+        ("band", rows.c.band),
+    ]:
+        cols = []
+        for other in ("domain", "facility", "ai_status", "band"):
+            cols.append(
+                column.label(other) if other == key else null().label(other)
+            )
+        for other in ("domain", "facility", "ai_status", "band"):
+            cols.append(literal(0 if other == key else 1).label(f"g_{other}"))
+        selects.append(
+            select(*cols, func.count(rows.c.paper_id.distinct()).label("n"))
+            .group_by(column)
+        )
+    return union_all(*selects)
+
+
+def compute_facets(search="", selected_domain="all", selected_company="", min_score=""):
+    rows = _base_subquery(search, selected_domain, selected_company, min_score)
+    if db.session.get_bind().dialect.name == "postgresql":
+        stmt = _grouping_sets_query(rows)
+    else:
+        stmt = _union_query(rows)
+
+    facets = {key: {} for key in FACET_KEYS}
+    for row in db.session.execute(stmt):
+        if row.g_domain == 0 and row.domain is not None:
+            facets["domains"][row.domain] = row.n
+        elif row.g_facility == 0 and row.facility is not None:
+            facets["facilities"][row.facility] = row.n
+        elif row.g_ai_status == 0:
+            facets["ai_status"][row.ai_status] = row.n
+        elif row.g_band == 0:
+            facets["score_bands"][row.band] = row.n
+
+    facets["domains"] = dict(sorted(facets["domains"].items()))
+    facets["facilities"] = dict(sorted(facets["facilities"].items()))
+    facets["score_bands"] = {
+        band: facets["score_bands"][band]
+        for band in SCORE_BANDS
+        if band in facets["score_bands"]
+    }
+    return facets
+
+
+def get_catalogue_facets():
+    """Facets zonder filters (gecached): ook de opties voor de filter-dropdowns."""
+    with _cache_lock:
+        facets = _cache.get("all")
+    if facets is None:
+        facets = compute_facets()
+        with _cache_lock:
+            _cache["all"] = facets
+    return facets
+
+
+def get_facets(search="", selected_domain="all", selected_company="", min_score=""):
+    if not search and selected_domain == "all" and not selected_company and not min_score:
+        return get_catalogue_facets()
+    return compute_facets(search, selected_domain, selected_company, min_score)
+
+
+def invalidate_facets():
+    with _cache_lock:
+        _cache.clear()
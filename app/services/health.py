@@ -0,0 +1,172 @@
+# app/services/health.py
+"""
+Readiness-checks voor /readyz (load balancer, orchestrator).
+
+- database: `SELECT 1` op elke engine (primary + replica), met een
+  statement_timeout op Postgres.
+- pool: bezetting van de connection pool per engine; een volle pool
+  (checked out == pool_size + max_overflow) is "degraded".
+- storage: de PDF-bucket is bereikbaar (één object oplijsten, of de lokale
+  map bestaat en is schrijfbaar).
+- ai_queue: aantal papers met ai_status "pending".
+
+Elke check draait in een eigen thread met HEALTH_CHECK_TIMEOUT: een
+hangende database of storage-API houdt de probe niet op. Het resultaat
+wordt HEALTH_CACHE_SECONDS per process gecached, zodat frequente probes
+(meerdere load balancers, elke paar seconden) bijna niets kosten.
+
+Enkel de database is kritiek (HTTP 503); de rest maakt de status "degraded".
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+
+from app.models import db
+
+CRITICAL_CHECKS = ("database",)
+
+_executor = None
+_executor_lock = threading.Lock()
+# (monotonic tijdstip, rapport); de lock laat gelijktijdige probes één berekening delen
+_cached = None
+_cache_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # Begrensd: ook als checks blijven hangen, komen er geen threads bij
+                _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="readyz")
+    return _executor
+
+
+def reset_health_after_fork():
+    """Na een fork: threads en cache van de parent niet hergebruiken."""
+    global _executor, _cached
+    _executor = None
+    _cached = None
+
+
+# ---------------------------------------------------
+# CHECKS
+# ---------------------------------------------------
+def check_database(timeout):
+    engines = {}
+    for name, engine in db.engines.items():
+        start = time.perf_counter()
+        with engine.connect() as conn:
+            if engine.dialect.name == "postgresql":
+                # Server-side afbreken i.p.v. enkel client-side op te geven
+                conn.execute(text(f"SET LOCAL statement_timeout = {int(timeout * 1000)}"))
+            conn.execute(text("SELECT 1"))
+        engines[name or "primary"] = {"ms": round((time.perf_counter() - start) * 1000, 1)}
+    return {"ok": True, "engines": engines}
+
+
+def check_pool(max_overflow):
+    engines = {}
+    saturated = False
+    for name, engine in db.engines.items():
+        pool = engine.pool
+        if not isinstance(pool, QueuePool):
+            engines[name or "primary"] = {"pool": type(pool).__name__}
+            continue
+        capacity = pool.size() + max_overflow
+        checked_out = pool.checkedout()
+        engines[name or "primary"] = {
+            "checked_out": checked_out,
+            "capacity": capacity,
+            "usage": round(checked_out / capacity, 2) if capacity else None,
+        }
+        saturated = saturated or checked_out >= capacity
+    return {"ok": not saturated, "engines": engines}
+
+
+def check_storage(config):
+    from app.services.storage import get_bucket
+
+    if config["STORAGE_BACKEND"] == "local":
+        directory = config["STORAGE_LOCAL_DIR"]
+        ok = os.path.isdir(directory) and os.access(directory, os.W_OK)
+        return {"ok": ok, "backend": "local"} if ok else {
+            "ok": False, "backend": "local", "error": f"{directory} is not a writable directory",
+        }
+    get_bucket().list(options={"limit": 1})
+    return {"ok": True, "backend": config["STORAGE_BACKEND"]}
+
+
+def check_ai_queue(warn_at):
+    from app.services.ai_queue import pending_count
+
+    pending = pending_count()
+    return {"ok": pending < warn_at, "pending": pending}
+
+
+# ---------------------------------------------------
+# RAPPORT
+# ---------------------------------------------------
+def _run(app, check, *args):
+    with app.app_context():
+        start = time.perf_counter()
+        try:
+            result = check(*args)
+        except Exception as e:
+            # Eerste regel volstaat (geen SQL of parameters in een publieke probe)
+            message = (str(e).splitlines() or [""])[0][:200]
+            result = {"ok": False, "error": f"{type(e).__name__}: {message}"}
+        finally:
+            db.session.remove()
+        result["check_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return result
+
+
+def run_checks(app):
+    """Alle checks parallel, elk begrensd door HEALTH_CHECK_TIMEOUT."""
+    config = app.config
+    timeout = config["HEALTH_CHECK_TIMEOUT"]
+    checks = {
+        "database": (check_database, timeout),
+        "pool": (check_pool, config["DB_MAX_OVERFLOW"]),
+        "storage": (check_storage, config),
+        "ai_queue": (check_ai_queue, config["HEALTH_AI_QUEUE_WARN"]),
+    }
+    executor = _get_executor()
+    futures = {name: executor.submit(_run, app, *spec) for name, spec in checks.items()}
+
+    deadline = time.monotonic() + timeout
+    results = {}
+    for name, future in futures.items():
+        try:
+            results[name] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeout:
+            results[name] = {"ok": False, "error": f"timed out after {timeout}s"}
+
+    if not all(results[name]["ok"] for name in CRITICAL_CHECKS):
+        status = "unavailable"
+    elif not all(result["ok"] for result in results.values()):
+        status = "degraded"
+    else:
+        status = "ok"
+    return {
+        "status": status,
+        "checked_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "checks": results,
+    }
+
+
+def get_readiness(app):
+    """Gecachet rapport; (rapport, leeftijd in seconden)."""
+    global _cached
+    with _cache_lock:
+        now = time.monotonic()
+        if _cached is None or now - _cached[0] >= app.config["HEALTH_CACHE_SECONDS"]:
+            _cached = (now, run_checks(app))
+        checked_at, report = _cached
+    return report, now - checked_at
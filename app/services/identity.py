@@ -0,0 +1,75 @@
+# app/services/identity.py
+"""
+Identiteit van de ingelogde gebruiker (user + gekoppelde company).
+
+Per request gecached in flask.g en per process in een kleine TTL-cache, zodat
+de meeste pagina's geen User/Company-lookup meer doen. Bij profiel- of
+rolwijzigingen: invalidate_identity(user_id).
+
+De cache is per process. Een cache-entry hoort bij de identity_version in de
+sessie; invalidate_identity zet een nieuwe versie in de sessie van de
+gebruiker zelf, zodat ook de andere workers opnieuw laden.
+"""
+import threading
+import time
+from collections import namedtuple
+
+from cachetools import TTLCache
+from flask import g, has_request_context, session
+
+from app.models import db, User
+
+# Wat de versie in de sessie niet dekt (andere sessies van dezelfde user,
+# een account dat een admin verwijdert) blijft in andere workers tot
+# IDENTITY_TTL_SECONDS oud: rol, company_id en zelfs een verwijderde user.
+IDENTITY_TTL_SECONDS = 60
+IDENTITY_CACHE_SIZE = 1024
+
+# Gewone waarden, geen ORM-objecten: die horen bij één db-sessie
+Identity = namedtuple("Identity", ["user_id", "name", "email", "role", "company_id"])
+
+_cache = TTLCache(maxsize=IDENTITY_CACHE_SIZE, ttl=IDENTITY_TTL_SECONDS)
+_cache_lock = threading.Lock()
+
+
+def load_identity(user_id, version=None):
+    """Identity voor een user_id (TTL-cache bij dezelfde `version`, anders één query)."""
+    with _cache_lock:
+        cached = _cache.get(user_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    row = (
+        db.session.query(
+            User.user_id, User.name, User.email, User.role, User.company_id
+        )
+        .filter(User.user_id == user_id)
+        .first()
+    )
+    if row is None:
+        return None
+
+    identity = Identity(*row)
+    with _cache_lock:
+        _cache[user_id] = (version, identity)
+    return identity
+
+
+def get_current_identity():
+    """Identity van de ingelogde gebruiker, of None."""
+    if "identity" not in g:
+        user_id = session.get("user_id")
+        g.identity = (
+            load_identity(user_id, session.get("identity_version")) if user_id else None
+        )
+    return g.identity
+
+
+def invalidate_identity(user_id):
+    """Lokale cache leegmaken; voor de eigen sessie ook een nieuwe versie (alle workers)."""
+    with _cache_lock:
+        _cache.pop(user_id, None)
+    if has_request_context():
+        g.pop("identity", None)
+        if session.get("user_id") == user_id:
+            session["identity_version"] = time.time_ns()
@@ -0,0 +1,25 @@
+# app/services/leaderboard.py
+"""
+AI-leaderboard: papers met een afgewerkte analyse, gesorteerd op
+Paper.ai_total_score.
+
+De query volgt exact de partiële indexen ix_Paper_ai_leaderboard(_domain)
+(zelfde WHERE en ORDER BY), zodat een top-k een index scan van k rijen is.
+"""
+from app.models import Paper, LEADERBOARD_WHERE
+
+DEFAULT_LEADERBOARD_SIZE = 5
+MAX_LEADERBOARD_SIZE = 100
+
+
+def leaderboard_query(domain=None):
+    query = Paper.query.filter(LEADERBOARD_WHERE)
+    if domain:
+        query = query.filter(Paper.research_domain == domain)
+    return query.order_by(Paper.ai_total_score.desc(), Paper.paper_id.desc())
+
+
+def get_leaderboard(domain=None, limit=DEFAULT_LEADERBOARD_SIZE, options=()):
+    """Top `limit` papers, globaal of binnen één research domain."""
+    limit = max(1, min(limit, MAX_LEADERBOARD_SIZE))
+    return leaderboard_query(domain).options(*options).limit(limit).all()
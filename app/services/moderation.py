@@ -0,0 +1,127 @@
+# app/services/moderation.py
+"""
+Moderatiewachtrij voor complaints (admins).
+
+- Keyset paginatie op (created_at, complaint_id) aflopend, gedekt door
+  ix_Complaint_queue (status, created_at DESC, complaint_id DESC).
+- Tellingen per paper komen uit één GROUP BY i.p.v. per paper te laden.
+- Bulk resolve/dismiss is één UPDATE ... WHERE complaint_id IN (...).
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import joinedload
+
+from app.models import db, Paper, Complaint, sortable_datetime
+
+QUEUE_PAGE_SIZE = 50
+MOST_REPORTED_LIMIT = 10
+BULK_ACTIONS = {"resolve": "resolved", "dismiss": "dismissed"}
+
+
+def filtered_complaints(status="open", category=None, paper_id=None, since=None, until=None):
+    """Basisquery met de wachtrij-filters (until is inclusief die dag)."""
+    query = Complaint.query
+    if status:
+        query = query.filter(Complaint.status == status)
+    if category:
+        query = query.filter(Complaint.category == category)
+    if paper_id:
+        query = query.filter(Complaint.paper_id == paper_id)
+    if since:
+        query = query.filter(Complaint.created_at >= since)
+    if until:
+        query = query.filter(Complaint.created_at < until + timedelta(days=1))
+    return query
+
+
+def get_queue_page(filters, cursor=None, limit=QUEUE_PAGE_SIZE):
+    """
+    Eén pagina van de wachtrij, nieuwste eerst.
+    cursor = (created_at, complaint_id) van de laatste rij van de vorige pagina.
+    Geeft (complaints, next_cursor) terug.
+    """
+    query = filtered_complaints(**filters).options(
+        joinedload(Complaint.paper).load_only(Paper.paper_id, Paper.title)
+    )
+    created_at = sortable_datetime(Complaint.created_at)
+    if cursor:
+        cursor_at, cursor_id = cursor
+        query = query.filter(
+            tuple_(created_at, Complaint.complaint_id)
+            < tuple_(sortable_datetime(cursor_at), cursor_id)
+        )
+
+    rows = (
+        query.order_by(created_at.desc(), Complaint.complaint_id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = (rows[-1].created_at, rows[-1].complaint_id) if has_more else None
+    return rows, next_cursor
+
+
+def complaint_counts(paper_ids, status="open"):
+    """{paper_id: aantal complaints} voor de gegeven papers (één aggregate)."""
+    if not paper_ids:
+        return {}
+    rows = (
+        db.session.query(Complaint.paper_id, func.count(Complaint.complaint_id))
+        .filter(Complaint.paper_id.in_(list(paper_ids)), Complaint.status == status)
+        .group_by(Complaint.paper_id)
+    )
+    return dict(rows.all())
+
+
+def most_reported_papers(limit=MOST_REPORTED_LIMIT, status="open"):
+    """[(paper_id, title, aantal)] met de meeste complaints in `status`."""
+    counts = (
+        db.session.query(
+            Complaint.paper_id.label("paper_id"),
+            func.count(Complaint.complaint_id).label("n"),
+        )
+        .filter(Complaint.status == status)
+        .group_by(Complaint.paper_id)
+        .subquery()
+    )
+    return (
+        db.session.query(counts.c.paper_id, Paper.title, counts.c.n)
+        .join(Paper, Paper.paper_id == counts.c.paper_id)
+        .order_by(counts.c.n.desc(), counts.c.paper_id)
+        .limit(limit)
+        .all()
+    )
+
+
+def bulk_update_status(complaint_ids, action, user_id):
+    """Resolve/dismiss open complaints in één UPDATE. Geeft het aantal rijen terug."""
+    status = BULK_ACTIONS[action]
+    if not complaint_ids:
+        return 0
+    updated = (
+        Complaint.query.filter(
+            Complaint.complaint_id.in_(list(complaint_ids)),
+            Complaint.status == "open",
+        )
+        .update(
+            {
+                Complaint.status: status,
+                Complaint.resolved_at: datetime.now(),
+                Complaint.resolved_by: user_id,
+            },
+            synchronize_session=False,
+        )
+    )
+    db.session.commit()
+    return updated
+
+
+def paper_complaints(paper_id):
+    """Complaints van één paper voor de detailpagina (enkel voor moderators)."""
+    return (
+        Complaint.query.filter(Complaint.paper_id == paper_id)
+        .order_by(Complaint.created_at.desc(), Complaint.complaint_id.desc())
+        .all()
+    )
@@ -0,0 +1,232 @@
+# app/services/reconcile.py
+"""
+Reconciliatie tussen de storage-bucket en Paper.file_path.
+
+- Wezen: objecten in de bucket zonder Paper (mislukte remove() bij
+  delete_paper, of een upload waarvan de DB-commit faalde). Die kosten
+  opslag en vertragen listings, en worden verwijderd.
+- Ontbrekend: papers waarvan de PDF niet (meer) in de bucket staat. Die
+  worden enkel gerapporteerd.
+
+Geheugen blijft begrensd: de bucket-listing wordt per pagina opgehaald
+(gesorteerd op naam) en de file_paths worden gesorteerd gestreamd met
+yield_per; een sorted merge van beide streams geeft het verschil. Wezen
+worden naar een tijdelijk bestand geschreven en pas na de volledige
+listing verwijderd (verwijderen tijdens het pagineren zou de offsets
+verschuiven), in batches van RECONCILE_DELETE_BATCH per remove()-call.
+
+Veiligheid:
+- objecten jonger dan RECONCILE_MIN_AGE_HOURS worden nooit verwijderd
+  (de upload gebeurt vóór de DB-commit);
+- vlak voor elke remove() wordt de batch opnieuw tegen de database
+  gecontroleerd (papers die intussen aangemaakt zijn);
+- beide streams moeten strikt in bytevolgorde staan, anders stopt de run
+  vóór er iets verwijderd is.
+"""
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import select
+
+from app.models import db, Paper
+from app.services.storage import get_bucket
+
+MISSING_SAMPLE = 20
+
+
+class ReconcileError(RuntimeError):
+    """De listing of de query is niet gesorteerd zoals de merge verwacht."""
+
+
+class ReconcileReport:
+    def __init__(self, dry_run):
+        self.dry_run = dry_run
+        self.objects = 0
+        self.papers = 0
+        self.orphans = 0
+        self.too_recent = 0
+        self.deleted = 0
+        self.missing = 0
+        self.missing_sample = []  # (paper_id, file_path), de eerste MISSING_SAMPLE
+
+    def summary(self):
+        action = "would delete" if self.dry_run else "deleted"
+        count = self.orphans - self.too_recent if self.dry_run else self.deleted
+        return (
+            f"{self.objects} objects, {self.papers} papers: "
+            f"{self.orphans} orphans ({action} {count}, "
+            f"{self.too_recent} too recent to delete), {self.missing} missing files"
+        )
+
+
+def _parse_timestamp(value):
+    if not value:
+        return None
+    stamp = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return stamp if stamp.tzinfo else stamp.replace(tzinfo=timezone.utc)
+
+
+def iter_bucket_objects(bucket, page_size):
+    """
+    (naam, laatst gewijzigd) van alle objecten in de root van de bucket,
+    gesorteerd op naam. Mappen (id None) worden overgeslagen: de app maakt
+    enkel platte keys aan.
+    """
+    offset = 0
+    previous = None
+    while True:
+        page = bucket.list(
+            None,
+            {
+                "limit": page_size,
+                "offset": offset,
+                "sortBy": {"column": "name", "order": "asc"},
+            },
+        )
+        for item in page:
+            name = item["name"]
+            if previous is not None and name <= previous:
+                raise ReconcileError(f"Bucket listing not sorted at {name!r}")
+            previous = name
+            if item.get("id") is None:
+                continue
+            yield name, _parse_timestamp(item.get("updated_at") or item.get("created_at"))
+        if len(page) < page_size:
+            return
+        offset += page_size
+
+
+def _file_path_order():
+    # Binaire collatie op PostgreSQL, zodat de volgorde gelijk is aan die van
+    # Python-strings (en van de bucket-listing)
+    if db.session.get_bind(mapper=Paper).dialect.name == "postgresql":
+        return Paper.file_path.collate("C")
+    return Paper.file_path
+
+
+def iter_paper_files(batch_size):
+    """(file_path, paper_id) van alle papers, gesorteerd op file_path (server-side cursor)."""
+    rows = db.session.execute(
+        select(Paper.file_path, Paper.paper_id)
+        .where(Paper.file_path.isnot(None))
+        .order_by(_file_path_order(), Paper.paper_id)
+        .execution_options(yield_per=batch_size)
+    )
+    previous = None
+    for file_path, paper_id in rows:
+        if previous is not None and file_path < previous:
+            raise ReconcileError(f"file_path order differs from byte order at {file_path!r}")
+        previous = file_path
+        yield file_path, paper_id
+
+
+def diff_sorted(objects, files):
+    """
+    Sorted merge van (naam, ...) en (file_path, ...) streams.
+    Yield ("orphan", object) en ("missing", file); gedeelde paths vallen weg.
+    """
+    objects, files = iter(objects), iter(files)
+    obj = next(objects, None)
+    file = next(files, None)
+    while obj is not None or file is not None:
+        if file is None or (obj is not None and obj[0] < file[0]):
+            yield "orphan", obj
+            obj = next(objects, None)
+        elif obj is None or file[0] < obj[0]:
+            yield "missing", file
+            file = next(files, None)
+        else:
+            # Meerdere papers kunnen naar dezelfde PDF wijzen
+            name = obj[0]
+            while file is not None and file[0] == name:
+                file = next(files, None)
+            obj = next(objects, None)
+
+
+def _spooled_batches(spool, batch_size):
+    spool.seek(0)
+    batch = []
+    for line in spool:
+        batch.append(line.rstrip("\n"))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _still_orphaned(names):
+    """Laatste controle vlak voor remove(): niet verwijderen wat intussen een Paper heeft."""
+    linked = set(
+        db.session.execute(
+            select(Paper.file_path).where(Paper.file_path.in_(names))
+        ).scalars()
+    )
+    return [name for name in names if name not in linked]
+
+
+def reconcile_storage(
+    dry_run=False,
+    bucket=None,
+    page_size=None,
+    delete_batch=None,
+    min_age_hours=None,
+    now=None,
+    on_missing=None,
+):
+    """
+    Vergelijk bucket en database, verwijder wezen (tenzij dry_run).
+    on_missing(paper_id, file_path) wordt voor elk ontbrekend bestand
+    aangeroepen. Geeft een ReconcileReport terug.
+    """
+    config = current_app.config
+    bucket = bucket or get_bucket()
+    page_size = page_size or config["RECONCILE_PAGE_SIZE"]
+    delete_batch = delete_batch or config["RECONCILE_DELETE_BATCH"]
+    if min_age_hours is None:
+        min_age_hours = config["RECONCILE_MIN_AGE_HOURS"]
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(hours=min_age_hours)
+
+    report = ReconcileReport(dry_run)
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as spool:
+        objects = iter_bucket_objects(bucket, page_size)
+        files = iter_paper_files(page_size)
+
+        def counted_objects():
+            for obj in objects:
+                report.objects += 1
+                yield obj
+
+        def counted_files():
+            for file in files:
+                report.papers += 1
+                yield file
+
+        for kind, entry in diff_sorted(counted_objects(), counted_files()):
+            if kind == "missing":
+                file_path, paper_id = entry
+                report.missing += 1
+                if len(report.missing_sample) < MISSING_SAMPLE:
+                    report.missing_sample.append((paper_id, file_path))
+                if on_missing:
+                    on_missing(paper_id, file_path)
+                continue
+            name, modified = entry
+            report.orphans += 1
+            if modified is None or modified > cutoff:
+                report.too_recent += 1
+            elif not dry_run:
+                spool.write(name + "\n")
+
+        # De lees-transactie van de stream niet openhouden tijdens de removes
+        db.session.rollback()
+        if not dry_run:
+            for batch in _spooled_batches(spool, delete_batch):
+                names = _still_orphaned(batch)
+                db.session.rollback()
+                if names:
+                    bucket.remove(names)
+                    report.deleted += len(names)
+    return report
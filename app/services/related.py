@@ -0,0 +1,291 @@
+# app/services/related.py
+"""
+"Similar papers": voorberekende TF-IDF buren in de PaperNeighbor tabel.
+
+Titel, abstract en AI-samenvatting worden sparse TF-IDF vectoren (SciPy CSR,
+L2-genormaliseerd), zodat cosine similarity een matrixproduct is. De top-k per
+paper wordt berekend in blokken rijen (blok x alle papers, begrensd door
+BLOCK_MEMORY_BYTES) en per blok weggeschreven.
+
+- rebuild_neighbors(): alle papers opnieuw (periodiek / na grote imports)
+- update_neighbors(): enkel papers zonder neighbors_computed_at (nieuwe
+  uploads, bewerkte papers). De corpus wordt opnieuw gevectoriseerd (lineair), maar alleen de
+  nieuwe rijen worden vermenigvuldigd; bestaande papers krijgen een nieuwe
+  paper erbij als die hun huidige k-de score verslaat.
+
+Het detailscherm leest met get_related_papers() k rijen via de primary key.
+"""
+import math
+import re
+from array import array
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import joinedload
+
+from app.models import db, Paper, PaperNeighbor
+
+DEFAULT_K = 10
+DEFAULT_BLOCK_SIZE = 512
+# Dense score-blok (rijen x alle papers, float32) blijft onder dit budget
+BLOCK_MEMORY_BYTES = 64 * 1024 * 1024
+# Buren met een lagere cosine score worden niet opgeslagen
+MIN_SCORE = 0.05
+DELETE_CHUNK = 500
+
+TOKEN_RE = re.compile(r"[a-z][a-z0-9]+")
+STOPWORDS = frozenset(
+    """
+    a about above after again all also an and any are as at be because been
+    before being between both but by can could did do does doing during each
+    few for from further had has have having here how however if in into is it
+    its itself more most no nor not of off on once only or other our out over
+    own paper same should so some such than that the their them then there
+    these they this those through to too under until up using very was we were
+    what when where which while who why will with within without would
+    """.split()
+)
+
+
+def _scientific():
+    """Lazy import: numpy/scipy enkel laden wanneer de index gebouwd wordt."""
+    import numpy as np
+    from scipy import sparse
+
+    return np, sparse
+
+
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def iter_documents(batch_size=1000):
+    """(paper_id, tekst) voor elke paper, gestreamd in partities."""
+    query = (
+        db.session.query(Paper.paper_id, Paper.title, Paper.abstract, Paper.ai_summary)
+        .order_by(Paper.paper_id)
+        .execution_options(yield_per=batch_size)
+    )
+    for paper_id, title, abstract, summary in query:
+        yield paper_id, " ".join(part for part in (title, abstract, summary) if part)
+
+
+def build_tfidf(documents):
+    """
+    Geeft (paper_ids, X): X is een CSR-matrix (papers x termen) met
+    sublineaire tf * smooth idf, rijen L2-genormaliseerd.
+    """
+    np, sparse = _scientific()
+
+    vocabulary = {}
+    paper_ids = array("q")
+    indptr = array("q", [0])
+    indices = array("i")
+    data = array("f")
+    for paper_id, text in documents:
+        for term, count in Counter(tokenize(text)).items():
+            indices.append(vocabulary.setdefault(term, len(vocabulary)))
+            data.append(1.0 + math.log(count))
+        indptr.append(len(indices))
+        paper_ids.append(paper_id)
+
+    n_docs = len(paper_ids)
+    X = sparse.csr_matrix(
+        (
+            np.frombuffer(data, dtype=np.float32).copy(),
+            np.frombuffer(indices, dtype=np.int32),
+            np.frombuffer(indptr, dtype=np.int64),
+        ),
+        shape=(n_docs, len(vocabulary)),
+    )
+
+    df = np.bincount(X.indices, minlength=X.shape[1])
+    idf = (np.log((1.0 + n_docs) / (1.0 + df)) + 1.0).astype(np.float32)
+    X.data *= idf[X.indices]
+
+    norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    X.data /= np.repeat(norms, np.diff(X.indptr)).astype(np.float32)
+
+    return np.frombuffer(paper_ids, dtype=np.int64), X
+
+
+def _score_blocks(X, rows, block_size):
+    """Yield (rijnummers, dense scores blok x alle papers) voor `rows`."""
+    np, _ = _scientific()
+    n_docs = X.shape[0]
+    step = max(1, min(block_size, BLOCK_MEMORY_BYTES // max(1, n_docs * 4)))
+    XT = X.T.tocsr()
+    for start in range(0, len(rows), step):
+        block = np.asarray(rows[start:start + step])
+        scores = (X[block] @ XT).toarray()
+        scores[np.arange(len(block)), block] = -1.0  # paper zelf uitsluiten
+        yield block, scores
+
+
+def _top_k(scores, k):
+    """Per rij de (kolommen, scores) van de k hoogste scores, aflopend."""
+    np, _ = _scientific()
+    k = min(k, scores.shape[1] - 1)
+    if k <= 0:
+        return [([], []) for _ in range(scores.shape[0])]
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    top = np.take_along_axis(top, order, axis=1)
+    top_scores = np.take_along_axis(top_scores, order, axis=1)
+    result = []
+    for cols, vals in zip(top, top_scores):
+        keep = vals > MIN_SCORE
+        result.append((cols[keep], vals[keep]))
+    return result
+
+
+def _write_neighbors(neighbors):
+    """
+    neighbors: {paper_id: [(neighbor_id, score), ...]} (aflopend). Elke paper
+    wordt als berekend gemarkeerd, ook met een lege lijst.
+    """
+    if not neighbors:
+        return
+    paper_ids = list(neighbors)
+    computed_at = datetime.now()
+    for i in range(0, len(paper_ids), DELETE_CHUNK):
+        chunk = paper_ids[i:i + DELETE_CHUNK]
+        PaperNeighbor.query.filter(
+            PaperNeighbor.paper_id.in_(chunk)
+        ).delete(synchronize_session=False)
+        Paper.query.filter(Paper.paper_id.in_(chunk)).update(
+            {Paper.neighbors_computed_at: computed_at}, synchronize_session=False
+        )
+
+    rows = [
+        {
+            "paper_id": paper_id,
+            "rank": rank,
+            "neighbor_id": neighbor_id,
+            "score": float(score),
+        }
+        for paper_id, items in neighbors.items()
+        for rank, (neighbor_id, score) in enumerate(items, start=1)
+    ]
+    if rows:
+        db.session.execute(insert(PaperNeighbor.__table__), rows)
+
+
+def _block_neighbors(paper_ids, block, scores, k):
+    return {
+        int(paper_ids[row]): [
+            (int(paper_ids[col]), float(score)) for col, score in zip(cols, vals)
+        ]
+        for row, (cols, vals) in zip(block, _top_k(scores, k))
+    }
+
+
+def rebuild_neighbors(k=DEFAULT_K, block_size=DEFAULT_BLOCK_SIZE):
+    """Alle buren opnieuw berekenen. Geeft het aantal verwerkte papers terug."""
+    paper_ids, X = build_tfidf(iter_documents())
+    if not len(paper_ids):
+        return 0
+
+    for block, scores in _score_blocks(X, range(len(paper_ids)), block_size):
+        _write_neighbors(_block_neighbors(paper_ids, block, scores, k))
+        # Per blok committen: lezers zien oude of nieuwe lijsten, nooit lege
+        db.session.commit()
+    return len(paper_ids)
+
+
+def pending_paper_ids():
+    """Papers waarvan de buren nog niet berekend zijn (nieuw of bewerkt)."""
+    return [
+        row.paper_id
+        for row in db.session.query(Paper.paper_id).filter(
+            Paper.neighbors_computed_at.is_(None)
+        )
+    ]
+
+
+def update_neighbors(k=DEFAULT_K, block_size=DEFAULT_BLOCK_SIZE, paper_ids=None):
+    """
+    Incrementele update voor `paper_ids` (standaard: pending_paper_ids()).
+    Geeft (nieuwe papers, bijgewerkte bestaande papers) terug.
+    """
+    np, _ = _scientific()
+
+    pending = set(paper_ids if paper_ids is not None else pending_paper_ids())
+    if not pending:
+        return 0, 0
+
+    all_ids, X = build_tfidf(iter_documents())
+    position = {int(pid): i for i, pid in enumerate(all_ids)}
+    rows = sorted(position[pid] for pid in pending if pid in position)
+    if not rows:
+        return 0, 0
+
+    # Drempel per bestaande paper: de k-de score als de lijst vol is
+    thresholds = np.full(len(all_ids), MIN_SCORE, dtype=np.float32)
+    full_lists = (
+        db.session.query(PaperNeighbor.paper_id, func.min(PaperNeighbor.score))
+        .group_by(PaperNeighbor.paper_id)
+        .having(func.count(PaperNeighbor.rank) >= k)
+    )
+    for paper_id, kth_score in full_lists:
+        if paper_id in position:
+            thresholds[position[paper_id]] = kth_score
+    thresholds[rows] = np.inf  # pending papers krijgen een volledige lijst
+
+    candidates = defaultdict(list)
+    for block, scores in _score_blocks(X, rows, block_size):
+        _write_neighbors(_block_neighbors(all_ids, block, scores, k))
+
+        # Bestaande papers waarvoor een nieuwe paper in de top-k komt
+        hit_rows, hit_cols = np.nonzero(scores > thresholds)
+        for r, c in zip(hit_rows, hit_cols):
+            candidates[int(all_ids[c])].append(
+                (int(all_ids[block[r]]), float(scores[r, c]))
+            )
+        db.session.commit()
+
+    if candidates:
+        existing = defaultdict(list)
+        keys = list(candidates)
+        for i in range(0, len(keys), DELETE_CHUNK):
+            for link in PaperNeighbor.query.filter(
+                PaperNeighbor.paper_id.in_(keys[i:i + DELETE_CHUNK])
+            ):
+                existing[link.paper_id].append((link.neighbor_id, link.score))
+
+        merged = {}
+        for paper_id, new_items in candidates.items():
+            best = {}
+            for neighbor_id, score in existing[paper_id] + new_items:
+                best[neighbor_id] = max(score, best.get(neighbor_id, score))
+            merged[paper_id] = sorted(best.items(), key=lambda item: -item[1])[:k]
+        _write_neighbors(merged)
+        db.session.commit()
+
+    return len(rows), len(candidates)
+
+
+def mark_stale(paper_id):
+    """Na een tekstwijziging: buren weggooien zodat update_neighbors ze herberekent."""
+    PaperNeighbor.query.filter_by(paper_id=paper_id).delete(synchronize_session=False)
+    Paper.query.filter_by(paper_id=paper_id).update(
+        {Paper.neighbors_computed_at: None}, synchronize_session=False
+    )
+
+
+def get_related_papers(paper_id, limit=DEFAULT_K):
+    """Opgeslagen buren van een paper (k rijen via de primary key)."""
+    return (
+        PaperNeighbor.query.options(
+            joinedload(PaperNeighbor.neighbor).load_only(
+                Paper.paper_id, Paper.title, Paper.research_domain
+            )
+        )
+        .filter(PaperNeighbor.paper_id == paper_id)
+        .order_by(PaperNeighbor.rank)
+        .limit(limit)
+        .all()
+    )
@@ -0,0 +1,325 @@
+# app/services/reviewer_suggestions.py
+"""
+Reviewer-suggesties voor editors.
+
+Per reviewer houden ReviewerProfile (totaal, recente belasting, laatste
+review) en ReviewerDomainStat (reviews per research domain) een
+voorberekende samenvatting bij, set-based geaggregeerd uit Review x Paper.
+refresh_profiles() werkt enkel verouderde profielen bij (nieuwe reviews,
+nieuwe reviewers, of ouder dan PROFILE_MAX_AGE zodat het load-venster
+meeschuift).
+
+Scoren gebeurt in één keer voor alle reviewers: de profielen worden per
+process als NumPy-arrays gecached (reviewers x domeinen), een suggestie is
+dan een handvol vectoroperaties + top-k.
+
+score = W_DOMAIN * domein-affiniteit + W_RECENCY * recentheid - W_LOAD * belasting
+Conflicten (eigen paper, zelfde facility-company, al gereviewd) vallen weg.
+"""
+import threading
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from cachetools import TTLCache
+from sqlalchemy import case, func, insert, literal, select
+
+from app.models import (
+    db,
+    User,
+    Paper,
+    PaperCompany,
+    Review,
+    ReviewerProfile,
+    ReviewerDomainStat,
+)
+
+CANDIDATE_ROLES = ("Reviewer", "Company")
+DEFAULT_SUGGESTIONS = 10
+
+LOAD_WINDOW_DAYS = 30
+PROFILE_MAX_AGE = timedelta(days=1)
+REFRESH_CHUNK = 1000
+
+RECENCY_HALF_LIFE_DAYS = 90.0
+# Bij zoveel recente reviews is de belastingsstraf half
+LOAD_SOFT_CAP = 3.0
+W_DOMAIN = 1.0
+W_RECENCY = 0.3
+W_LOAD = 0.5
+
+MATRIX_TTL_SECONDS = 300
+
+Suggestion = namedtuple(
+    "Suggestion",
+    ["user_id", "name", "role", "score", "domain_reviews", "recent_reviews", "last_review_at"],
+)
+
+_cache = TTLCache(maxsize=1, ttl=MATRIX_TTL_SECONDS)
+_cache_lock = threading.Lock()
+
+
+# ---------------------------------------------------
+# PROFILE REFRESH (SET-BASED)
+# ---------------------------------------------------
+def stale_reviewer_ids(now=None):
+    """Kandidaten zonder profiel, met nieuwere reviews, of met een te oud profiel."""
+    now = now or datetime.now()
+    newer_review = (
+        db.session.query(Review.review_id)
+        .filter(
+            Review.reviewer_id == User.user_id,
+            Review.date_submitted >= ReviewerProfile.refreshed_at,
+        )
+        .exists()
+    )
+    query = (
+        db.session.query(User.user_id)
+        .outerjoin(ReviewerProfile, ReviewerProfile.user_id == User.user_id)
+        .filter(User.role.in_(CANDIDATE_ROLES))
+        .filter(
+            (ReviewerProfile.user_id.is_(None))
+            | (ReviewerProfile.refreshed_at < now - PROFILE_MAX_AGE)
+            | newer_review
+        )
+    )
+    return [row.user_id for row in query]
+
+
+def _refresh_chunk(user_ids, now):
+    cutoff = now - timedelta(days=LOAD_WINDOW_DAYS)
+
+    ReviewerDomainStat.query.filter(
+        ReviewerDomainStat.user_id.in_(user_ids)
+    ).delete(synchronize_session=False)
+    ReviewerProfile.query.filter(
+        ReviewerProfile.user_id.in_(user_ids)
+    ).delete(synchronize_session=False)
+
+    domain_counts = (
+        select(
+            Review.reviewer_id,
+            Paper.research_domain,
+            func.count(Review.review_id),
+        )
+        .join(Paper, Paper.paper_id == Review.paper_id)
+        .where(Review.reviewer_id.in_(user_ids))
+        .group_by(Review.reviewer_id, Paper.research_domain)
+    )
+    db.session.execute(
+        insert(ReviewerDomainStat.__table__).from_select(
+            ["user_id", "research_domain", "review_count"], domain_counts
+        )
+    )
+
+    profiles = (
+        select(
+            User.user_id,
+            func.count(Review.review_id),
+            func.coalesce(
+                func.sum(case((Review.date_submitted >= cutoff, 1), else_=0)), 0
+            ),
+            func.max(Review.date_submitted),
+            literal(now, type_=db.DateTime),
+        )
+        .select_from(User)
+        .outerjoin(Review, Review.reviewer_id == User.user_id)
+        .where(User.user_id.in_(user_ids))
+        .group_by(User.user_id)
+    )
+    db.session.execute(
+        insert(ReviewerProfile.__table__).from_select(
+            [
+                "user_id",
+                "review_count",
+                "recent_review_count",
+                "last_review_at",
+                "refreshed_at",
+            ],
+            profiles,
+        )
+    )
+
+
+def refresh_profiles(user_ids=None, full=False):
+    """
+    Profielen bijwerken voor `user_ids`, alle kandidaten (full=True) of
+    standaard enkel de verouderde. Geeft het aantal bijgewerkte profielen terug.
+    """
+    now = datetime.now()
+    if full:
+        user_ids = [
+            row.user_id
+            for row in db.session.query(User.user_id).filter(
+                User.role.in_(CANDIDATE_ROLES)
+            )
+        ]
+    elif user_ids is None:
+        user_ids = stale_reviewer_ids(now)
+
+    user_ids = list(user_ids)
+    for i in range(0, len(user_ids), REFRESH_CHUNK):
+        _refresh_chunk(user_ids[i:i + REFRESH_CHUNK], now)
+        db.session.commit()
+
+    if user_ids:
+        invalidate_reviewer_matrix()
+    return len(user_ids)
+
+
+# ---------------------------------------------------
+# VECTORIZED SCORING
+# ---------------------------------------------------
+class ReviewerMatrix:
+    """Alle kandidaat-profielen als arrays (rij i = reviewer i)."""
+
+    def __init__(self):
+        import numpy as np  # lazy: enkel nodig voor suggesties
+
+        rows = (
+            db.session.query(
+                User.user_id,
+                User.company_id,
+                ReviewerProfile.review_count,
+                ReviewerProfile.recent_review_count,
+                ReviewerProfile.last_review_at,
+            )
+            .join(ReviewerProfile, ReviewerProfile.user_id == User.user_id)
+            .filter(User.role.in_(CANDIDATE_ROLES))
+            .order_by(User.user_id)
+            .all()
+        )
+        n = len(rows)
+        self.user_ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=n)
+        self.company_ids = np.fromiter(
+            (r[1] if r[1] is not None else -1 for r in rows), dtype=np.int64, count=n
+        )
+        self.totals = np.fromiter((r[2] for r in rows), dtype=np.float32, count=n)
+        self.recent = np.fromiter((r[3] for r in rows), dtype=np.float32, count=n)
+        self.last_review_ts = np.fromiter(
+            (r[4].timestamp() if r[4] else np.nan for r in rows),
+            dtype=np.float64,
+            count=n,
+        )
+        position = {int(uid): i for i, uid in enumerate(self.user_ids)}
+
+        self.domains = {}
+        stats = db.session.query(
+            ReviewerDomainStat.user_id,
+            ReviewerDomainStat.research_domain,
+            ReviewerDomainStat.review_count,
+        ).all()
+        for _, domain, _ in stats:
+            self.domains.setdefault(domain, len(self.domains))
+        self.domain_counts = np.zeros((n, max(1, len(self.domains))), dtype=np.float32)
+        for user_id, domain, count in stats:
+            i = position.get(user_id)
+            if i is not None:
+                self.domain_counts[i, self.domains[domain]] = count
+
+    def __len__(self):
+        return len(self.user_ids)
+
+    def score(self, domain, exclude_user_ids=(), exclude_company_ids=(), now=None):
+        """Score-vector voor een paper in `domain`; conflicten krijgen -inf."""
+        import numpy as np
+
+        now = now or datetime.now()
+
+        col = self.domains.get(domain)
+        if col is None:
+            domain_reviews = np.zeros(len(self), dtype=np.float32)
+        else:
+            domain_reviews = self.domain_counts[:, col]
+        peak = domain_reviews.max() if len(self) else 0
+        affinity = np.log1p(domain_reviews) / np.log1p(peak) if peak > 0 else domain_reviews
+        specialisation = domain_reviews / np.maximum(self.totals, 1)
+        domain_score = 0.7 * affinity + 0.3 * specialisation
+
+        days = (now.timestamp() - self.last_review_ts) / 86400.0
+        recency = np.where(
+            np.isnan(days), 0.0, np.power(0.5, np.maximum(days, 0) / RECENCY_HALF_LIFE_DAYS)
+        )
+        load = self.recent / (self.recent + LOAD_SOFT_CAP)
+
+        scores = W_DOMAIN * domain_score + W_RECENCY * recency - W_LOAD * load
+        conflict = np.isin(self.user_ids, list(exclude_user_ids))
+        if exclude_company_ids:
+            conflict |= np.isin(self.company_ids, list(exclude_company_ids))
+        scores[conflict] = -np.inf
+        return scores, domain_reviews
+
+
+def get_reviewer_matrix():
+    with _cache_lock:
+        matrix = _cache.get("matrix")
+    if matrix is None:
+        matrix = ReviewerMatrix()
+        with _cache_lock:
+            _cache["matrix"] = matrix
+    return matrix
+
+
+def invalidate_reviewer_matrix():
+    with _cache_lock:
+        _cache.clear()
+
+
+def suggest_reviewers(paper, limit=DEFAULT_SUGGESTIONS):
+    """Top `limit` reviewers voor `paper` als Suggestion-lijst."""
+    import numpy as np
+
+    matrix = get_reviewer_matrix()
+    if not len(matrix):
+        return []
+
+    # Conflicten: auteur, al gereviewd, zelfde facility-company
+    excluded_users = {paper.user_id}
+    excluded_users.update(
+        row.reviewer_id
+        for row in db.session.query(Review.reviewer_id).filter(
+            Review.paper_id == paper.paper_id
+        )
+    )
+    facility_ids = {
+        row.company_id
+        for row in db.session.query(PaperCompany.company_id).filter(
+            PaperCompany.paper_id == paper.paper_id,
+            PaperCompany.relation_type == "facility",
+        )
+    }
+
+    scores, domain_reviews = matrix.score(
+        paper.research_domain, excluded_users, facility_ids
+    )
+    eligible = int(np.isfinite(scores).sum())
+    k = min(limit, eligible)
+    if k <= 0:
+        return []
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind="stable")]
+
+    user_ids = [int(matrix.user_ids[i]) for i in top]
+    users = {
+        row.user_id: row
+        for row in db.session.query(User.user_id, User.name, User.role).filter(
+            User.user_id.in_(user_ids)
+        )
+    }
+    suggestions = []
+    for i, user_id in zip(top, user_ids):
+        user = users.get(user_id)
+        if user is None:
+            continue
+        ts = matrix.last_review_ts[i]
+        suggestions.append(
+            Suggestion(
+                user_id=user_id,
+                name=user.name,
+                role=user.role,
+                score=round(float(scores[i]), 3),
+                domain_reviews=int(domain_reviews[i]),
+                recent_reviews=int(matrix.recent[i]),
+                last_review_at=None if np.isnan(ts) else datetime.fromtimestamp(ts),
+            )
+        )
+    return suggestions
@@ -0,0 +1,485 @@
+# app/services/scheduler.py
+"""
+Lichte scheduler voor periodiek onderhoud (trends, related papers,
+reviewer-profielen, AI-wachtrij, digest, ...).
+
+- Schedules: "every 15m" (interval: s/m/h/d) of een cron-expressie met 5
+  velden ("0 7 * * 1-5": minuut uur dag maand weekdag, met *, lijsten,
+  bereiken en /stappen). "off" zet een job uit.
+- Eén run per job tegelijk over alle workers en nodes: op PostgreSQL een
+  pg_try_advisory_xact_lock op een eigen verbinding (vrijgegeven bij commit,
+  ook als het proces crasht); op andere databases een lease-rij in JobLock.
+- Onder de lock wordt de laatste JobRun opnieuw gelezen, zodat een job die
+  net door een andere node gedraaid heeft niet nog eens start.
+- Elke run komt in JobRun met status, duur en (bij fouten) de exception.
+
+Hosten: `flask scheduler run` (aanbevolen, buiten de webworkers), of
+SCHEDULER_IN_PROCESS=1 om in elke gunicorn worker een scheduler-thread te
+starten (de lock zorgt dat elke job toch maar één keer draait).
+"""
+import hashlib
+import os
+import re
+import socket
+import threading
+import time
+import traceback
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, insert, select, text, update
+from sqlalchemy.exc import IntegrityError
+
+from app.models import db, JobRun, JobLock
+
+INTERVAL_RE = re.compile(r"^every\s+(\d+)\s*([smhd])$")
+INTERVAL_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+# ---------------------------------------------------
+# SCHEDULES
+# ---------------------------------------------------
+class Interval:
+    def __init__(self, seconds):
+        if seconds <= 0:
+            raise ValueError("interval must be positive")
+        self.delta = timedelta(seconds=seconds)
+
+    def next_after(self, moment):
+        return moment + self.delta
+
+    def __str__(self):
+        seconds = int(self.delta.total_seconds())
+        for unit in ("d", "h", "m"):
+            if seconds % INTERVAL_UNITS[unit] == 0:
+                return f"every {seconds // INTERVAL_UNITS[unit]}{unit}"
+        return f"every {seconds}s"
+
+
+# (naam, minimum, maximum) van de cron-velden; weekdag 0 en 7 = zondag
+CRON_FIELDS = (("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 7))
+
+
+def _parse_cron_field(expr, low, high):
+    values = set()
+    for part in expr.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"invalid step in {expr!r}")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(v) for v in part.split("-", 1))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end:
+            raise ValueError(f"{expr!r} out of range {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class Cron:
+    def __init__(self, expression):
+        parts = expression.split()
+        if len(parts) != len(CRON_FIELDS):
+            raise ValueError(f"cron expression needs 5 fields: {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            _parse_cron_field(part, low, high)
+            for part, (_, low, high) in zip(parts, CRON_FIELDS)
+        )
+        self.weekdays = frozenset(0 if day == 7 else day for day in weekdays)
+        # Zoals cron: zijn dag én weekdag beperkt, dan volstaat één van beide
+        self.day_any = parts[2].startswith("*")
+        self.weekday_any = parts[4].startswith("*")
+
+    def _day_matches(self, moment):
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.day_any or self.weekday_any:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, moment):
+        """Eerste tijdstip (op de minuut) strikt na `moment`."""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=366 * 5)
+        while candidate <= limit:
+            if candidate.month not in self.months:
+                year = candidate.year + candidate.month // 12
+                candidate = candidate.replace(
+                    year=year, month=candidate.month % 12 + 1, day=1, hour=0, minute=0
+                )
+            elif not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"cron expression never fires: {self.expression!r}")
+
+    def __str__(self):
+        return self.expression
+
+
+def parse_schedule(spec):
+    """'every 15m' -> Interval, 5 velden -> Cron, 'off'/'' -> None."""
+    spec = (spec or "").strip().lower()
+    if spec in ("", "off"):
+        return None
+    match = INTERVAL_RE.match(spec)
+    if match:
+        return Interval(int(match.group(1)) * INTERVAL_UNITS[match.group(2)])
+    return Cron(spec)
+
+
+Job = namedtuple("Job", ["name", "schedule", "func"])
+
+
+# ---------------------------------------------------
+# LOCKS
+# ---------------------------------------------------
+def lock_key(job_name):
+    """Stabiele signed 64-bit sleutel voor pg_try_advisory_xact_lock."""
+    digest = hashlib.blake2b(f"scheduler:{job_name}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def process_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+@contextmanager
+def _advisory_lock(engine, job_name):
+    # Eigen verbinding met een open transactie zolang de job loopt; werkt ook
+    # achter pgbouncer in transaction mode (de verbinding blijft gekoppeld).
+    with engine.connect() as conn:
+        with conn.begin():
+            acquired = conn.execute(
+                text("SELECT pg_try_advisory_xact_lock(:key)"),
+                {"key": lock_key(job_name)},
+            ).scalar()
+            yield bool(acquired)
+
+
+@contextmanager
+def _lease_lock(engine, job_name, ttl):
+    owner = f"{process_id()}:{threading.get_ident()}"
+    now = datetime.now()
+    with engine.begin() as conn:
+        conn.execute(
+            delete(JobLock).where(JobLock.job_name == job_name, JobLock.expires_at < now)
+        )
+    try:
+        with engine.begin() as conn:
+            conn.execute(
+                insert(JobLock).values(
+                    job_name=job_name, owner=owner, expires_at=now + timedelta(seconds=ttl)
+                )
+            )
+    except IntegrityError:
+        yield False
+        return
+    try:
+        yield True
+    finally:
+        with engine.begin() as conn:
+            conn.execute(
+                delete(JobLock).where(JobLock.job_name == job_name, JobLock.owner == owner)
+            )
+
+
+def job_lock(job_name, ttl):
+    """Context manager die True/False oplevert: lock gekregen of niet."""
+    engine = db.engine
+    if engine.dialect.name == "postgresql":
+        return _advisory_lock(engine, job_name)
+    return _lease_lock(engine, job_name, ttl)
+
+
+# ---------------------------------------------------
+# RUN HISTORY
+# ---------------------------------------------------
+def last_started(job_name):
+    return db.session.execute(
+        select(func.max(JobRun.started_at)).where(JobRun.job_name == job_name)
+    ).scalar()
+
+
+def _start_run(job_name, started_at):
+    with db.engine.begin() as conn:
+        result = conn.execute(
+            insert(JobRun).values(
+                job_name=job_name, started_at=started_at, status="running", host=process_id()
+            )
+        )
+        return result.inserted_primary_key[0]
+
+
+def _finish_run(run_id, started, status, result=None, error=None):
+    finished_at = datetime.now()
+    with db.engine.begin() as conn:
+        conn.execute(
+            update(JobRun)
+            .where(JobRun.run_id == run_id)
+            .values(
+                finished_at=finished_at,
+                duration_ms=int((time.perf_counter() - started) * 1000),
+                status=status,
+                result=None if result is None else str(result)[:255],
+                error=error,
+            )
+        )
+
+
+def prune_history(days):
+    """Verwijder JobRun-rijen ouder dan `days` dagen. Geeft het aantal terug."""
+    cutoff = datetime.now() - timedelta(days=days)
+    deleted = JobRun.query.filter(JobRun.started_at < cutoff).delete(
+        synchronize_session=False
+    )
+    db.session.commit()
+    return deleted
+
+
+def run_job(app, job, force=False):
+    """
+    Draai `job` als hij due is en niemand anders hem draait.
+    Geeft de status terug: "success", "failed", "locked" of "not_due".
+    """
+    with app.app_context():
+        try:
+            with job_lock(job.name, app.config["SCHEDULER_LOCK_TTL"]) as acquired:
+                if not acquired:
+                    return "locked"
+                now = datetime.now()
+                last = last_started(job.name)
+                db.session.rollback()
+                if not force and last is not None and job.schedule.next_after(last) > now:
+                    # Een andere worker/node was ons voor
+                    return "not_due"
+
+                run_id = _start_run(job.name, now)
+                started = time.perf_counter()
+                try:
+                    result = job.func()
+                except Exception as e:
+                    db.session.rollback()
+                    _finish_run(run_id, started, "failed", error=traceback.format_exc())
+                    print(f"❌ Scheduler: job {job.name} failed: {e}")
+                    return "failed"
+                _finish_run(run_id, started, "success", result=result)
+                return "success"
+        finally:
+            db.session.remove()
+
+
+# ---------------------------------------------------
+# SCHEDULER LOOP
+# ---------------------------------------------------
+class Scheduler:
+    def __init__(self, app, jobs):
+        self.app = app
+        self.jobs = {job.name: job for job in jobs}
+        self.tick_seconds = app.config["SCHEDULER_TICK_SECONDS"]
+        self.max_workers = app.config["SCHEDULER_MAX_WORKERS"]
+        self._next_run = {}
+        self._running = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _plan(self, job, now):
+        """Volgende run op basis van de laatste run in de database."""
+        with self.app.app_context():
+            last = last_started(job.name)
+            db.session.remove()
+        if last is None:
+            # Interval-jobs meteen; cron-jobs op hun eerstvolgende tijdstip
+            return now if isinstance(job.schedule, Interval) else job.schedule.next_after(now)
+        return job.schedule.next_after(last)
+
+    def _plan_or_retry(self, job, now):
+        """_plan, maar een databasefout houdt de loop niet tegen: opnieuw bij de volgende tick."""
+        try:
+            return self._plan(job, now)
+        except Exception as e:
+            print(f"❌ Scheduler: planning {job.name} failed, retrying next tick: {e}")
+            return datetime.now() + timedelta(seconds=self.tick_seconds)
+
+    def _run_and_replan(self, job):
+        try:
+            run_job(self.app, job)
+        except Exception as e:
+            # De future wordt door niemand gelezen: hier loggen
+            print(f"❌ Scheduler: job {job.name} crashed: {e}")
+        finally:
+            # Eerst vrijgeven (met een voorlopige run bij de volgende tick), zodat
+            # een fout bij het plannen de job niet voorgoed in _running laat
+            with self._lock:
+                self._next_run[job.name] = datetime.now() + timedelta(seconds=self.tick_seconds)
+                self._running.discard(job.name)
+        next_run = self._plan_or_retry(job, datetime.now())
+        with self._lock:
+            # Lock bezet / net gedraaid elders: ten vroegste bij de volgende tick
+            self._next_run[job.name] = max(
+                next_run, datetime.now() + timedelta(seconds=1)
+            )
+
+    def run_pending(self, executor):
+        now = datetime.now()
+        with self._lock:
+            due = [
+                job
+                for name, job in self.jobs.items()
+                if name not in self._running and self._next_run[name] <= now
+            ]
+            self._running.update(job.name for job in due)
+        for job in due:
+            executor.submit(self._run_and_replan, job)
+
+    def seconds_until_next(self):
+        with self._lock:
+            pending = [
+                when for name, when in self._next_run.items() if name not in self._running
+            ]
+        if not pending:
+            return self.tick_seconds
+        wait = (min(pending) - datetime.now()).total_seconds()
+        return min(max(wait, 0.0), self.tick_seconds)
+
+    def run_forever(self):
+        now = datetime.now()
+        for job in self.jobs.values():
+            self._next_run[job.name] = self._plan_or_retry(job, now)
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="scheduler-job"
+        ) as executor:
+            while not self._stop.is_set():
+                self.run_pending(executor)
+                self._stop.wait(self.seconds_until_next())
+        # Het verlaten van de executor wacht op lopende jobs
+
+    def next_runs(self):
+        with self._lock:
+            return dict(self._next_run)
+
+    def start(self):
+        """Start de loop in een daemon-thread (in-process modus)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, name="scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+
+# ---------------------------------------------------
+# JOBS VAN DE APP
+# ---------------------------------------------------
+def _job_ai_queue():
+    from app.services.ai_queue import process_pending_analyses
+
+    done, failed = process_pending_analyses(limit=20)
+    return f"{done} done, {failed} failed"
+
+
+def _job_trends():
+    from app.services.trends import recompute_trends
+
+    return f"{recompute_trends()} papers ranked"
+
+
+def _job_related():
+    from app.services.related import update_neighbors
+
+    new, updated = update_neighbors()
+    return f"{new} new, {updated} updated"
+
+
+def _job_reviewer_profiles():
+    from app.services.reviewer_suggestions import refresh_profiles
+
+    return f"{refresh_profiles()} refreshed"
+
+
+def _job_digest():
+    from app.services.digest import run_digest
+
+    report = run_digest()
+    return f"{report.messages} mails, {report.papers} papers"
+
+
+def _job_prune_history():
+    from flask import current_app
+
+    deleted = prune_history(current_app.config["SCHEDULER_HISTORY_DAYS"])
+    return f"{deleted} runs pruned"
+
+
+def _job_storage_reconcile():
+    from app.services.reconcile import reconcile_storage
+
+    return reconcile_storage().summary()
+
+
+JOB_FUNCTIONS = {
+    "ai-queue": _job_ai_queue,
+    "trends": _job_trends,
+    "related": _job_related,
+    "reviewer-profiles": _job_reviewer_profiles,
+    "digest": _job_digest,
+    "scheduler-prune": _job_prune_history,
+    "storage-reconcile": _job_storage_reconcile,
+}
+
+
+def configured_jobs(config):
+    """Jobs volgens SCHEDULER_SCHEDULES (jobs op "off" vallen weg)."""
+    jobs = []
+    for name, spec in config["SCHEDULER_SCHEDULES"].items():
+        schedule = parse_schedule(spec)
+        if schedule is not None:
+            jobs.append(Job(name, schedule, JOB_FUNCTIONS[name]))
+    return jobs
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def init_scheduler(app):
+    """In-process modus: start de scheduler bij de eerste request van elke worker."""
+    if not app.config["SCHEDULER_IN_PROCESS"]:
+        return
+
+    @app.before_request
+    def _ensure_scheduler():
+        global _scheduler
+        if _scheduler is not None:
+            return
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = Scheduler(app, configured_jobs(app.config))
+                _scheduler.start()
+
+
+def shutdown_scheduler():
+    if _scheduler is not None:
+        _scheduler.stop()
+
+
+def reset_scheduler_after_fork():
+    """Het child start zonder de (niet meegeforkte) scheduler-thread van de parent."""
+    global _scheduler
+    _scheduler = None
@@ -0,0 +1,145 @@
+# app/services/storage.py
+"""
+Storage helpers (PDF's van papers).
+
+De client wordt één keer per proces aangemaakt en hergebruikt, zodat de
+onderliggende HTTP-verbindingen (keep-alive) gedeeld worden tussen requests
+en tussen de threads van bv. de bulk import.
+
+get_bucket() geeft de bucket volgens STORAGE_BACKEND: de Supabase bucket, of
+een LocalBucket (map op schijf, zelfde API) om lokaal en in tests zonder
+Supabase te werken.
+"""
+import os
+import threading
+from datetime import datetime, timezone
+
+from flask import current_app
+
+BUCKET_NAME = "paper-pdfs" # Zorg dat deze bucket bestaat in Supabase en 'Public' is
+# Max aantal keys per remove()-call
+REMOVE_BATCH = 1000
+
+_client = None
+_client_key = None
+_client_lock = threading.Lock()
+
+
+def get_supabase():
+    """Gedeelde Supabase client voor de huidige config (url + key)."""
+    global _client, _client_key
+    key = (current_app.config["SUPABASE_URL"], current_app.config["SUPABASE_KEY"])
+    if _client is None or _client_key != key:
+        with _client_lock:
+            if _client is None or _client_key != key:
+                # Lazy import: supabase (httpx, gotrue, ...) alleen laden als storage nodig is
+                from supabase import create_client
+
+                _client = create_client(*key)
+                _client_key = key
+    return _client
+
+
+def reset_client():
+    """Na een fork: de HTTP-verbindingen van de parent niet hergebruiken."""
+    global _client, _client_key
+    _client = None
+    _client_key = None
+
+
+class LocalBucket:
+    """
+    Bucket in een lokale map, met het deel van de Supabase bucket-API dat de
+    app gebruikt (upload, download, remove, list). Enkel platte keys (geen
+    mappen), zoals de keys die de app zelf aanmaakt.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, key):
+        if not key or key != os.path.basename(key) or key.startswith("."):
+            raise ValueError(f"Invalid storage key: {key!r}")
+        return os.path.join(self.directory, key)
+
+    def upload(self, path, file, file_options=None):
+        upsert = str((file_options or {}).get("upsert", "false")).lower() == "true"
+        os.makedirs(self.directory, exist_ok=True)
+        target = self._path(path)
+        # "x": net als Supabase een fout als de key al bestaat (tenzij upsert)
+        with open(target, "wb" if upsert else "xb") as fh:
+            fh.write(file)
+        return {"path": path, "Key": f"{BUCKET_NAME}/{path}"}
+
+    def download(self, path):
+        with open(self._path(path), "rb") as fh:
+            return fh.read()
+
+    def remove(self, paths):
+        removed = []
+        for key in paths:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                continue
+            removed.append({"name": key})
+        return removed
+
+    def list(self, path=None, options=None):
+        """Zoals Supabase: gesorteerd op naam, met limit/offset."""
+        options = options or {}
+        limit = options.get("limit", 100)
+        offset = options.get("offset", 0)
+        descending = (options.get("sortBy") or {}).get("order") == "desc"
+        try:
+            entries = [e for e in os.scandir(self.directory) if e.is_file()]
+        except FileNotFoundError:
+            return []
+        entries.sort(key=lambda e: e.name, reverse=descending)
+        items = []
+        for entry in entries[offset:offset + limit]:
+            stat = entry.stat()
+            stamp = datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat()
+            items.append(
+                {
+                    "name": entry.name,
+                    "id": entry.name,
+                    "created_at": stamp,
+                    "updated_at": stamp,
+                    "metadata": {"size": stat.st_size},
+                }
+            )
+        return items
+
+    def local_path(self, path):
+        return self._path(path)
+
+
+def get_bucket():
+    """Bucket voor de PDF's volgens STORAGE_BACKEND ("supabase" of "local")."""
+    backend = current_app.config["STORAGE_BACKEND"]
+    if backend == "local":
+        return LocalBucket(current_app.config["STORAGE_LOCAL_DIR"])
+    if backend == "supabase":
+        return get_supabase().storage.from_(BUCKET_NAME)
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
+
+
+def upload_pdf(bucket, path: str, content: bytes, upsert: bool = False):
+    """Upload PDF-bytes naar de bucket onder `path`."""
+    file_options = {"content-type": "application/pdf"}
+    if upsert:
+        file_options["upsert"] = "true"
+    return bucket.upload(
+        path=path,
+        file=content,
+        file_options=file_options,
+    )
+
+
+def remove_files(bucket, paths):
+    """Verwijder keys met zo weinig mogelijk remove()-calls. Geeft het aantal keys terug."""
+    paths = list(paths)
+    for start in range(0, len(paths), REMOVE_BATCH):
+        bucket.remove(paths[start:start + REMOVE_BATCH])
+    return len(paths)
@@ -0,0 +1,172 @@
+# app/services/trends.py
+"""
+Trending-ranking: periodieke job die PaperTrend volledig herberekent.
+
+Alle signalen worden set-based in SQL berekend over een schuivend venster
+van TREND_WINDOW_DAYS dagen, met een exponentieel verval per dag
+(halfwaardetijd TREND_HALF_LIFE_DAYS). De gewichten per dag komen uit een
+kleine afgeleide tabel (dag, gewicht), zodat er geen exp() in SQL nodig is
+(SQLite heeft die niet altijd).
+
+- review_momentum:   som van vervalgewichten van recente reviews
+- score_change:      gem. score laatste SCORE_CHANGE_DAYS dagen - gem. score daarvoor
+- interest_momentum: som van +1/-1 interest-toggles x vervalgewicht
+- view_momentum:     (views + VIEW_DOWNLOAD_WEIGHT x downloads) x vervalgewicht
+
+De dashboard-sort "trending" leest daarna enkel PaperTrend.trend_score (PK).
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, func, insert, literal, select, union_all
+
+from app.models import db, Review, InterestEvent, PaperStatDaily, PaperTrend
+
+TREND_WINDOW_DAYS = 30
+TREND_HALF_LIFE_DAYS = 7.0
+SCORE_CHANGE_DAYS = 14
+VIEW_DOWNLOAD_WEIGHT = 3
+
+W_REVIEWS = 1.0
+W_SCORE_CHANGE = 0.5
+W_INTEREST = 2.0
+W_VIEWS = 0.05
+
+
+def decay_table(today):
+    """(day, weight) voor elke dag in het venster: 1.0 vandaag, 0.5 na één halfwaardetijd."""
+    days = [
+        select(
+            literal(today - timedelta(days=age), type_=db.Date).label("day"),
+            literal(0.5 ** (age / TREND_HALF_LIFE_DAYS), type_=db.Float).label("weight"),
+        )
+        for age in range(TREND_WINDOW_DAYS)
+    ]
+    return union_all(*days).subquery("decay")
+
+
+def _zero():
+    return literal(0.0, type_=db.Float)
+
+
+def signal_queries(now):
+    """Eén SELECT per signaal, telkens (paper_id, r, s, i, v)."""
+    today = now.date()
+    window_start = datetime.combine(today - timedelta(days=TREND_WINDOW_DAYS - 1), datetime.min.time())
+    score_cutoff = datetime.combine(today - timedelta(days=SCORE_CHANGE_DAYS - 1), datetime.min.time())
+    decay = decay_table(today)
+
+    reviews = (
+        select(
+            Review.paper_id.label("paper_id"),
+            func.sum(decay.c.weight).label("r"),
+            _zero().label("s"),
+            _zero().label("i"),
+            _zero().label("v"),
+        )
+        .join(decay, func.date(Review.date_submitted) == decay.c.day)
+        .where(Review.date_submitted >= window_start)
+        .group_by(Review.paper_id)
+    )
+
+    # Enkel papers met recente reviews kunnen een score-verandering hebben
+    recently_reviewed = (
+        select(Review.paper_id)
+        .where(Review.date_submitted >= score_cutoff)
+        .distinct()
+    )
+    is_recent = Review.date_submitted >= score_cutoff
+    score_change = (
+        select(
+            Review.paper_id.label("paper_id"),
+            _zero().label("r"),
+            (
+                func.avg(case((is_recent, Review.score)))
+                - func.avg(case((~is_recent, Review.score)))
+            ).label("s"),
+            _zero().label("i"),
+            _zero().label("v"),
+        )
+        .where(Review.paper_id.in_(recently_reviewed), Review.score.isnot(None))
+        .group_by(Review.paper_id)
+    )
+
+    interests = (
+        select(
+            InterestEvent.paper_id.label("paper_id"),
+            _zero().label("r"),
+            _zero().label("s"),
+            func.sum(InterestEvent.delta * decay.c.weight).label("i"),
+            _zero().label("v"),
+        )
+        .join(decay, func.date(InterestEvent.created_at) == decay.c.day)
+        .where(InterestEvent.created_at >= window_start)
+        .group_by(InterestEvent.paper_id)
+    )
+
+    views = (
+        select(
+            PaperStatDaily.paper_id.label("paper_id"),
+            _zero().label("r"),
+            _zero().label("s"),
+            _zero().label("i"),
+            func.sum(
+                (PaperStatDaily.views + VIEW_DOWNLOAD_WEIGHT * PaperStatDaily.downloads)
+                * decay.c.weight
+            ).label("v"),
+        )
+        .join(decay, PaperStatDaily.day == decay.c.day)
+        .group_by(PaperStatDaily.paper_id)
+    )
+    return [reviews, score_change, interests, views]
+
+
+def trend_select(now):
+    signals = union_all(*signal_queries(now)).subquery("signals")
+    r = func.coalesce(func.sum(signals.c.r), 0)
+    s = func.coalesce(func.sum(signals.c.s), 0)
+    i = func.coalesce(func.sum(signals.c.i), 0)
+    v = func.coalesce(func.sum(signals.c.v), 0)
+    return (
+        select(
+            signals.c.paper_id,
+            (W_REVIEWS * r + W_SCORE_CHANGE * s + W_INTEREST * i + W_VIEWS * v),
+            r,
+            s,
+            i,
+            v,
+            literal(now, type_=db.DateTime),
+        )
+        .group_by(signals.c.paper_id)
+    )
+
+
+def recompute_trends(now=None):
+    """Vervang PaperTrend in één transactie. Geeft het aantal papers met een trend terug."""
+    now = now or datetime.now()
+    PaperTrend.query.delete(synchronize_session=False)
+    db.session.execute(
+        insert(PaperTrend.__table__).from_select(
+            [
+                "paper_id",
+                "trend_score",
+                "review_momentum",
+                "score_change",
+                "interest_momentum",
+                "view_momentum",
+                "computed_at",
+            ],
+            trend_select(now),
+        )
+    )
+    db.session.commit()
+    return db.session.query(func.count(PaperTrend.paper_id)).scalar()
+
+
+def trend_score_expr(paper_id_column):
+    """Opgeslagen trend_score voor een paper (PK lookup), 0 zonder trend."""
+    return func.coalesce(
+        select(PaperTrend.trend_score)
+        .where(PaperTrend.paper_id == paper_id_column)
+        .scalar_subquery(),
+        0,
+    )
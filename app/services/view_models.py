@@ -0,0 +1,55 @@
+# app/services/view_models.py
+"""
+View models voor lijstpagina's.
+
+Alles wat een kaart nodig heeft wordt één keer in Python voorbereid
+(facility-namen, aantal interesses, review-statistieken, datumlabel), zodat
+de templates enkel nog waarden tonen en niet per kaart filteren, relaties
+aflopen of dict-lookups doen.
+"""
+from collections import namedtuple
+
+PaperCard = namedtuple(
+    "PaperCard",
+    [
+        "paper_id",
+        "title",
+        "research_domain",
+        "upload_label",
+        "abstract_snippet",
+        "ai_status",
+        "ai_business_score",
+        "ai_academic_score",
+        "facilities",  # namen van de facility-companies
+        "interest_count",
+        "avg_score",  # afgerond op 1 decimaal, None zonder reviews
+        "review_count",
+        "interested",  # de company van de ingelogde user volgt deze paper
+    ],
+)
+
+
+def paper_card(paper, avg_score, review_count, interested_ids=frozenset()):
+    """PaperCard voor een Paper met geladen companies (+ company)."""
+    facilities = []
+    interest_count = 0
+    for link in paper.companies:
+        if link.relation_type == "facility":
+            facilities.append(link.company.name)
+        elif link.relation_type == "interest":
+            interest_count += 1
+    return PaperCard(
+        paper_id=paper.paper_id,
+        title=paper.title,
+        research_domain=paper.research_domain,
+        upload_label=paper.upload_date.strftime("%b %d, %Y") if paper.upload_date else "Unknown",
+        abstract_snippet=paper.abstract_snippet,
+        ai_status=paper.ai_status,
+        ai_business_score=paper.ai_business_score,
+        ai_academic_score=paper.ai_academic_score,
+        facilities=facilities,
+        interest_count=interest_count,
+        avg_score=round(float(avg_score), 1) if avg_score else None,
+        review_count=review_count or 0,
+        interested=paper.paper_id in interested_ids,
+    )
@@ -0,0 +1,60 @@
+# app/streaming.py
+"""
+Gestreamde HTML voor lange lijstpagina's.
+
+stream_page() rendert een template met stream_template: de browser krijgt
+de kop van de pagina (CSS, navigatie, filters, ...) al terwijl de lijst nog
+opgehaald en gerenderd wordt. Jinja levert veel kleine stukjes; die worden
+gebundeld tot STREAM_BUFFER_SIZE tekens, behalve op een `{{ stream_flush }}`
+in de template: daar gaat alles wat al gerenderd is meteen de deur uit.
+
+Let op: de response-headers (en de sessie-cookie) zijn al verstuurd als de
+template rendert. Flash messages worden daarom vooraf uit de sessie gehaald,
+en een fout tijdens het renderen breekt de pagina af i.p.v. een 500 te geven.
+"""
+from flask import Response, current_app, get_flashed_messages, render_template, stream_template
+from markupsafe import Markup
+
+# HTML-commentaar: onschadelijk als de pagina toch in één keer gerenderd wordt
+STREAM_FLUSH = Markup("<!-- flush -->")
+
+
+def buffered_chunks(chunks, size):
+    """Bundel template-stukjes tot ~size tekens; flush meteen op STREAM_FLUSH."""
+    buffer = []
+    length = 0
+    try:
+        for chunk in chunks:
+            if STREAM_FLUSH in chunk:
+                before, _, after = chunk.partition(STREAM_FLUSH)
+                buffer.append(before)
+                yield "".join(buffer)
+                buffer = [after]
+                length = len(after)
+                continue
+            buffer.append(chunk)
+            length += len(chunk)
+            if length >= size:
+                yield "".join(buffer)
+                buffer = []
+                length = 0
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+
+
+def stream_page(template_name, **context):
+    """Zoals render_template, maar als gestreamde response (STREAM_TEMPLATES)."""
+    config = current_app.config
+    if not config["STREAM_TEMPLATES"]:
+        return render_template(template_name, **context)
+    # Nu al uit de sessie halen: die wordt opgeslagen vóór de template rendert
+    get_flashed_messages()
+    chunks = stream_template(template_name, **context)
+    return Response(buffered_chunks(chunks, config["STREAM_BUFFER_SIZE"]), mimetype="text/html")
+
+
+def init_streaming(app):
+    app.jinja_env.globals["stream_flush"] = STREAM_FLUSH
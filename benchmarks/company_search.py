@@ -0,0 +1,66 @@
+# benchmarks/company_search.py
+"""
+Paper-formulieren met veel companies: grootte van /upload_paper en
+/papers/<id>, en de vroegere Company.query.order_by(name).all() tegenover
+een /companies/search request (met lege en met warme prefix-cache).
+
+    python -m benchmarks.company_search --companies 20000 --repeat 20
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.seed import make_app, seed
+
+PREFIXES = ["c", "co", "com", "company 01", "company 123"]
+
+
+def median_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="company type-ahead vs full company lists")
+    parser.add_argument("--companies", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    app, _ = make_app()
+    counts = seed(app, papers=200, reviews_per_paper=1, users=50,
+                  companies=args.companies, abstract_words=20, review_words=0)
+    print(f"seeded: {counts}")
+    app.config["COUNTERS_ENABLED"] = False
+
+    from app.models import Company
+    from app.services.company_search import invalidate_company_search
+
+    client = app.test_client()
+    with client.session_transaction() as flask_session:
+        flask_session.update({"user_id": 4, "user_role": "Researcher"})
+    for url in ("/upload_paper", "/papers/1"):
+        print(f"{url:<28} {len(client.get(url).data):12,d} bytes")
+
+    with app.app_context():
+        full = median_ms(lambda: Company.query.order_by(Company.name).all(), args.repeat)
+    print(f"{'full company list (old)':<28} {full:9.2f} ms")
+
+    for prefix in PREFIXES:
+        url = f"/companies/search?prefix={prefix}"
+
+        def cold():
+            invalidate_company_search()
+            client.get(url)
+
+        cold_ms = median_ms(cold, args.repeat)
+        warm_ms = median_ms(lambda: client.get(url), args.repeat)
+        size = len(client.get(url).data)
+        print(f"search {prefix!r:<21} {cold_ms:9.2f} ms cold {warm_ms:9.2f} ms cached  {size:6,d} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+# benchmarks/delay_app.py
+"""WSGI wrapper rond run:app die per request een I/O-wachttijd simuleert (BENCH_IO_DELAY_MS)."""
+import os
+import time
+
+from run import app as flask_app
+
+_delay = float(os.environ.get("BENCH_IO_DELAY_MS", "0")) / 1000
+
+
+def app(environ, start_response):
+    if _delay:
+        time.sleep(_delay)
+    return flask_app(environ, start_response)
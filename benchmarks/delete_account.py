@@ -0,0 +1,142 @@
+# benchmarks/delete_account.py
+"""
+Account verwijderen voor een user met duizenden papers en reviews:
+delete_user (ON DELETE CASCADE + één batch storage-remove) tegenover de
+vroegere ORM-cascade, die elke collectie per paper laadde en één DELETE per
+rij stuurde. PDF's staan in een LocalBucket in een tijdelijke map.
+
+    python -m benchmarks.delete_account --papers 5000 --reviews-per-paper 5
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.seed import make_app, seed
+
+
+class CountingBucket:
+    """LocalBucket die remove()-calls telt."""
+
+    def __init__(self, bucket):
+        self.bucket = bucket
+        self.remove_calls = 0
+
+    def remove(self, paths):
+        self.remove_calls += 1
+        return self.bucket.remove(paths)
+
+
+def add_heavy_user(db, bucket, user_id, papers, reviews_per_paper, own_reviews, others):
+    """User met `papers` papers (met reviews, koppelingen, klachten) en eigen reviews."""
+    from sqlalchemy import func, insert, select
+    from app.models import User, Paper, Review, PaperCompany, Complaint
+
+    db.session.execute(
+        insert(User.__table__),
+        [{"user_id": user_id, "name": f"Heavy {user_id}", "email": f"heavy{user_id}@example.org",
+          "role": "Researcher"}],
+    )
+    first = (db.session.execute(select(func.max(Paper.paper_id))).scalar() or 0) + 1
+    paper_ids = range(first, first + papers)
+    db.session.execute(
+        insert(Paper.__table__),
+        [
+            {"paper_id": pid, "user_id": user_id, "title": f"Heavy paper {pid}",
+             "abstract": "text", "research_domain": "AI",
+             "file_path": f"heavy_{pid}.pdf", "ai_status": "done"}
+            for pid in paper_ids
+        ],
+    )
+    db.session.execute(
+        insert(PaperCompany.__table__),
+        [{"paper_id": pid, "company_id": 1, "relation_type": "facility"} for pid in paper_ids],
+    )
+    db.session.execute(
+        insert(Complaint.__table__),
+        [{"paper_id": pid, "category": "General", "description": "x"} for pid in paper_ids[::10]],
+    )
+    db.session.execute(
+        insert(Review.__table__),
+        [
+            {"paper_id": pid, "reviewer_id": 1 + (pid + n) % others, "score": 5.0}
+            for pid in paper_ids
+            for n in range(reviews_per_paper)
+        ]
+        + [
+            {"paper_id": 1 + n % others, "reviewer_id": user_id, "score": 7.0}
+            for n in range(own_reviews)
+        ],
+    )
+    db.session.commit()
+    for pid in paper_ids:
+        bucket.upload(f"heavy_{pid}.pdf", b"%PDF-1.4")
+
+
+def orm_cascade_delete(db, user):
+    """Zoals vóór passive_deletes: alle kinderen laden, dan één DELETE per rij."""
+    for paper in user.papers:
+        paper.reviews, paper.companies, paper.complaints
+    user.reviews
+    db.session.delete(user)
+    db.session.commit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="account deletion runtime")
+    parser.add_argument("--papers", type=int, default=5000)
+    parser.add_argument("--reviews-per-paper", type=int, default=5)
+    parser.add_argument("--own-reviews", type=int, default=2000)
+    parser.add_argument("--background-papers", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    app, _ = make_app()
+    counts = seed(app, papers=args.background_papers, reviews_per_paper=3, users=500,
+                  abstract_words=10, review_words=0)
+    print(f"seeded: {counts}")
+
+    from sqlalchemy import event, func, select
+    from app.models import db, User, Paper, Review
+    from app.services.accounts import delete_user
+    from app.services.storage import LocalBucket
+
+    with tempfile.TemporaryDirectory() as tmp, app.app_context():
+        bucket = LocalBucket(tmp)
+        add_heavy_user(db, bucket, 100001, args.papers, args.reviews_per_paper,
+                       args.own_reviews, counts["users"])
+        add_heavy_user(db, bucket, 100002, args.papers, args.reviews_per_paper,
+                       args.own_reviews, counts["users"])
+
+        statements = []
+        engine = db.engine
+        listener = lambda *a: statements.append(1)
+        event.listen(engine, "before_cursor_execute", listener)
+
+        def measure(label, func_):
+            statements.clear()
+            start = time.perf_counter()
+            result = func_()
+            elapsed = time.perf_counter() - start
+            print(f"{label:<26} {elapsed * 1000:9.1f} ms  {len(statements):6d} statements  {result}")
+
+        rows = lambda: (
+            db.session.scalar(select(func.count()).select_from(Paper)),
+            db.session.scalar(select(func.count()).select_from(Review)),
+        )
+        print(f"before: papers, reviews = {rows()}")
+
+        measure("ORM cascade (old)", lambda: orm_cascade_delete(db, db.session.get(User, 100001)))
+        db.session.expunge_all()
+
+        counting = CountingBucket(bucket)
+        measure(
+            "delete_user (passive)",
+            lambda: f"{delete_user(db.session.get(User, 100002), bucket=counting)} files, "
+            f"{counting.remove_calls} remove call(s)",
+        )
+        event.remove(engine, "before_cursor_execute", listener)
+        print(f"after:  papers, reviews = {rows()}  files left: {len(os.listdir(tmp))}")
+
+
+if __name__ == "__main__":
+    main()
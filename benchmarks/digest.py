@@ -0,0 +1,117 @@
+# benchmarks/digest.py
+"""
+Looptijd van de interest-digest (run_digest) voor ~10k companies, met een
+in-memory mailer (enkel query + render) en met de FileMailer (.eml naar een
+tijdelijke map). Ter vergelijking: per company de /profile-query.
+
+    python -m benchmarks.digest --companies 10000 --papers 20000
+"""
+import argparse
+import tempfile
+import time
+
+from benchmarks.seed import make_app, seed
+
+
+class MemoryMailer:
+    """Houdt berichten enkel bij (meet query + render zonder I/O)."""
+
+    def __init__(self):
+        self.messages = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def send_many(self, messages):
+        self.messages.extend(messages)
+        return len(messages)
+
+
+def naive_digest(db, company_ids, since):
+    """Zoals get_profile_data: per company een query op zijn domeinen."""
+    from app.models import Company, Paper, parse_interests
+
+    for company_id in company_ids:
+        company = db.session.get(Company, company_id)
+        tags = parse_interests(company.interests)
+        (
+            Paper.query.filter(
+                Paper.research_domain.in_(tags), Paper.upload_date > since
+            )
+            .order_by(Paper.upload_date.desc())
+            .limit(10)
+            .all()
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="interest digest runtime")
+    parser.add_argument("--companies", type=int, default=10000)
+    parser.add_argument("--papers", type=int, default=20000)
+    parser.add_argument("--naive-companies", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    app, _ = make_app()
+    counts = seed(
+        app,
+        papers=args.papers,
+        reviews_per_paper=0,
+        # rol Company voor 1 op 4 users: ~1 ontvanger per company
+        users=args.companies * 4,
+        companies=args.companies,
+        abstract_words=40,
+    )
+    print(f"seeded: {counts}")
+
+    from datetime import datetime, timedelta
+    from app.models import db, Company
+    from app.services.digest import run_digest
+    from app.services.mailer import FileMailer
+
+    def reset():
+        Company.query.update({Company.last_digest_at: None})
+        db.session.commit()
+
+    with app.app_context():
+        memory = MemoryMailer()
+        start = time.perf_counter()
+        report = run_digest(mailer=memory)
+        elapsed = time.perf_counter() - start
+        print(
+            f"run_digest (memory)      {report.messages} mails / {report.companies} companies  "
+            f"{elapsed:7.2f} s"
+        )
+
+        reset()
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            report = run_digest(mailer=FileMailer(tmp, app.config["MAIL_DEFAULT_SENDER"]))
+            elapsed = time.perf_counter() - start
+            print(
+                f"run_digest (file)        {report.messages} mails, {report.papers} papers  "
+                f"{elapsed:7.2f} s"
+            )
+
+        start = time.perf_counter()
+        report = run_digest(mailer=MemoryMailer())
+        print(
+            f"second run (nothing new) {report.messages} mails  "
+            f"{time.perf_counter() - start:7.2f} s"
+        )
+
+        since = datetime.now() - timedelta(days=app.config["DIGEST_FIRST_WINDOW_DAYS"])
+        ids = list(range(1, min(args.naive_companies, args.companies) + 1))
+        start = time.perf_counter()
+        naive_digest(db, ids, since)
+        elapsed = time.perf_counter() - start
+        print(
+            f"naive per-company query  {len(ids)} companies  {elapsed:7.2f} s  "
+            f"(~{elapsed * args.companies / len(ids):.1f} s for all, queries only)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/list_columns.py
+"""
+Geheugen en "bytes over de lijn" voor lijstweergaves: volledige Paper-rijen
+vs. het PAPER_LIST_COLUMNS profiel (abstract_snippet i.p.v. abstract/ai_*).
+
+    python -m benchmarks.list_columns --papers 2000 --abstract-words 1500
+"""
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.seed import make_app, seed
+
+
+def loaded_bytes(papers):
+    """Som van de geladen kolomwaarden (benadering van wat de DB verstuurt)."""
+    total = 0
+    for paper in papers:
+        for key, value in paper.__dict__.items():
+            if not key.startswith("_") and value is not None:
+                total += len(str(value).encode("utf-8"))
+    return total
+
+
+def measure(db, build_query):
+    db.session.expunge_all()
+    tracemalloc.start()
+    start = time.perf_counter()
+    papers = build_query().all()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, loaded_bytes(papers), len(papers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="full rows vs list column profile")
+    parser.add_argument("--papers", type=int, default=2000)
+    parser.add_argument("--abstract-words", type=int, default=1500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    app, _ = make_app()
+    seed(app, papers=args.papers, reviews_per_paper=0, abstract_words=args.abstract_words)
+
+    from app.models import db, Paper
+    from app.routes import paper_list_columns
+
+    scenarios = [
+        ("full rows", lambda: Paper.query.order_by(Paper.upload_date.desc())),
+        (
+            "list profile",
+            lambda: Paper.query.options(paper_list_columns()).order_by(
+                Paper.upload_date.desc()
+            ),
+        ),
+    ]
+
+    with app.app_context():
+        results = {}
+        for name, build_query in scenarios:
+            runs = [measure(db, build_query) for _ in range(args.repeat)]
+            results[name] = min(runs)
+            elapsed, peak, size, count = results[name]
+            print(
+                f"{name:13s} {count} rows  {elapsed * 1000:8.1f} ms  "
+                f"peak {peak / 1e6:7.1f} MB  payload {size / 1e6:7.1f} MB"
+            )
+
+        full, slim = results["full rows"], results["list profile"]
+        print(
+            f"list profile moves {slim[2] / full[2]:.1%} of the bytes "
+            f"and peaks at {slim[1] / full[1]:.1%} of the memory"
+        )
+
+
+if __name__ == "__main__":
+    main()
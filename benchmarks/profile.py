@@ -0,0 +1,85 @@
+# benchmarks/profile.py
+"""
+/profile voor een reviewer met een groeiende geschiedenis: aantal queries en
+responstijd per grootte. Met paginering per sectie (PROFILE_PAGE_SIZE) en
+selectinload moet het aantal queries gelijk blijven.
+
+    python -m benchmarks.profile --reviews 10 100 1000 5000 --repeat 5
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.seed import make_app, seed
+
+HEAVY_ID = 900002
+
+
+def add_reviews(db, reviewer_id, count, papers):
+    from sqlalchemy import insert
+    from app.models import Review
+
+    db.session.execute(
+        insert(Review.__table__),
+        [
+            {"paper_id": 1 + n % papers, "reviewer_id": reviewer_id,
+             "score": n % 10, "comments": f"review {n}"}
+            for n in range(count)
+        ],
+    )
+    db.session.commit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="profile page vs review history size")
+    parser.add_argument("--papers", type=int, default=2000)
+    parser.add_argument("--reviews", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    app, _ = make_app()
+    counts = seed(app, papers=args.papers, reviews_per_paper=1, users=100,
+                  companies=20, abstract_words=30, review_words=0)
+    print(f"seeded: {counts}")
+    app.config["COUNTERS_ENABLED"] = False
+
+    from sqlalchemy import event, insert
+    from app.models import db, User
+
+    statements = [0]
+
+    def count(*_):
+        statements[0] += 1
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", count)
+
+    client = app.test_client()
+    print(f"{'reviews':>8} {'queries':>8} {'median':>10}")
+    for target in sorted(args.reviews):
+        reviewer_id = HEAVY_ID + target
+        with app.app_context():
+            db.session.execute(
+                insert(User.__table__),
+                [{"user_id": reviewer_id, "name": f"Reviewer {target}",
+                  "email": f"reviewer{target}@example.org", "role": "Reviewer"}],
+            )
+            add_reviews(db, reviewer_id, target, args.papers)
+        with client.session_transaction() as flask_session:
+            flask_session.clear()
+            flask_session.update({"user_id": reviewer_id, "user_role": "Reviewer"})
+
+        client.get("/profile")  # opwarmen
+        timings = []
+        for _ in range(args.repeat):
+            statements[0] = 0
+            start = time.perf_counter()
+            response = client.get("/profile?reviews_page=2")
+            timings.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                raise RuntimeError(f"/profile: HTTP {response.status_code}")
+        print(f"{target:8d} {statements[0]:8d} {statistics.median(timings):8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# benchmarks/reviewer_suggestions.py
+"""
+Latency van suggest_reviewers() met ~10k kandidaat-reviewers, vergeleken
+met een naïeve aanpak die per request Review x Paper aggregeert en in Python
+scoort.
+
+    python -m benchmarks.reviewer_suggestions --users 14000 --papers 5000 --reviews-per-paper 10
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime
+
+from benchmarks.seed import make_app, seed
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+def naive_suggest(db, paper, limit):
+    """Zonder profielen: aggregeren + scoren per request."""
+    from sqlalchemy import func
+    from app.models import User, Review, Paper, PaperCompany
+    from app.services.reviewer_suggestions import CANDIDATE_ROLES
+
+    stats = {
+        row.reviewer_id: row
+        for row in db.session.query(
+            Review.reviewer_id,
+            func.count(Review.review_id).label("total"),
+            func.sum(
+                func.cast(Paper.research_domain == paper.research_domain, db.Integer)
+            ).label("in_domain"),
+            func.max(Review.date_submitted).label("last"),
+        )
+        .join(Paper, Paper.paper_id == Review.paper_id)
+        .group_by(Review.reviewer_id)
+    }
+    facility_ids = {
+        row.company_id
+        for row in db.session.query(PaperCompany.company_id).filter_by(
+            paper_id=paper.paper_id, relation_type="facility"
+        )
+    }
+    now = datetime.now()
+    scored = []
+    for user in db.session.query(User.user_id, User.company_id).filter(
+        User.role.in_(CANDIDATE_ROLES)
+    ):
+        if user.user_id == paper.user_id or user.company_id in facility_ids:
+            continue
+        row = stats.get(user.user_id)
+        if row is None:
+            scored.append((0.0, user.user_id))
+            continue
+        days = (now - row.last).days if row.last else 365
+        scored.append((row.in_domain + 0.3 * 0.5 ** (days / 90), user.user_id))
+    scored.sort(reverse=True)
+    return scored[:limit]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="reviewer suggestion latency")
+    parser.add_argument("--users", type=int, default=14000)
+    parser.add_argument("--papers", type=int, default=5000)
+    parser.add_argument("--reviews-per-paper", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--naive-queries", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    app, _ = make_app()
+    counts = seed(
+        app,
+        papers=args.papers,
+        reviews_per_paper=args.reviews_per_paper,
+        users=args.users,
+        abstract_words=20,
+    )
+
+    from app.models import db, Paper
+    from app.services.reviewer_suggestions import (
+        refresh_profiles,
+        get_reviewer_matrix,
+        invalidate_reviewer_matrix,
+        suggest_reviewers,
+    )
+
+    with app.app_context():
+        start = time.perf_counter()
+        refreshed = refresh_profiles(full=True)
+        print(f"full profile refresh     {refreshed} reviewers  {time.perf_counter() - start:8.3f} s")
+
+        invalidate_reviewer_matrix()
+        start = time.perf_counter()
+        matrix = get_reviewer_matrix()
+        print(f"matrix build             {len(matrix)} reviewers  {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+        papers = Paper.query.limit(args.queries).all()
+        timings = []
+        for paper in papers:
+            start = time.perf_counter()
+            suggest_reviewers(paper)
+            timings.append((time.perf_counter() - start) * 1000)
+        print(
+            f"suggest_reviewers        p50 {statistics.median(timings):6.2f} ms  "
+            f"p95 {percentile(timings, 0.95):6.2f} ms  ({len(timings)} papers)"
+        )
+
+        naive = []
+        for paper in papers[: args.naive_queries]:
+            start = time.perf_counter()
+            naive_suggest(db, paper, 10)
+            naive.append((time.perf_counter() - start) * 1000)
+        print(
+            f"naive per-request        p50 {statistics.median(naive):6.2f} ms  "
+            f"({len(naive)} papers)"
+        )
+
+        # Incrementeel: één reviewer na een nieuwe review
+        reviewer_id = matrix.user_ids[0].item()
+        start = time.perf_counter()
+        refresh_profiles([reviewer_id])
+        print(f"incremental refresh      1 reviewer  {(time.perf_counter() - start) * 1000:8.1f} ms")
+        print(f"seeded: {counts}")
+
+
+if __name__ == "__main__":
+    main()
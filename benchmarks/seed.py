@@ -0,0 +1,160 @@
+# benchmarks/seed.py
+"""
+Gedeelde helpers voor de benchmarks: een app op een tijdelijke SQLite
+database en een deterministische seed met papers, reviews, enz.
+
+Let op: Config leest DATABASE_URL bij het importeren van app.config, dus
+roep make_app() aan vóór iets anders uit `app` geïmporteerd wordt.
+"""
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta
+
+INSERT_CHUNK = 50000
+
+DOMAINS = ["AI", "Robotics", "Software", "Biotech", "Health", "Energy"]
+WORDS = (
+    "model data learning network robust scalable analysis method results "
+    "experiment sensor control system graph optimisation inference protein "
+    "energy grid battery clinical trial software testing compiler"
+).split()
+
+
+def make_app(db_url=None):
+    """create_app() op `db_url` (default: nieuwe tijdelijke SQLite file)."""
+    if db_url is None:
+        fd, path = tempfile.mkstemp(prefix="reviewr_bench_", suffix=".db")
+        os.close(fd)
+        db_url = f"sqlite:///{path}"
+    os.environ["DATABASE_URL"] = db_url
+
+    from app import create_app
+    from app.models import db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    return app, db_url
+
+
+def _text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def seed(
+    app,
+    papers=1000,
+    reviews_per_paper=3,
+    users=200,
+    companies=50,
+    abstract_words=120,
+    seed_value=42,
+    review_words=30,
+):
+    """Vul de database met bulk inserts; geeft een dict met aantallen terug."""
+    from sqlalchemy import insert
+    from app.models import (
+        db, User, Company, CompanyInterest, Paper, Review, PaperCompany,
+        make_abstract_snippet, make_ai_total_score, parse_interests,
+    )
+
+    rng = random.Random(seed_value)
+    now = datetime.now()
+
+    with app.app_context():
+        company_rows = [
+            {
+                "company_id": i,
+                "name": f"Company {i:04d}",
+                "industry": rng.choice(DOMAINS),
+                "interests": ",".join(rng.sample(DOMAINS, 2)),
+            }
+            for i in range(1, companies + 1)
+        ]
+        db.session.execute(insert(Company.__table__), company_rows)
+        # Core inserts slaan de @validates over: CompanyInterest zelf vullen
+        db.session.execute(
+            insert(CompanyInterest.__table__),
+            [
+                {"company_id": row["company_id"], "research_domain": tag}
+                for row in company_rows
+                for tag in parse_interests(row["interests"])
+            ],
+        )
+        roles = ["Researcher", "Reviewer", "Reviewer", "Company"]
+        user_rows = []
+        for i in range(1, users + 1):
+            role = roles[i % len(roles)]
+            user_rows.append({
+                "user_id": i,
+                "name": f"User {i:05d}",
+                "email": f"user{i}@example.org",
+                "role": role,
+                "company_id": rng.randint(1, companies) if role == "Company" else None,
+            })
+        db.session.execute(insert(User.__table__), user_rows)
+
+        paper_rows, link_rows, review_rows = [], [], []
+        review_id = 1
+
+        def flush_rows():
+            # Papers vóór hun reviews (FK); in chunks zodat 1M reviews niet in RAM moeten
+            if paper_rows:
+                db.session.execute(insert(Paper.__table__), paper_rows)
+                db.session.execute(insert(PaperCompany.__table__), link_rows)
+                paper_rows.clear()
+                link_rows.clear()
+            if review_rows:
+                db.session.execute(insert(Review.__table__), review_rows)
+                review_rows.clear()
+
+        for pid in range(1, papers + 1):
+            done = rng.random() < 0.7
+            abstract = _text(rng, abstract_words)
+            business = rng.randint(0, 10) if done else None
+            academic = rng.randint(0, 10) if done else None
+            paper_rows.append({
+                "paper_id": pid,
+                "user_id": rng.randint(1, users),
+                "title": f"Paper {pid}: {_text(rng, 6)}",
+                "abstract": abstract,
+                "abstract_snippet": make_abstract_snippet(abstract),
+                "research_domain": rng.choice(DOMAINS),
+                "upload_date": now - timedelta(days=rng.randint(0, 365)),
+                "file_path": f"bench_{pid}.pdf",
+                "ai_status": "done" if done else "pending",
+                "ai_business_score": business,
+                "ai_academic_score": academic,
+                "ai_total_score": make_ai_total_score(business, academic),
+                "ai_summary": _text(rng, abstract_words // 2) if done else None,
+                "ai_strengths": _text(rng, 40) if done else None,
+                "ai_weaknesses": _text(rng, 40) if done else None,
+            })
+            link_rows.append({
+                "paper_id": pid,
+                "company_id": rng.randint(1, companies),
+                "relation_type": "facility",
+            })
+            for _ in range(reviews_per_paper):
+                review_rows.append({
+                    "review_id": review_id,
+                    "paper_id": pid,
+                    "reviewer_id": rng.randint(1, users),
+                    "score": round(rng.uniform(0, 10), 1),
+                    "comments": _text(rng, review_words) if review_words else None,
+                    "date_submitted": now - timedelta(days=rng.randint(0, 365)),
+                })
+                review_id += 1
+            if len(review_rows) >= INSERT_CHUNK:
+                flush_rows()
+
+        flush_rows()
+        db.session.commit()
+
+    return {
+        "users": users,
+        "companies": companies,
+        "papers": papers,
+        "reviews": review_id - 1,
+    }
@@ -0,0 +1,106 @@
+# benchmarks/startup.py
+"""
+Cold-start budget voor create_app().
+
+Start een verse Python met `-X importtime`, bouwt de app en meet:
+  - totale import-tijd (som van de 'self' tijden)
+  - wall-clock tijd van import + create_app()
+  - max RSS van het proces
+en controleert dat de zware SDK's (supabase, pypdf, google.generativeai,
+grpc) NIET geladen zijn.
+
+Gebruik (exit code 1 als het budget overschreden wordt):
+    python -m benchmarks.startup --max-ms 1500 --max-rss-mb 120
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = ["supabase", "pypdf", "google.generativeai", "grpc", "google.protobuf"]
+
+CHILD_SCRIPT = """
+import json, resource, sys, time
+start = time.perf_counter()
+from app import create_app
+create_app()
+elapsed_ms = (time.perf_counter() - start) * 1000
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == "darwin":
+    rss //= 1024  # bytes -> KiB
+print(json.dumps({
+    "elapsed_ms": elapsed_ms,
+    "max_rss_kb": rss,
+    "heavy_loaded": [m for m in %r if m in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def parse_importtime(stderr):
+    """Geef (totaal_self_us, [(cumulatief_us, module)]) terug."""
+    total_self = 0
+    cumulative = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        total_self += int(self_us)
+        cumulative.append((int(cum_us), name.strip()))
+    return total_self, cumulative
+
+
+def measure():
+    env = dict(os.environ)
+    # Geen netwerk nodig: create_app() maakt enkel de engine aan
+    env.setdefault("DATABASE_URL", "sqlite://")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD_SCRIPT],
+        cwd=root,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"create_app() failed:\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    total_self_us, cumulative = parse_importtime(proc.stderr)
+    result["import_ms"] = total_self_us / 1000
+    result["slowest_imports"] = sorted(cumulative, reverse=True)[:10]
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--max-ms", type=float, default=1500, help="budget voor import + create_app()")
+    parser.add_argument("--max-rss-mb", type=float, default=120, help="budget voor max RSS")
+    parser.add_argument("--runs", type=int, default=3, help="neem de beste van N runs")
+    args = parser.parse_args(argv)
+
+    runs = [measure() for _ in range(args.runs)]
+    best = min(runs, key=lambda r: r["elapsed_ms"])
+    rss_mb = max(r["max_rss_kb"] for r in runs) / 1024
+
+    print(f"create_app():   {best['elapsed_ms']:.0f} ms (budget {args.max_ms:.0f} ms)")
+    print(f"imports (self): {best['import_ms']:.0f} ms")
+    print(f"max RSS:        {rss_mb:.1f} MB (budget {args.max_rss_mb:.0f} MB)")
+    print("slowest imports (cumulative):")
+    for cum_us, name in best["slowest_imports"]:
+        print(f"  {cum_us / 1000:8.1f} ms  {name}")
+
+    failures = []
+    if best["elapsed_ms"] > args.max_ms:
+        failures.append("create_app() is over the time budget")
+    if rss_mb > args.max_rss_mb:
+        failures.append("RSS is over the memory budget")
+    if best["heavy_loaded"]:
+        failures.append(f"heavy SDKs imported eagerly: {', '.join(best['heavy_loaded'])}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
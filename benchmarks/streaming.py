@@ -0,0 +1,86 @@
+# benchmarks/streaming.py
+"""
+Time-to-first-byte en bytes over de lijn voor /dashboard: de vroegere
+render_template zonder compressie tegenover stream_page met gzip (en
+brotli als het Brotli package geïnstalleerd is). De app draait in een
+echte (threaded) werkzeug server; de client is http.client.
+
+    python -m benchmarks.streaming --papers 3000 --repeat 5
+"""
+import argparse
+import http.client
+import logging
+import statistics
+import threading
+import time
+
+from benchmarks.seed import make_app, seed
+
+
+def fetch(port, path, accept_encoding):
+    """(ms tot de eerste body-bytes, ms totaal, body bytes zoals verstuurd)."""
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    headers = {"Accept-Encoding": accept_encoding} if accept_encoding else {}
+    start = time.perf_counter()
+    conn.request("GET", path, headers=headers)
+    response = conn.getresponse()
+    first = response.read1(65536)
+    ttfb = time.perf_counter() - start
+    size = len(first)
+    while True:
+        chunk = response.read1(65536)
+        if not chunk:
+            break
+        size += len(chunk)
+    total = time.perf_counter() - start
+    encoding = response.getheader("Content-Encoding") or "identity"
+    conn.close()
+    return ttfb * 1000, total * 1000, size, encoding
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="dashboard TTFB and transfer size")
+    parser.add_argument("--papers", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--path", default="/dashboard")
+    args = parser.parse_args(argv)
+
+    app, _ = make_app()
+    counts = seed(app, papers=args.papers, reviews_per_paper=3, users=300,
+                  companies=60, abstract_words=60, review_words=0)
+    print(f"seeded: {counts}")
+    app.config["COUNTERS_ENABLED"] = False
+
+    from werkzeug.serving import make_server
+    from app.compression import choose_encoding
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)  # geen access log
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_port
+
+    modes = [
+        ("render_template, identity", False, None),
+        ("stream_page, identity", True, None),
+        ("render_template, gzip", False, "gzip"),
+        ("stream_page, gzip", True, "gzip"),
+    ]
+    if choose_encoding("br") == "br":
+        modes.append(("stream_page, br", True, "br"))
+
+    print(f"{'mode':<28} {'TTFB':>10} {'total':>10} {'bytes':>12}")
+    try:
+        for label, streaming, accept in modes:
+            app.config["STREAM_TEMPLATES"] = streaming
+            fetch(port, args.path, accept)  # opwarmen
+            results = [fetch(port, args.path, accept) for _ in range(args.repeat)]
+            ttfb = statistics.median(r[0] for r in results)
+            total = statistics.median(r[1] for r in results)
+            size, encoding = results[-1][2], results[-1][3]
+            print(f"{label:<28} {ttfb:8.1f}ms {total:8.1f}ms {size:12,d}  ({encoding})")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
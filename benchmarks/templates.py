@@ -0,0 +1,167 @@
+# benchmarks/templates.py
+"""
+Rendertijd per template, met contexten uit een geseede database: elke pagina
+wordt via de test client opgevraagd en de tijd tussen de Flask-signalen
+before_render_template en template_rendered telt als rendertijd (zonder de
+queries van de view). Daarnaast: compileren van alle templates zonder en met
+de Jinja bytecode cache.
+
+    python -m benchmarks.templates --papers 5000 --repeat 5 --max-ms 250
+
+Met --max-ms faalt de run (exit code 1) als de mediaan van een template
+boven het budget zit, zodat regressies in templates opvallen.
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+from benchmarks.seed import make_app, seed
+
+ADMIN_ID = 900001
+
+
+def pages(paper_id, company_user_id, researcher_id):
+    """(label, sessie, url) per pagina; sessie None = anoniem."""
+    admin = {"user_id": ADMIN_ID, "user_role": "System/Admin"}
+    company = {"user_id": company_user_id, "user_role": "Company"}
+    researcher = {"user_id": researcher_id, "user_role": "Researcher"}
+    return [
+        ("home", None, "/"),
+        ("dashboard", company, "/dashboard"),
+        ("dashboard (filtered)", researcher, "/dashboard?domain=AI&sort=best"),
+        ("paper_detail", researcher, f"/papers/{paper_id}"),
+        ("suggest_reviewers", admin, f"/papers/{paper_id}/suggest_reviewers"),
+        ("complaint_queue", admin, "/admin/complaints"),
+        ("list_companies", researcher, "/companies"),
+        ("profile", researcher, "/profile"),
+        ("stats", researcher, "/stats"),
+        ("upload_paper", researcher, "/upload_paper"),
+        ("login", None, "/login"),
+        ("register", None, "/register"),
+    ]
+
+
+def add_admin_and_complaints(db, papers, complaints):
+    from sqlalchemy import insert
+    from app.models import User, Complaint
+
+    db.session.execute(
+        insert(User.__table__),
+        [{"user_id": ADMIN_ID, "name": "Admin", "email": "admin@example.org",
+          "role": "System/Admin"}],
+    )
+    db.session.execute(
+        insert(Complaint.__table__),
+        [
+            {"paper_id": 1 + (n * 7) % papers, "category": "General",
+             "description": f"complaint {n}"}
+            for n in range(complaints)
+        ],
+    )
+    db.session.commit()
+
+
+def time_renders(app, client, page_list, repeat):
+    """{template: [ms, ...]} over `repeat` requests per pagina."""
+    from flask import before_render_template, template_rendered
+
+    timings = defaultdict(list)
+    started = {}
+
+    def before(sender, template, context, **extra):
+        started[template.name] = time.perf_counter()
+
+    def after(sender, template, context, **extra):
+        timings[current_label[0]].append(
+            (time.perf_counter() - started.pop(template.name)) * 1000
+        )
+
+    current_label = [None]
+    before_render_template.connect(before, app)
+    template_rendered.connect(after, app)
+    try:
+        for label, sess, url in page_list:
+            current_label[0] = label
+            with client.session_transaction() as flask_session:
+                flask_session.clear()
+                flask_session.update(sess or {})
+            for _ in range(repeat + 1):  # eerste request = opwarmen
+                response = client.get(url)
+                if response.status_code != 200:
+                    raise RuntimeError(f"{url}: HTTP {response.status_code}")
+            del timings[label][0]
+    finally:
+        before_render_template.disconnect(before, app)
+        template_rendered.disconnect(after, app)
+    return timings
+
+
+def time_compile(app):
+    """(ms zonder cache, ms met een warme bytecode cache) voor alle templates."""
+    from jinja2 import FileSystemBytecodeCache
+
+    names = [
+        name for name in app.jinja_env.list_templates()
+        if name.endswith((".html", ".txt"))
+    ]
+
+    def load_all(bytecode_cache):
+        env = app.jinja_env.overlay(cache_size=0, bytecode_cache=bytecode_cache)
+        start = time.perf_counter()
+        for name in names:
+            env.get_template(name)
+        return (time.perf_counter() - start) * 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cold = load_all(None)
+        cache = FileSystemBytecodeCache(tmp)
+        load_all(cache)  # cache vullen
+        warm = load_all(cache)
+    return len(names), cold, warm
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="template render times")
+    parser.add_argument("--papers", type=int, default=5000)
+    parser.add_argument("--reviews-per-paper", type=int, default=3)
+    parser.add_argument("--complaints", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, help="budget per template (mediaan)")
+    args = parser.parse_args(argv)
+
+    app, _ = make_app()
+    counts = seed(app, papers=args.papers, reviews_per_paper=args.reviews_per_paper,
+                  users=400, companies=100, abstract_words=60, review_words=20)
+    print(f"seeded: {counts}")
+
+    from app.models import db
+
+    with app.app_context():
+        add_admin_and_complaints(db, args.papers, args.complaints)
+    app.config["COUNTERS_ENABLED"] = False
+
+    client = app.test_client()
+    # seed(): user i heeft rol roles[i % 4] -> 3 = Company, 4 = Researcher
+    timings = time_renders(app, client, pages(1, 3, 4), args.repeat)
+
+    over_budget = []
+    print(f"{'page':<22} {'median':>9} {'min':>9} {'max':>9}")
+    for label, values in timings.items():
+        median = statistics.median(values)
+        print(f"{label:<22} {median:7.2f}ms {min(values):7.2f}ms {max(values):7.2f}ms")
+        if args.max_ms is not None and median > args.max_ms:
+            over_budget.append(label)
+
+    count, cold, warm = time_compile(app)
+    print(f"compile {count} templates: {cold:7.1f} ms cold, {warm:7.1f} ms from bytecode cache")
+
+    if over_budget:
+        print(f"over budget ({args.max_ms} ms): {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# benchmarks/trends.py
+"""
+Looptijd van de trending-job (recompute_trends) tegen ~1M reviews, plus de
+kost van de "trending" dashboard-sort erna.
+
+    python -m benchmarks.trends --papers 50000 --reviews-per-paper 20
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.seed import make_app, seed
+
+
+def seed_activity(db, papers, companies, interest_events, stat_rows, seed_value=7):
+    """Interest-toggles en dagelijkse view/download tellers in het trending-venster."""
+    from sqlalchemy import insert
+    from app.models import InterestEvent, PaperStatDaily
+
+    rng = random.Random(seed_value)
+    now = datetime.now()
+    db.session.execute(
+        insert(InterestEvent.__table__),
+        [
+            {
+                "paper_id": rng.randint(1, papers),
+                "company_id": rng.randint(1, companies),
+                "delta": rng.choice((1, 1, 1, -1)),
+                "created_at": now - timedelta(days=rng.uniform(0, 60)),
+            }
+            for _ in range(interest_events)
+        ],
+    )
+    keys = {
+        (rng.randint(1, papers), (now - timedelta(days=rng.randint(0, 29))).date())
+        for _ in range(stat_rows)
+    }
+    db.session.execute(
+        insert(PaperStatDaily.__table__),
+        [
+            {
+                "paper_id": paper_id,
+                "day": day,
+                "views": rng.randint(1, 200),
+                "downloads": rng.randint(0, 20),
+            }
+            for paper_id, day in keys
+        ],
+    )
+    db.session.commit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="trending job runtime")
+    parser.add_argument("--papers", type=int, default=50000)
+    parser.add_argument("--reviews-per-paper", type=int, default=20)
+    parser.add_argument("--interest-events", type=int, default=50000)
+    parser.add_argument("--stat-rows", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    app, _ = make_app()
+    start = time.perf_counter()
+    counts = seed(
+        app,
+        papers=args.papers,
+        reviews_per_paper=args.reviews_per_paper,
+        users=2000,
+        abstract_words=5,
+        review_words=0,
+    )
+    print(f"seeded {counts} in {time.perf_counter() - start:.1f} s")
+
+    from app.models import db, Paper
+    from app.routes import build_avg_score_subquery, paper_sort_key, paper_list_columns
+    from app.services.trends import recompute_trends
+
+    with app.app_context():
+        seed_activity(
+            db, args.papers, counts["companies"], args.interest_events, args.stat_rows
+        )
+
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            ranked = recompute_trends()
+            timings.append(time.perf_counter() - start)
+        print(f"recompute_trends         {ranked} papers ranked  best {min(timings):7.2f} s")
+
+        avg_subq = build_avg_score_subquery()
+        sort_expr, _ = paper_sort_key("trending", avg_subq)
+        start = time.perf_counter()
+        page = (
+            Paper.query.options(paper_list_columns())
+            .order_by(sort_expr.desc(), Paper.paper_id.desc())
+            .limit(20)
+            .all()
+        )
+        print(
+            f"trending page (20 rows)  {(time.perf_counter() - start) * 1000:7.1f} ms  "
+            f"top paper {page[0].paper_id if page else None}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# benchmarks/workers.py
+"""
+Throughput van sync vs. gthread gunicorn workers op /dashboard en
+/papers/<id> (paper detail), tegen een geseede SQLite database.
+
+    python -m benchmarks.workers --papers 500 --concurrency 16 --seconds 10
+
+Optioneel --io-delay-ms om een trage externe call (Supabase/Gemini) per
+request te simuleren; dat is waar threaded workers het verschil maken.
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+from benchmarks.seed import make_app, seed
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(url, timeout=20):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except Exception:
+            time.sleep(0.2)
+    raise RuntimeError(f"gunicorn did not start on {url}")
+
+
+def load(url, concurrency, seconds):
+    """Vuur requests af met `concurrency` threads; geeft requests/s terug."""
+    stop = time.time() + seconds
+    counts = [0] * concurrency
+    errors = [0] * concurrency
+
+    def run(i):
+        while time.time() < stop:
+            try:
+                urllib.request.urlopen(url, timeout=30).read()
+                counts[i] += 1
+            except Exception:
+                errors[i] += 1
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return sum(counts) / seconds, sum(errors)
+
+
+def run_worker_class(worker_class, db_url, args):
+    port = free_port()
+    env = dict(os.environ)
+    env.update(
+        DATABASE_URL=db_url,
+        GUNICORN_WORKER_CLASS=worker_class,
+        GUNICORN_WORKERS=str(args.workers),
+        GUNICORN_THREADS=str(args.threads),
+        GUNICORN_BIND=f"127.0.0.1:{port}",
+        GUNICORN_ACCESSLOG="",
+        GUNICORN_LOGLEVEL="warning",
+        BENCH_IO_DELAY_MS=str(args.io_delay_ms),
+        PYTHONPATH=ROOT,
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "benchmarks.delay_app:app"],
+        cwd=ROOT,
+        env=env,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        wait_until_up(base + "/dashboard")
+        results = {}
+        for name, path in [("dashboard", "/dashboard"), ("paper_detail", "/papers/1")]:
+            rps, errors = load(base + path, args.concurrency, args.seconds)
+            results[name] = (rps, errors)
+        return results
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="sync vs gthread gunicorn throughput")
+    parser.add_argument("--papers", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--io-delay-ms", type=float, default=0)
+    args = parser.parse_args(argv)
+
+    app, db_url = make_app()
+    seed(app, papers=args.papers)
+
+    for worker_class in ("sync", "gthread"):
+        results = run_worker_class(worker_class, db_url, args)
+        for scenario, (rps, errors) in results.items():
+            print(f"{worker_class:8s} {scenario:13s} {rps:8.1f} req/s  ({errors} errors)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# gunicorn.conf.py
+"""
+Productieprofiel voor gunicorn:  gunicorn -c gunicorn.conf.py run:app
+
+- preload_app: de app wordt één keer in de master geladen (snellere boot,
+  copy-on-write geheugen); na de fork gooit create_app() de DB-verbindingen
+  en de Supabase client van de master weg.
+- gthread workers: pagina's wachten vaak op Supabase/Gemini (I/O), threads
+  vangen die wachttijd op zonder extra processen.
+- max_requests + jitter en een RSS-watchdog recyclen workers die groeien.
+
+Alles is te overschrijven met GUNICORN_* environment variables.
+"""
+import multiprocessing
+import os
+import resource
+import sys
+
+cpu_count = multiprocessing.cpu_count()
+
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+if worker_class == "gthread":
+    # Minder processen, meer threads: RSS schaalt met het aantal processen
+    workers = int(os.getenv("GUNICORN_WORKERS", cpu_count + 1))
+    threads = int(os.getenv("GUNICORN_THREADS", "4"))
+elif worker_class == "gevent":
+    workers = int(os.getenv("GUNICORN_WORKERS", cpu_count))
+    worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "100"))
+else:
+    workers = int(os.getenv("GUNICORN_WORKERS", cpu_count * 2 + 1))
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))  # Gemini-analyses kunnen traag zijn
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# Workers periodiek vervangen; jitter zodat ze niet allemaal tegelijk herstarten
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+
+# RSS-watchdog: worker netjes laten stoppen boven deze grens (0 = uit)
+max_worker_rss_mb = float(os.getenv("GUNICORN_MAX_WORKER_RSS_MB", "400"))
+rss_check_every = int(os.getenv("GUNICORN_RSS_CHECK_EVERY", "20"))
+
+accesslog = os.getenv("GUNICORN_ACCESSLOG", "-") or None  # leeg = geen access log
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOGLEVEL", "info")
+
+
+def current_rss_mb():
+    """Huidige RSS van dit proces in MB (Linux: /proc, anders piek-RSS)."""
+    try:
+        with open("/proc/self/statm") as fh:
+            pages = int(fh.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def post_fork(server, worker):
+    # DB-engines en de Supabase client worden al in create_app() via
+    # os.register_at_fork vrijgegeven in het child (zie app/__init__.py).
+    worker.requests_since_rss_check = 0
+
+
+def worker_exit(server, worker):
+    """Laatste flush van de view/download tellers; in-process scheduler stoppen."""
+    try:
+        from app.services.counters import shutdown_counters
+        from app.services.scheduler import shutdown_scheduler
+    except ImportError:
+        return
+    shutdown_counters()
+    shutdown_scheduler()
+
+
+def post_request(worker, req, environ, resp):
+    """RSS-watchdog: een opgeblazen worker stopt na dit request, de master start een nieuwe."""
+    if not max_worker_rss_mb:
+        return
+    worker.requests_since_rss_check = getattr(worker, "requests_since_rss_check", 0) + 1
+    if worker.requests_since_rss_check < rss_check_every:
+        return
+    worker.requests_since_rss_check = 0
+
+    rss = current_rss_mb()
+    if rss > max_worker_rss_mb:
+        worker.log.warning(
+            "Worker %s RSS %.0f MB > %.0f MB, recycling", worker.pid, rss, max_worker_rss_mb
+        )
+        worker.alive = False
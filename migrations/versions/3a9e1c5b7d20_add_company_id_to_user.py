@@ -0,0 +1,45 @@
+"""Add company_id to User and index Company.name
+
+Revision ID: 3a9e1c5b7d20
+Revises: d1b7f89993c8
+Create Date: 2026-10-19 09:12:40.118000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3a9e1c5b7d20'
+down_revision = 'd1b7f89993c8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('User', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('company_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            'User_company_id_fkey', 'Company', ['company_id'], ['company_id'], ondelete='SET NULL'
+        )
+        batch_op.create_index('ix_User_company_id', ['company_id'], unique=False)
+
+    with op.batch_alter_table('Company', schema=None) as batch_op:
+        batch_op.create_index('ix_Company_name', ['name'], unique=False)
+
+    # Backfill: company users waren tot nu toe op naam gekoppeld
+    op.execute(
+        'UPDATE "User" SET company_id = ('
+        ' SELECT MIN(c.company_id) FROM "Company" c WHERE c.name = "User".name'
+        ") WHERE role = 'Company'"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('Company', schema=None) as batch_op:
+        batch_op.drop_index('ix_Company_name')
+
+    with op.batch_alter_table('User', schema=None) as batch_op:
+        batch_op.drop_index('ix_User_company_id')
+        batch_op.drop_constraint('User_company_id_fkey', type_='foreignkey')
+        batch_op.drop_column('company_id')
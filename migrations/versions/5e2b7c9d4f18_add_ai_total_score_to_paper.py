@@ -0,0 +1,48 @@
+"""Add ai_total_score to Paper with partial leaderboard indexes
+
+Revision ID: 5e2b7c9d4f18
+Revises: 8c41f2d0a6b3
+Create Date: 2026-10-19 11:20:41.118000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2b7c9d4f18'
+down_revision = '8c41f2d0a6b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('Paper', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('ai_total_score', sa.Integer(), nullable=True))
+
+    # Backfill (NULL zolang een van beide scores ontbreekt, zoals make_ai_total_score)
+    op.execute('UPDATE "Paper" SET ai_total_score = ai_business_score + ai_academic_score')
+
+    where = sa.text("ai_status = 'done' AND ai_total_score IS NOT NULL")
+    op.create_index(
+        'ix_Paper_ai_leaderboard',
+        'Paper',
+        [sa.text('ai_total_score DESC'), sa.text('paper_id DESC')],
+        postgresql_where=where,
+        sqlite_where=where,
+    )
+    op.create_index(
+        'ix_Paper_ai_leaderboard_domain',
+        'Paper',
+        ['research_domain', sa.text('ai_total_score DESC'), sa.text('paper_id DESC')],
+        postgresql_where=where,
+        sqlite_where=where,
+    )
+
+
+def downgrade():
+    op.drop_index('ix_Paper_ai_leaderboard_domain', table_name='Paper')
+    op.drop_index('ix_Paper_ai_leaderboard', table_name='Paper')
+
+    with op.batch_alter_table('Paper', schema=None) as batch_op:
+        batch_op.drop_column('ai_total_score')
@@ -0,0 +1,29 @@
+"""Add abstract_snippet to Paper
+
+Revision ID: 8c41f2d0a6b3
+Revises: 3a9e1c5b7d20
+Create Date: 2026-10-19 10:05:12.404000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c41f2d0a6b3'
+down_revision = '3a9e1c5b7d20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('Paper', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('abstract_snippet', sa.String(length=300), nullable=True))
+
+    # Backfill (zelfde lengte als ABSTRACT_SNIPPET_LENGTH in app/models.py)
+    op.execute('UPDATE "Paper" SET abstract_snippet = SUBSTR(abstract, 1, 280)')
+
+
+def downgrade():
+    with op.batch_alter_table('Paper', schema=None) as batch_op:
+        batch_op.drop_column('abstract_snippet')
@@ -0,0 +1,29 @@
+"""Add lower(name) prefix index to Company for the type-ahead search
+
+Revision ID: a4f9d2c7e810
+Revises: e3a7c5f9b2d4
+Create Date: 2026-10-19 21:14:05.342000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4f9d2c7e810'
+down_revision = 'e3a7c5f9b2d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # text_pattern_ops bestaat enkel op Postgres (LIKE 'abc%' onafhankelijk van de collatie)
+    if op.get_bind().dialect.name == 'postgresql':
+        expression = sa.text('lower(name) text_pattern_ops')
+    else:
+        expression = sa.text('lower(name)')
+    op.create_index('ix_Company_name_lower_prefix', 'Company', [expression], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_Company_name_lower_prefix', table_name='Company')
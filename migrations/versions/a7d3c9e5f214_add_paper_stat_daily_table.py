@@ -0,0 +1,36 @@
+"""Add PaperStatDaily table (views/downloads per paper per day)
+
+Revision ID: a7d3c9e5f214
+Revises: f2c8a4d6b1e3
+Create Date: 2026-10-19 14:48:05.210000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3c9e5f214'
+down_revision = 'f2c8a4d6b1e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('PaperStatDaily',
+    sa.Column('paper_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('views', sa.Integer(), nullable=False),
+    sa.Column('downloads', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['paper_id'], ['Paper.paper_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('paper_id', 'day')
+    )
+    with op.batch_alter_table('PaperStatDaily', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_PaperStatDaily_day'), ['day'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('PaperStatDaily', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_PaperStatDaily_day'))
+
+    op.drop_table('PaperStatDaily')
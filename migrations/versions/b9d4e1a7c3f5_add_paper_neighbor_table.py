@@ -0,0 +1,37 @@
+"""Add PaperNeighbor table (precomputed related papers)
+
+Revision ID: b9d4e1a7c3f5
+Revises: 5e2b7c9d4f18
+Create Date: 2026-10-19 12:02:17.530000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b9d4e1a7c3f5'
+down_revision = '5e2b7c9d4f18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('PaperNeighbor',
+    sa.Column('paper_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.SmallInteger(), autoincrement=False, nullable=False),
+    sa.Column('neighbor_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['paper_id'], ['Paper.paper_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['neighbor_id'], ['Paper.paper_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('paper_id', 'rank')
+    )
+    with op.batch_alter_table('PaperNeighbor', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_PaperNeighbor_neighbor_id'), ['neighbor_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('PaperNeighbor', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_PaperNeighbor_neighbor_id'))
+
+    op.drop_table('PaperNeighbor')
@@ -0,0 +1,31 @@
+"""Add partial ai_status = 'pending' index to Paper (AI queue, /readyz)
+
+Revision ID: c2e8b5a1f367
+Revises: a4f9d2c7e810
+Create Date: 2026-10-19 21:52:18.604000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2e8b5a1f367'
+down_revision = 'a4f9d2c7e810'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    where = sa.text("ai_status = 'pending'")
+    op.create_index(
+        'ix_Paper_ai_pending',
+        'Paper',
+        ['paper_id'],
+        postgresql_where=where,
+        sqlite_where=where,
+    )
+
+
+def downgrade():
+    op.drop_index('ix_Paper_ai_pending', table_name='Paper')
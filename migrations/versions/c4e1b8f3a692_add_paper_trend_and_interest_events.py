@@ -0,0 +1,70 @@
+"""Add PaperTrend and InterestEvent tables, index Review.date_submitted
+
+Revision ID: c4e1b8f3a692
+Revises: a7d3c9e5f214
+Create Date: 2026-10-19 15:36:52.044000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e1b8f3a692'
+down_revision = 'a7d3c9e5f214'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('InterestEvent',
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('paper_id', sa.Integer(), nullable=False),
+    sa.Column('company_id', sa.Integer(), nullable=False),
+    sa.Column('delta', sa.SmallInteger(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['company_id'], ['Company.company_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['paper_id'], ['Paper.paper_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('event_id')
+    )
+    with op.batch_alter_table('InterestEvent', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_InterestEvent_created_at'), ['created_at'], unique=False)
+
+    op.create_table('PaperTrend',
+    sa.Column('paper_id', sa.Integer(), nullable=False),
+    sa.Column('trend_score', sa.Float(), nullable=False),
+    sa.Column('review_momentum', sa.Float(), nullable=False),
+    sa.Column('score_change', sa.Float(), nullable=False),
+    sa.Column('interest_momentum', sa.Float(), nullable=False),
+    sa.Column('view_momentum', sa.Float(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['paper_id'], ['Paper.paper_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('paper_id')
+    )
+    with op.batch_alter_table('PaperTrend', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_PaperTrend_rank',
+            [sa.text('trend_score DESC'), sa.text('paper_id DESC')],
+            unique=False,
+        )
+
+    # Trending-job filtert reviews op het venster
+    with op.batch_alter_table('Review', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_Review_date_submitted'), ['date_submitted'], unique=False)
+    # PaperTrend wordt gevuld door `flask trends`; bestaande interests hebben geen
+    # toggle-historiek en tellen dus niet mee als recente momentum.
+
+
+def downgrade():
+    with op.batch_alter_table('Review', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_Review_date_submitted'))
+
+    with op.batch_alter_table('PaperTrend', schema=None) as batch_op:
+        batch_op.drop_index('ix_PaperTrend_rank')
+
+    op.drop_table('PaperTrend')
+
+    with op.batch_alter_table('InterestEvent', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_InterestEvent_created_at'))
+
+    op.drop_table('InterestEvent')
@@ -0,0 +1,66 @@
+"""Add CompanyInterest table and Company.last_digest_at for the interest digest
+
+Revision ID: d8b2f6a4c1e7
+Revises: c4e1b8f3a692
+Create Date: 2026-10-19 17:12:08.311000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8b2f6a4c1e7'
+down_revision = 'c4e1b8f3a692'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('CompanyInterest',
+    sa.Column('company_id', sa.Integer(), nullable=False),
+    sa.Column('research_domain', sa.String(length=120), nullable=False),
+    sa.ForeignKeyConstraint(['company_id'], ['Company.company_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('company_id', 'research_domain')
+    )
+    with op.batch_alter_table('CompanyInterest', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_CompanyInterest_research_domain'), ['research_domain'], unique=False)
+
+    with op.batch_alter_table('Company', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('last_digest_at', sa.DateTime(), nullable=True))
+
+    with op.batch_alter_table('Paper', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_Paper_domain_upload_date',
+            ['research_domain', sa.text('upload_date DESC')],
+            unique=False,
+        )
+
+    # Bestaande interests ("AI,Robotics") normaliseren naar CompanyInterest
+    conn = op.get_bind()
+    rows = []
+    for company_id, interests in conn.execute(
+        sa.text('SELECT company_id, interests FROM "Company" WHERE interests IS NOT NULL')
+    ):
+        tags = dict.fromkeys(t.strip() for t in interests.split(",") if t.strip())
+        rows.extend({"company_id": company_id, "research_domain": tag} for tag in tags)
+    if rows:
+        company_interest = sa.table(
+            'CompanyInterest',
+            sa.column('company_id', sa.Integer),
+            sa.column('research_domain', sa.String),
+        )
+        op.bulk_insert(company_interest, rows)
+
+
+def downgrade():
+    with op.batch_alter_table('Paper', schema=None) as batch_op:
+        batch_op.drop_index('ix_Paper_domain_upload_date')
+
+    with op.batch_alter_table('Company', schema=None) as batch_op:
+        batch_op.drop_column('last_digest_at')
+
+    with op.batch_alter_table('CompanyInterest', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_CompanyInterest_research_domain'))
+
+    op.drop_table('CompanyInterest')
@@ -0,0 +1,53 @@
+"""Add JobRun history and JobLock tables for the scheduler
+
+Revision ID: e3a7c5f9b2d4
+Revises: d8b2f6a4c1e7
+Create Date: 2026-10-19 19:02:41.517000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3a7c5f9b2d4'
+down_revision = 'd8b2f6a4c1e7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('JobRun',
+    sa.Column('run_id', sa.Integer(), nullable=False),
+    sa.Column('job_name', sa.String(length=100), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('duration_ms', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('result', sa.String(length=255), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('host', sa.String(length=255), nullable=True),
+    sa.PrimaryKeyConstraint('run_id')
+    )
+    with op.batch_alter_table('JobRun', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_JobRun_job_started',
+            ['job_name', sa.text('started_at DESC')],
+            unique=False,
+        )
+
+    op.create_table('JobLock',
+    sa.Column('job_name', sa.String(length=100), nullable=False),
+    sa.Column('owner', sa.String(length=255), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('job_name')
+    )
+
+
+def downgrade():
+    op.drop_table('JobLock')
+
+    with op.batch_alter_table('JobRun', schema=None) as batch_op:
+        batch_op.drop_index('ix_JobRun_job_started')
+
+    op.drop_table('JobRun')
@@ -0,0 +1,57 @@
+"""Add ReviewerProfile and ReviewerDomainStat tables, index Review FKs
+
+Revision ID: e6a3f8b2d915
+Revises: b9d4e1a7c3f5
+Create Date: 2026-10-19 13:11:48.902000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6a3f8b2d915'
+down_revision = 'b9d4e1a7c3f5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('ReviewerProfile',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('review_count', sa.Integer(), nullable=False),
+    sa.Column('recent_review_count', sa.Integer(), nullable=False),
+    sa.Column('last_review_at', sa.DateTime(), nullable=True),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['User.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    with op.batch_alter_table('ReviewerProfile', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_ReviewerProfile_refreshed_at'), ['refreshed_at'], unique=False)
+
+    op.create_table('ReviewerDomainStat',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('research_domain', sa.String(length=120), nullable=False),
+    sa.Column('review_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['User.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'research_domain')
+    )
+    # Profielen worden gevuld door `flask reviewer-profiles --full`
+
+    # Reviews per paper (conflicten, detailpagina) en per reviewer (profiel-refresh)
+    with op.batch_alter_table('Review', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_Review_paper_id'), ['paper_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_Review_reviewer_id'), ['reviewer_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('Review', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_Review_reviewer_id'))
+        batch_op.drop_index(batch_op.f('ix_Review_paper_id'))
+
+    op.drop_table('ReviewerDomainStat')
+
+    with op.batch_alter_table('ReviewerProfile', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_ReviewerProfile_refreshed_at'))
+
+    op.drop_table('ReviewerProfile')
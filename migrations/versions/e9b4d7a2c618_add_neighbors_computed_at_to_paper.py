@@ -0,0 +1,43 @@
+"""Add neighbors_computed_at to Paper (related papers completion marker)
+
+Revision ID: e9b4d7a2c618
+Revises: c2e8b5a1f367
+Create Date: 2026-10-19 23:14:37.219000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e9b4d7a2c618'
+down_revision = 'c2e8b5a1f367'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('Paper', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('neighbors_computed_at', sa.DateTime(), nullable=True))
+
+    # Papers met opgeslagen buren zijn al berekend; de rest (ook papers zonder
+    # enkele buur boven MIN_SCORE) komt één keer in de volgende update
+    op.execute(
+        'UPDATE "Paper" SET neighbors_computed_at = CURRENT_TIMESTAMP '
+        'WHERE paper_id IN (SELECT paper_id FROM "PaperNeighbor")'
+    )
+
+    where = sa.text('neighbors_computed_at IS NULL')
+    op.create_index(
+        'ix_Paper_neighbors_pending',
+        'Paper',
+        ['paper_id'],
+        postgresql_where=where,
+        sqlite_where=where,
+    )
+
+
+def downgrade():
+    op.drop_index('ix_Paper_neighbors_pending', table_name='Paper')
+    with op.batch_alter_table('Paper', schema=None) as batch_op:
+        batch_op.drop_column('neighbors_computed_at')
@@ -0,0 +1,45 @@
+"""Add moderation status to Complaint and index the moderation queue
+
+Revision ID: f2c8a4d6b1e3
+Revises: e6a3f8b2d915
+Create Date: 2026-10-19 14:02:33.671000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c8a4d6b1e3'
+down_revision = 'e6a3f8b2d915'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # server_default zet bestaande complaints meteen op 'open'
+    with op.batch_alter_table('Complaint', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('status', sa.String(length=20), server_default='open', nullable=False))
+        batch_op.add_column(sa.Column('resolved_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('resolved_by', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('Complaint_resolved_by_fkey', 'User', ['resolved_by'], ['user_id'], ondelete='SET NULL')
+        batch_op.create_index(batch_op.f('ix_Complaint_paper_id'), ['paper_id'], unique=False)
+
+    # Buiten de batch: bij een SQLite-recreate kent batch_op geen DESC-expressies
+    op.create_index(
+        'ix_Complaint_queue',
+        'Complaint',
+        ['status', sa.text('created_at DESC'), sa.text('complaint_id DESC')],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index('ix_Complaint_queue', table_name='Complaint')
+
+    with op.batch_alter_table('Complaint', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_Complaint_paper_id'))
+        batch_op.drop_constraint('Complaint_resolved_by_fkey', type_='foreignkey')
+        batch_op.drop_column('resolved_by')
+        batch_op.drop_column('resolved_at')
+        batch_op.drop_column('status')